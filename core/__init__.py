@@ -13,6 +13,14 @@ except Exception:
 	USRPController = None
 
 from .signal_processor import SignalProcessor
-from .file_manager import FileManager, SignalMetadata
+from .file_manager import FileManager, SignalMetadata, SignalWriter, StorageProfile, get_storage_profile
 
-__all__ = ["USRPController", "SignalProcessor", "FileManager", "SignalMetadata"]
+__all__ = [
+	"USRPController",
+	"SignalProcessor",
+	"FileManager",
+	"SignalMetadata",
+	"SignalWriter",
+	"StorageProfile",
+	"get_storage_profile",
+]
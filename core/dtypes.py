@@ -0,0 +1,70 @@
+"""样本数据类型策略
+
+全局约定 IQ 样本在加载、流式推送、可视化和信号处理路径上保持的复数精度。
+默认 complex64（与 USRP fc32 采样及文件存储一致），避免热路径上隐式提升为
+complex128 导致内存与带宽翻倍；只有功率/dB 累加等数值敏感的归约才使用
+ACCUMULATOR_DTYPE (float64)。
+
+DSP 计算精度（ProcessingConfig.precision / VisualizationConfig.precision）：
+"double" 时样本跟随上述策略、频谱与 dB 输出为 float64；"single" 时窗、FFT 输入输出与
+dB 转换全程 float32/complex64，用于显示与检测。
+"""
+from typing import Union
+
+import numpy as np
+
+DTypeLike = Union[str, np.dtype, type]
+
+# 功率、能量等求和/平均所用的累加精度
+ACCUMULATOR_DTYPE = np.dtype(np.float64)
+
+_SUPPORTED = (np.dtype(np.complex64), np.dtype(np.complex128))
+_sample_dtype = np.dtype(np.complex64)
+
+PRECISIONS = ("double", "single")
+
+
+def get_sample_dtype() -> np.dtype:
+    """当前策略下的复数样本类型"""
+    return _sample_dtype
+
+
+def set_sample_dtype(dtype: DTypeLike) -> None:
+    """设置样本类型，仅支持 complex64 / complex128"""
+    global _sample_dtype
+    resolved = np.dtype(dtype)
+    if resolved not in _SUPPORTED:
+        raise ValueError(f"Unsupported sample dtype: {resolved} (expected complex64 or complex128)")
+    _sample_dtype = resolved
+
+
+def real_dtype() -> np.dtype:
+    """与样本类型对应的实数类型（complex64 -> float32）"""
+    return np.finfo(_sample_dtype).dtype
+
+
+def as_samples(samples, copy: bool = False, dtype: DTypeLike = None) -> np.ndarray:
+    """转换为策略样本类型（或指定的 dtype）的 ndarray；类型已匹配时不复制（copy=True 除外）"""
+    target = _sample_dtype if dtype is None else np.dtype(dtype)
+    arr = np.asarray(samples)
+    if arr.dtype == target:
+        return arr.copy() if copy else arr
+    return arr.astype(target)
+
+
+def check_precision(precision: str) -> str:
+    """校验计算精度名称（double / single）"""
+    value = str(precision).lower()
+    if value not in PRECISIONS:
+        raise ValueError(f"Unsupported precision: {precision!r} (expected {' or '.join(PRECISIONS)})")
+    return value
+
+
+def compute_dtype(precision: str) -> np.dtype:
+    """该精度下 FFT 输入所用的复数类型：single 为 complex64，double 跟随样本策略"""
+    return np.dtype(np.complex64) if check_precision(precision) == "single" else _sample_dtype
+
+
+def output_dtype(precision: str) -> np.dtype:
+    """该精度下功率谱 / dB 输出的实数类型：single 为 float32，double 为 ACCUMULATOR_DTYPE"""
+    return np.dtype(np.float32) if check_precision(precision) == "single" else ACCUMULATOR_DTYPE
@@ -0,0 +1,81 @@
+"""FFT 执行策略
+
+所有频谱计算经由这里调用 scipy.fft，并使用统一的线程数（PerformanceConfig.fft_workers，
+由配置管理器在加载时应用）。scipy 的 pocketfft 只在多个独立变换之间并行，
+因此对多段数据请使用 fft_segments 一次完成批量变换，而不是逐段循环调用 fft。
+"""
+import os
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+import numpy as np
+import scipy.fft as sp_fft
+
+_fft_workers = 1
+
+
+def _cpu_count() -> int:
+    return os.cpu_count() or 1
+
+
+def resolve_workers(workers: Optional[int] = None) -> int:
+    """解析线程数：None 使用全局设置，0 为全部核心，负数同 scipy（-1 为全部核心）"""
+    if workers is None:
+        return _fft_workers
+    workers = int(workers)
+    if workers == 0:
+        return _cpu_count()
+    if workers < 0:
+        return max(1, _cpu_count() + 1 + workers)
+    return workers
+
+
+def get_fft_workers() -> int:
+    """当前全局 FFT 线程数"""
+    return _fft_workers
+
+
+def set_fft_workers(workers: Optional[int]) -> None:
+    """设置全局 FFT 线程数（None/0 表示全部核心）"""
+    global _fft_workers
+    _fft_workers = resolve_workers(0 if workers is None else workers)
+
+
+@contextmanager
+def fft_workers(workers: Optional[int] = None) -> Iterator[int]:
+    """在上下文内让 scipy.fft（包括 scipy.signal.spectrogram 等间接调用）使用指定线程数"""
+    resolved = resolve_workers(workers)
+    with sp_fft.set_workers(resolved):
+        yield resolved
+
+
+def fft(x: np.ndarray, n: Optional[int] = None, axis: int = -1, workers: Optional[int] = None) -> np.ndarray:
+    """scipy.fft.fft，线程数取全局设置"""
+    return sp_fft.fft(x, n=n, axis=axis, workers=resolve_workers(workers))
+
+
+def ifft(x: np.ndarray, n: Optional[int] = None, axis: int = -1, workers: Optional[int] = None) -> np.ndarray:
+    """scipy.fft.ifft，线程数取全局设置"""
+    return sp_fft.ifft(x, n=n, axis=axis, workers=resolve_workers(workers))
+
+
+def fft_segments(
+    segments: np.ndarray,
+    window: Optional[np.ndarray] = None,
+    workers: Optional[int] = None,
+    shift: bool = False,
+    n: Optional[int] = None,
+) -> np.ndarray:
+    """批量 FFT：segments 为 (段数, m) 二维数组，每行独立变换，各行在线程间并行
+
+    window 不为 None 时先逐行加窗；n 大于 m 时补零；shift=True 时对每行做 fftshift。
+    """
+    segments = np.asarray(segments)
+    if segments.ndim != 2:
+        raise ValueError(f"segments must be 2-D (n_segments, n), got shape {segments.shape}")
+    if window is not None:
+        segments = segments * window
+    spectra = sp_fft.fft(segments, n=n, axis=-1, workers=resolve_workers(workers), overwrite_x=window is not None)
+    if shift:
+        spectra = sp_fft.fftshift(spectra, axes=-1)
+    return spectra
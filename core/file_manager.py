@@ -1,5 +1,9 @@
+import json
 import logging
 import os
+import zipfile
+from collections import OrderedDict
+from functools import lru_cache
 
 try:
     import h5py
@@ -7,15 +11,194 @@ try:
 except Exception:  # pragma: no cover - environment may lack h5py
     h5py = None
     H5PY_AVAILABLE = False
+try:
+    import hdf5plugin
+    BLOSC_AVAILABLE = True
+except Exception:  # pragma: no cover - optional HDF5 filter plugins
+    hdf5plugin = None
+    BLOSC_AVAILABLE = False
 import numpy as np
 from pathlib import Path
-from typing import Tuple, List, Dict, Optional
+from typing import Tuple, List, Dict, Iterator, Optional
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import datetime, timezone
+
+from .dtypes import as_samples, get_sample_dtype
+from .fir_filter import StreamingFIR
+from .resampler import StreamingResampler
+from .running_stats import PERSISTED_FIELDS, RunningStats
 
 
 logger = logging.getLogger(__name__)
 
+# 分块读取的默认样本数（complex64 下约 8 MB）
+DEFAULT_CHUNK_SAMPLES = 1 << 20
+
+# 文件头中缓存的样本统计/格式字段（HDF5 属性名 -> .txt 旁路字段名）
+STATS_FIELDS = {
+    "average_power": "Average_Power",
+    "peak_power": "Peak_Power",
+    "i_mean": "I_Mean",
+    "q_mean": "Q_Mean",
+    "i_std": "I_Std",
+    "q_std": "Q_Std",
+    "dc_offset": "DC_Offset",
+    "power_p50": "Power_P50",
+    "power_p90": "Power_P90",
+    "power_p99": "Power_P99",
+    "sample_dtype": "Sample_Dtype",
+    "scale": "Scale",
+}
+_SIDECAR_STATS = {name: key for key, name in STATS_FIELDS.items()}
+
+# 样本存储格式：fc32 为交织 float32 (complex64)，sc16 为交织 int16 + 缩放系数
+SAMPLE_FORMATS = ("fc32", "sc16")
+SC16_SUFFIX = ".sc16"
+# SigMF 数据/元数据文件对；SIGMF_DATATYPES 为支持的 core:datatype -> 样本格式
+SIGMF_DATA_SUFFIX = ".sigmf-data"
+SIGMF_META_SUFFIX = ".sigmf-meta"
+SIGMF_VERSION = "1.0.0"
+# NumPy 数组文件：.npy 只读内存映射，.npz（可能压缩）整体加载；元数据在同名 .json 旁路
+NPY_SUFFIX = ".npy"
+NPZ_SUFFIX = ".npz"
+NUMPY_SUFFIXES = (NPY_SUFFIX, NPZ_SUFFIX)
+SIGMF_DATATYPES = {"cf32_le": "fc32", "ci16_le": "sc16"}
+# 解压后的 .npz 样本数组缓存个数（按 路径/mtime/大小），分块读取时避免每块重新解压
+NPZ_CACHE_SIZE = 2
+# 旧文件功率统计缓存的最大文件数（按路径 LRU）
+STATS_CACHE_SIZE = 256
+# sc16 默认缩放系数，与 UHD sc16 <-> fc32 转换一致（满量程 ±1.0）
+SC16_DEFAULT_SCALE = 1.0 / 32767
+
+
+# 压缩数据集的默认分块长度：65536 个 complex64 样本 = 512 KB，可放入 HDF5
+# 默认 1 MB 的 chunk cache，顺序窗口读取时同一块只解压一次
+STREAMING_CHUNK_SAMPLES = 1 << 16
+
+
+@dataclass(frozen=True)
+class StorageProfile:
+    """HDF5 样本数据集的存储参数（压缩、shuffle、分块长度）"""
+
+    name: str
+    compression: Optional[str] = None
+    compression_opts: Optional[int] = None
+    shuffle: bool = False
+    chunk_samples: Optional[int] = STREAMING_CHUNK_SAMPLES
+
+    def dataset_kwargs(self, length: Optional[int] = None, row_shape: Tuple[int, ...] = ()) -> Dict:
+        """转换为 h5py create_dataset 参数
+
+        length 为一次性写入的样本数；None 表示可扩展数据集（必须分块）。
+        不压缩的一次性写入使用连续布局，可被 load_signal(mmap=True) 映射。
+        row_shape 为每个样本的附加维度（sc16 为 (2,)）。
+        """
+        kwargs: Dict = {}
+        chunk = self.chunk_samples
+        if length is None:
+            chunk = chunk or DEFAULT_CHUNK_SAMPLES
+        elif length == 0 or not (chunk or self.compression):
+            return kwargs
+        else:
+            chunk = min(chunk or DEFAULT_CHUNK_SAMPLES, length)
+        kwargs["chunks"] = (int(chunk),) + tuple(row_shape)
+        if self.compression == "blosc":
+            kwargs.update(
+                hdf5plugin.Blosc(
+                    cname="lz4",
+                    clevel=self.compression_opts or 5,
+                    shuffle=hdf5plugin.Blosc.SHUFFLE if self.shuffle else hdf5plugin.Blosc.NOSHUFFLE,
+                )
+            )
+        elif self.compression:
+            kwargs["compression"] = self.compression
+            if self.compression_opts is not None:
+                kwargs["compression_opts"] = self.compression_opts
+            kwargs["shuffle"] = self.shuffle
+        return kwargs
+
+
+STORAGE_PROFILES = {
+    "none": StorageProfile("none", chunk_samples=None),
+    "lzf": StorageProfile("lzf", "lzf", shuffle=True),
+    "gzip": StorageProfile("gzip", "gzip", 4, shuffle=True),
+    "blosc-lz4": StorageProfile("blosc-lz4", "blosc", 5, shuffle=True),
+}
+
+
+def get_storage_profile(name: Optional[str], chunk_samples: Optional[int] = None) -> StorageProfile:
+    """按名称解析存储配置：none、lzf、gzip、gzip-N (N=0..9)、blosc-lz4
+
+    blosc 需要 hdf5plugin，缺失时回退到 lzf。chunk_samples 覆盖默认分块长度。
+    """
+    key = (name or "none").strip().lower()
+    if key in ("off", "false"):
+        key = "none"
+    profile = STORAGE_PROFILES.get(key)
+    if profile is None and key.startswith("gzip-"):
+        level = key[len("gzip-"):]
+        if level.isdigit() and 0 <= int(level) <= 9:
+            profile = StorageProfile(key, "gzip", int(level), shuffle=True)
+    if profile is None:
+        raise ValueError(f"Unknown HDF5 storage profile: {name}")
+    if profile.compression == "blosc" and not BLOSC_AVAILABLE:
+        logger.warning("hdf5plugin not available, storage profile %s falls back to lzf", key)
+        profile = StorageProfile("lzf", "lzf", shuffle=True, chunk_samples=profile.chunk_samples)
+    if chunk_samples:
+        profile = StorageProfile(
+            profile.name,
+            profile.compression,
+            profile.compression_opts,
+            profile.shuffle,
+            max(1, int(chunk_samples)),
+        )
+    return profile
+
+
+def sc16_scale_for(samples: np.ndarray) -> float:
+    """sc16 缩放系数：幅度不超过 1.0 时使用 UHD 标准系数，否则按峰值放大避免削波"""
+    samples = np.asarray(samples)
+    peak = 0.0
+    for start in range(0, samples.size, DEFAULT_CHUNK_SAMPLES):
+        block = samples[start : start + DEFAULT_CHUNK_SAMPLES]
+        if block.size:
+            peak = max(peak, float(np.max(np.abs(block.real))), float(np.max(np.abs(block.imag))))
+    return max(peak, 1.0) / 32767
+
+
+def to_sc16(block: np.ndarray, scale: float) -> np.ndarray:
+    """复数样本量化为 (N, 2) int16，超出量程的值被截断"""
+    pairs = np.ascontiguousarray(block, dtype=np.complex64).view(np.float32).reshape(-1, 2)
+    scaled = np.rint(pairs / np.float32(scale))
+    np.clip(scaled, -32768, 32767, out=scaled)
+    return scaled.astype(np.int16)
+
+
+def from_sc16(pairs: np.ndarray, scale: float) -> np.ndarray:
+    """(N, 2) int16 还原为策略样本类型（先生成 complex64，不经过 float64）"""
+    pairs = np.asarray(pairs).reshape(-1, 2)
+    out = np.empty(pairs.shape[0], dtype=np.complex64)
+    np.multiply(pairs, np.float32(scale), out=out.view(np.float32).reshape(-1, 2))
+    return as_samples(out)
+
+
+def _sigmf_datetime(timestamp) -> Optional[str]:
+    """ISO 时间戳转换为 SigMF core:datetime（UTC，Z 结尾）；无法解析时返回 None"""
+    try:
+        moment = datetime.fromisoformat(str(timestamp).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if moment.tzinfo is None:
+        moment = moment.astimezone()
+    return moment.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+def _json_scalar(value):
+    """json.dump 的 numpy 标量回退转换"""
+    if hasattr(value, "item"):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
 
 @dataclass
 class SignalMetadata:
@@ -32,24 +215,85 @@ class SignalMetadata:
     additional_metadata: Dict = field(default_factory=dict)
 
 
+def _npz_member(archive: zipfile.ZipFile) -> str:
+    """.npz 中的样本成员："samples.npy"，否则为第一个 .npy 成员（与 np.load 一致）"""
+    names = [name for name in archive.namelist() if name.endswith(NPY_SUFFIX)]
+    if not names:
+        raise ValueError("No arrays found in file")
+    return "samples.npy" if "samples.npy" in names else names[0]
+
+
+def _read_npy_header(handle) -> Tuple[Tuple[int, ...], np.dtype]:
+    version = np.lib.format.read_magic(handle)
+    if version == (1, 0):
+        shape, _, dtype = np.lib.format.read_array_header_1_0(handle)
+    elif version == (2, 0):
+        shape, _, dtype = np.lib.format.read_array_header_2_0(handle)
+    else:
+        raise ValueError(f"Unsupported .npy format version: {version}")
+    return shape, dtype
+
+
+def _check_numpy_samples(shape: Tuple[int, ...], dtype: np.dtype) -> None:
+    if dtype.kind == "c" and len(shape) == 1:
+        return
+    if dtype.kind in "fi" and len(shape) == 2 and shape[1] == 2:
+        return
+    raise ValueError(f"Unsupported NumPy sample array: dtype={dtype}, shape={shape}")
+
+
+@lru_cache(maxsize=NPZ_CACHE_SIZE)
+def _load_npz_samples(path: str, mtime_ns: int, size: int) -> np.ndarray:
+    """解压 .npz 样本数组（mtime_ns/size 只参与缓存键，文件改写后自动失效）"""
+    with zipfile.ZipFile(path) as archive:
+        member = _npz_member(archive)
+    with np.load(path, allow_pickle=False) as archive:
+        array = archive[member[: -len(NPY_SUFFIX)]]
+    array.flags.writeable = False
+    return array
+
+
 class FileManager:
     """文件管理器"""
 
     def __init__(self):
-        self.supported_formats = [".h5", ".dat", ".complex", ".raw", ".bin"]
+        self.supported_formats = [
+            ".h5",
+            ".dat",
+            ".complex",
+            ".raw",
+            ".bin",
+            SC16_SUFFIX,
+            SIGMF_DATA_SUFFIX,
+            NPY_SUFFIX,
+            NPZ_SUFFIX,
+        ]
         # Base directory to save/load files from. Can be set by caller (web UI) to the uploads folder.
         self.base_dir = Path('.')
+        # 可选的持久化文件索引，见 list_available_files
+        self.catalog = None
+        # HDF5 样本数据集的存储配置名称，见 get_storage_profile
+        self.storage_profile = "gzip-4"
+        # .h5 文件的默认样本格式（fc32 / sc16）；.sc16 文件总是 sc16
+        self.sample_format = "fc32"
+        # 旧文件（无缓存统计字段）的功率统计缓存：路径 -> ((mtime_ns, 大小), 统计)，LRU 淘汰
+        self._stats_cache: "OrderedDict[str, Tuple[Tuple[int, int], Dict[str, float]]]" = OrderedDict()
 
     def save_signal(
-        self, samples: np.ndarray, metadata: SignalMetadata, filename: str
+        self,
+        samples: np.ndarray,
+        metadata: SignalMetadata,
+        filename: str,
+        sample_format: Optional[str] = None,
     ) -> bool:
-        """保存信号到文件"""
+        """保存信号到文件
+
+        sample_format 选择 .h5 的样本格式（默认 self.sample_format）；
+        sc16 以 int16 I/Q 加 scale 属性存储，体积为 fc32 的一半。
+        """
         temp_paths = []
         try:
-            file_path = Path(filename)
-            if not file_path.parent or str(file_path.parent) in ('.', ''):
-                file_path = Path(self.base_dir) / file_path
-            file_path.parent.mkdir(parents=True, exist_ok=True)
+            file_path = self._resolve_output_path(filename)
 
             logger.info(
                 "FileManager.save_signal -> %s (format=%s, samples=%s)",
@@ -58,11 +302,17 @@ class FileManager:
                 len(samples),
             )
 
+            stats = self._summarize_samples(samples)
+            sample_format = self.resolve_sample_format(file_path, sample_format)
+            if sample_format == "sc16":
+                stats["sample_dtype"] = "sc16"
+                stats["scale"] = sc16_scale_for(samples)
+
             if file_path.suffix.lower() == ".h5":
                 temp_path = self._build_temp_path(file_path)
                 temp_paths.append(temp_path)
 
-                if not self._save_hdf5(samples, metadata, str(temp_path)):
+                if not self._save_hdf5(samples, metadata, str(temp_path), stats):
                     return False
 
                 self._fsync_file(temp_path)
@@ -70,7 +320,11 @@ class FileManager:
                 self._sync_directory(file_path.parent)
                 return True
 
-            return self._save_binary_atomic(samples, metadata, file_path, temp_paths)
+            if file_path.suffix.lower() == NPZ_SUFFIX:
+                raise ValueError("Saving .npz is not supported; use .npy")
+            if sample_format == "fc32":
+                stats["sample_dtype"] = np.dtype(np.complex64).name
+            return self._save_binary_atomic(samples, metadata, file_path, temp_paths, stats)
 
         except Exception:
             logger.exception("FileManager.save_signal failed for %s", filename)
@@ -80,34 +334,83 @@ class FileManager:
                 if path.exists():
                     path.unlink(missing_ok=True)
 
+    def open_writer(
+        self,
+        filename: str,
+        metadata: SignalMetadata,
+        chunk_samples: Optional[int] = None,
+        storage_profile: Optional[str] = None,
+        sample_format: Optional[str] = None,
+        scale: float = SC16_DEFAULT_SCALE,
+    ) -> "SignalWriter":
+        """打开增量写入器，逐块追加样本，close() 时原子落盘
+
+        sc16 写入器无法预知峰值，使用固定 scale 量化（超出量程的样本被截断）。
+        """
+        file_path = self._resolve_output_path(filename)
+        if file_path.suffix.lower() in NUMPY_SUFFIXES:
+            raise ValueError("Incremental writing is not supported for NumPy files; use save_signal")
+        profile = get_storage_profile(storage_profile or self.storage_profile, chunk_samples)
+        sample_format = self.resolve_sample_format(file_path, sample_format)
+        return SignalWriter(self, file_path, metadata, profile, sample_format, scale)
+
+    def resolve_sample_format(self, file_path: Path, sample_format: Optional[str] = None) -> str:
+        """目标文件实际使用的样本格式（fc32 / sc16）"""
+        suffix = file_path.suffix.lower()
+        if suffix == SC16_SUFFIX:
+            return "sc16"
+        if suffix not in (".h5", SIGMF_DATA_SUFFIX):
+            return "fc32"
+        sample_format = (sample_format or self.sample_format or "fc32").lower()
+        if sample_format not in SAMPLE_FORMATS:
+            raise ValueError(f"Unsupported sample format: {sample_format}")
+        return sample_format
+
+    def _summarize_samples(self, samples: np.ndarray) -> Dict:
+        """计算写入文件头的样本统计（分块，避免整段功率数组）"""
+        samples = np.asarray(samples)
+        stats = RunningStats.from_samples(samples, DEFAULT_CHUNK_SAMPLES).persisted()
+        stats["sample_dtype"] = samples.dtype.name
+        return stats
+
+    def _resolve_output_path(self, filename: str) -> Path:
+        file_path = self._data_path(filename)
+        if not file_path.parent or str(file_path.parent) in ('.', ''):
+            file_path = Path(self.base_dir) / file_path
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        return file_path
+
     def _save_hdf5(
-        self, samples: np.ndarray, metadata: SignalMetadata, filename: str
+        self,
+        samples: np.ndarray,
+        metadata: SignalMetadata,
+        filename: str,
+        stats: Optional[Dict] = None,
     ) -> bool:
         """保存为HDF5格式"""
         if not H5PY_AVAILABLE:
             logger.error("h5py not available: cannot save HDF5 file")
             return False
         try:
+            profile = get_storage_profile(self.storage_profile)
             with h5py.File(filename, "w") as f:
                 # 保存样本数据
-                f.create_dataset("samples", data=samples, compression="gzip")
-
-                # 保存元数据
-                f.attrs["sample_rate"] = metadata.sample_rate
-                f.attrs["center_freq"] = metadata.center_freq
-                f.attrs["timestamp"] = metadata.timestamp
-                f.attrs["duration"] = metadata.duration
-                f.attrs["samples_count"] = metadata.samples_count
-                f.attrs["signal_type"] = metadata.signal_type
-                f.attrs["rf_channel"] = metadata.rf_channel
-                f.attrs["gain"] = metadata.gain
-                f.attrs["file_version"] = "1.2"
-
-                # 保存附加元数据
-                for key, value in metadata.additional_metadata.items():
-                    if isinstance(value, (str, int, float, bool)):
-                        f.attrs[key] = value
+                if (stats or {}).get("sample_dtype") == "sc16":
+                    scale = stats["scale"]
+                    dataset = f.create_dataset(
+                        "samples",
+                        shape=(len(samples), 2),
+                        dtype=np.int16,
+                        **profile.dataset_kwargs(len(samples), (2,)),
+                    )
+                    dataset.attrs["scale"] = scale
+                    for start in range(0, len(samples), DEFAULT_CHUNK_SAMPLES):
+                        block = samples[start : start + DEFAULT_CHUNK_SAMPLES]
+                        dataset[start : start + len(block)] = to_sc16(block, scale)
+                else:
+                    f.create_dataset("samples", data=samples, **profile.dataset_kwargs(len(samples)))
 
+                self._write_hdf5_attrs(f, metadata, stats)
                 f.flush()
 
             return True
@@ -115,21 +418,53 @@ class FileManager:
             logger.exception("Error saving HDF5 file: %s", filename)
             return False
 
+    def _write_hdf5_attrs(
+        self, f, metadata: SignalMetadata, stats: Optional[Dict] = None
+    ) -> None:
+        """写入 HDF5 文件级元数据属性"""
+        # 保存元数据
+        f.attrs["sample_rate"] = metadata.sample_rate
+        f.attrs["center_freq"] = metadata.center_freq
+        f.attrs["timestamp"] = metadata.timestamp
+        f.attrs["duration"] = metadata.duration
+        f.attrs["samples_count"] = metadata.samples_count
+        f.attrs["signal_type"] = metadata.signal_type
+        f.attrs["rf_channel"] = metadata.rf_channel
+        f.attrs["gain"] = metadata.gain
+        f.attrs["file_version"] = "1.2"
+
+        # 保存附加元数据
+        for key, value in metadata.additional_metadata.items():
+            if isinstance(value, (str, int, float, bool)):
+                f.attrs[key] = value
+
+        # 缓存的样本统计，使 get_file_info 无需读取样本
+        for key, value in (stats or {}).items():
+            f.attrs[key] = value
+
     def _save_binary_atomic(
         self,
         samples: np.ndarray,
         metadata: SignalMetadata,
         file_path: Path,
         temp_paths: List[Path],
+        stats: Optional[Dict] = None,
     ) -> bool:
+        meta_path = self._metadata_path(file_path)
         temp_data_path = self._build_temp_path(file_path)
-        temp_meta_path = self._build_temp_path(file_path.with_suffix(".txt"))
+        temp_meta_path = self._build_temp_path(meta_path)
         temp_paths.extend([temp_data_path, temp_meta_path])
 
-        if not self._write_binary_data(samples, temp_data_path):
+        if (stats or {}).get("sample_dtype") == "sc16":
+            written = self._write_sc16_data(samples, temp_data_path, stats["scale"])
+        elif file_path.suffix.lower() == NPY_SUFFIX:
+            written = self._write_npy_data(samples, temp_data_path)
+        else:
+            written = self._write_binary_data(samples, temp_data_path)
+        if not written:
             return False
 
-        if not self._write_binary_metadata(metadata, temp_meta_path):
+        if not self._write_sidecar(metadata, file_path, temp_meta_path, stats):
             return False
 
         self._fsync_file(temp_data_path)
@@ -137,19 +472,18 @@ class FileManager:
         self._sync_directory(file_path.parent)
 
         self._fsync_file(temp_meta_path)
-        os.replace(temp_meta_path, file_path.with_suffix(".txt"))
+        os.replace(temp_meta_path, meta_path)
         self._sync_directory(file_path.parent)
 
         return True
 
     def _write_binary_data(self, samples: np.ndarray, path: Path) -> bool:
         try:
-            interleaved = np.zeros(2 * len(samples), dtype=np.float32)
-            interleaved[0::2] = np.real(samples)
-            interleaved[1::2] = np.imag(samples)
-
+            # complex64 的内存布局即交织 float32 I/Q，按块写出避免整段复制
             with open(path, "wb") as data_file:
-                interleaved.tofile(data_file)
+                for start in range(0, len(samples), DEFAULT_CHUNK_SAMPLES):
+                    block = samples[start : start + DEFAULT_CHUNK_SAMPLES]
+                    np.ascontiguousarray(block, dtype=np.complex64).tofile(data_file)
                 data_file.flush()
                 os.fsync(data_file.fileno())
 
@@ -158,7 +492,141 @@ class FileManager:
             logger.exception("Error writing binary data to %s", path)
             return False
 
-    def _write_binary_metadata(self, metadata: SignalMetadata, path: Path) -> bool:
+    def _write_npy_data(self, samples: np.ndarray, path: Path) -> bool:
+        try:
+            # open_memmap 预分配 .npy 文件并按块写入，不生成整段中间副本
+            output = np.lib.format.open_memmap(path, mode="w+", dtype=np.complex64, shape=(len(samples),))
+            for start in range(0, len(samples), DEFAULT_CHUNK_SAMPLES):
+                output[start : start + DEFAULT_CHUNK_SAMPLES] = samples[start : start + DEFAULT_CHUNK_SAMPLES]
+            output.flush()
+            del output
+
+            return True
+        except Exception:
+            logger.exception("Error writing NumPy data to %s", path)
+            return False
+
+    def _write_sc16_data(self, samples: np.ndarray, path: Path, scale: float) -> bool:
+        try:
+            with open(path, "wb") as data_file:
+                for start in range(0, len(samples), DEFAULT_CHUNK_SAMPLES):
+                    to_sc16(samples[start : start + DEFAULT_CHUNK_SAMPLES], scale).tofile(data_file)
+                data_file.flush()
+                os.fsync(data_file.fileno())
+
+            return True
+        except Exception:
+            logger.exception("Error writing sc16 data to %s", path)
+            return False
+
+    def _data_path(self, filename) -> Path:
+        """SigMF 元数据文件名映射到对应的数据文件"""
+        path = Path(filename)
+        if path.suffix.lower() == SIGMF_META_SUFFIX:
+            return path.with_suffix(SIGMF_DATA_SUFFIX)
+        return path
+
+    def _metadata_path(self, data_path: Path) -> Path:
+        """原始数据文件对应的元数据旁路文件（.txt、.sigmf-meta 或 NumPy 文件的 .json）"""
+        if data_path.suffix.lower() == SIGMF_DATA_SUFFIX:
+            return data_path.with_suffix(SIGMF_META_SUFFIX)
+        if data_path.suffix.lower() in NUMPY_SUFFIXES:
+            return data_path.with_suffix(".json")
+        return data_path.with_suffix(".txt")
+
+    def _write_sidecar(
+        self, metadata: SignalMetadata, data_path: Path, path: Path, stats: Optional[Dict] = None
+    ) -> bool:
+        if data_path.suffix.lower() == SIGMF_DATA_SUFFIX:
+            return self._write_sigmf_metadata(metadata, path, stats)
+        if data_path.suffix.lower() in NUMPY_SUFFIXES:
+            return self._write_numpy_metadata(metadata, path, stats)
+        return self._write_binary_metadata(metadata, path, stats)
+
+    def _write_sigmf_metadata(
+        self, metadata: SignalMetadata, path: Path, stats: Optional[Dict] = None
+    ) -> bool:
+        """写入 SigMF .sigmf-meta（global + 单个 capture 段），非标准字段使用 rpt: 扩展命名空间"""
+        try:
+            stats = dict(stats or {})
+            datatype = "ci16_le" if stats.get("sample_dtype") == "sc16" else "cf32_le"
+            global_meta = {
+                "core:datatype": datatype,
+                "core:sample_rate": float(metadata.sample_rate),
+                "core:version": SIGMF_VERSION,
+                "core:num_channels": 1,
+                "core:recorder": "RPT",
+                "core:extensions": [{"name": "rpt", "version": "1.0.0", "optional": True}],
+                "rpt:signal_type": metadata.signal_type,
+                "rpt:rf_channel": int(metadata.rf_channel),
+            }
+            for key, value in metadata.additional_metadata.items():
+                derived = key in STATS_FIELDS or key.startswith("sigmf_")
+                if isinstance(value, (str, int, float, bool)) and not derived:
+                    global_meta[f"rpt:{key}"] = value
+            for key, value in stats.items():
+                if key != "sample_dtype" and np.isfinite(value):
+                    global_meta[f"rpt:{key}"] = float(value)
+
+            capture = {
+                "core:sample_start": 0,
+                "core:frequency": float(metadata.center_freq),
+                "rpt:gain": float(metadata.gain),
+            }
+            capture_time = _sigmf_datetime(metadata.timestamp)
+            if capture_time is not None:
+                capture["core:datetime"] = capture_time
+            else:
+                capture["rpt:timestamp"] = str(metadata.timestamp)
+
+            with open(path, "w") as f:
+                json.dump(
+                    {"global": global_meta, "captures": [capture], "annotations": []},
+                    f,
+                    indent=2,
+                    default=_json_scalar,
+                )
+                f.flush()
+                os.fsync(f.fileno())
+
+            return True
+        except Exception:
+            logger.exception("Error writing SigMF metadata to %s", path)
+            return False
+
+    def _write_numpy_metadata(
+        self, metadata: SignalMetadata, path: Path, stats: Optional[Dict] = None
+    ) -> bool:
+        """写入 .npy 的 JSON 旁路（字段与 FormatConverter 导出的一致）"""
+        try:
+            meta_data = {
+                "sample_rate": metadata.sample_rate,
+                "center_freq": metadata.center_freq,
+                "timestamp": metadata.timestamp,
+                "duration": metadata.duration,
+                "samples_count": int(metadata.samples_count),
+                "signal_type": metadata.signal_type,
+                "rf_channel": metadata.rf_channel,
+                "gain": metadata.gain,
+            }
+            for key, value in metadata.additional_metadata.items():
+                if isinstance(value, (str, int, float, bool, np.generic)) and key not in STATS_FIELDS:
+                    meta_data[key] = value
+            meta_data.update(stats or {})
+
+            with open(path, "w") as f:
+                json.dump(meta_data, f, indent=2, default=_json_scalar)
+                f.flush()
+                os.fsync(f.fileno())
+
+            return True
+        except Exception:
+            logger.exception("Error writing NumPy metadata to %s", path)
+            return False
+
+    def _write_binary_metadata(
+        self, metadata: SignalMetadata, path: Path, stats: Optional[Dict] = None
+    ) -> bool:
         try:
             with open(path, "w") as f:
                 f.write(f"Sample_Rate: {metadata.sample_rate}\n")
@@ -169,6 +637,8 @@ class FileManager:
                 f.write(f"Signal_Type: {metadata.signal_type}\n")
                 f.write(f"RF_Channel: {metadata.rf_channel}\n")
                 f.write(f"Gain: {metadata.gain}\n")
+                for key, value in (stats or {}).items():
+                    f.write(f"{STATS_FIELDS[key]}: {value}\n")
                 f.flush()
                 os.fsync(f.fileno())
 
@@ -203,16 +673,28 @@ class FileManager:
             logger.debug("Unable to sync directory %s: %s", directory, exc)
 
     def load_signal(
-        self, filename: str
+        self, filename: str, mmap: bool = False
     ) -> Tuple[Optional[np.ndarray], Optional[SignalMetadata]]:
-        """加载信号文件"""
+        """加载信号文件
+
+        mmap=True 时返回只读的 complex64 内存映射视图（np.memmap），
+        不复制、不重排交织数据，适用于多 GB 的原始 IQ 文件。
+        sc16 文件无法直接映射为复数，按块从 int16 转换为 complex64。
+        .npy 总是以 mmap_mode='r' 打开；.npz 为 zip 归档，只能整体读入。
+        """
         try:
             file_path = Path(filename)
 
             if file_path.suffix.lower() == ".h5":
-                return self._load_hdf5(filename)
+                return self._load_hdf5(filename, mmap=mmap)
+            elif file_path.suffix.lower() == SC16_SUFFIX:
+                return self._load_sc16(filename)
+            elif file_path.suffix.lower() in (SIGMF_DATA_SUFFIX, SIGMF_META_SUFFIX):
+                return self._load_sigmf(filename, mmap=mmap)
+            elif file_path.suffix.lower() in NUMPY_SUFFIXES:
+                return self._load_numpy(filename, mmap=mmap)
             else:
-                return self._load_binary(filename)
+                return self._load_binary(filename, mmap=mmap)
 
         except Exception as e:
             print(f"Error loading signal: {e}")
@@ -242,8 +724,290 @@ class FileManager:
             logger.exception("Integrity check encountered an error for %s", filename)
             return False
 
+    def load_metadata(self, filename: str) -> Optional[SignalMetadata]:
+        """只读取文件头/旁路元数据，不加载样本"""
+        try:
+            if Path(filename).suffix.lower() == ".h5":
+                if not H5PY_AVAILABLE:
+                    print("h5py not available: cannot load HDF5 file")
+                    return None
+                with h5py.File(filename, "r") as f:
+                    dataset = self._select_hdf5_dataset(f)
+                    return self._read_hdf5_metadata(f, int(dataset.shape[0]))
+
+            if self._is_sigmf(filename):
+                return self._read_sigmf_metadata(filename, self._binary_sample_count(filename))
+
+            if self._is_numpy(filename):
+                return self._read_numpy_metadata(filename, self._numpy_header(filename)[0][0])
+
+            return self._read_binary_metadata(filename, self._binary_sample_count(filename))
+        except Exception as e:
+            print(f"Error loading signal metadata: {e}")
+            return None
+
+    def get_sample_count(self, filename: str) -> int:
+        """返回文件中的复数样本数（不读取样本数据）"""
+        if Path(filename).suffix.lower() == ".h5":
+            if not H5PY_AVAILABLE:
+                raise RuntimeError("h5py not available: cannot read HDF5 file")
+            with h5py.File(filename, "r") as f:
+                return int(self._select_hdf5_dataset(f).shape[0])
+        if self._is_numpy(filename):
+            return self._numpy_header(filename)[0][0]
+        return self._binary_sample_count(filename)
+
+    def read_range(
+        self, filename: str, start: int, count: int
+    ) -> Optional[np.ndarray]:
+        """读取 [start, start + count) 范围内的样本
+
+        HDF5 使用数据集切片，二进制文件按偏移量读取；超出文件末尾的部分被截断。
+        """
+        try:
+            start = int(start)
+            count = int(count)
+            if start < 0 or count < 0:
+                raise ValueError(f"Invalid range: start={start}, count={count}")
+
+            if Path(filename).suffix.lower() == ".h5":
+                if not H5PY_AVAILABLE:
+                    print("h5py not available: cannot load HDF5 file")
+                    return None
+                with h5py.File(filename, "r") as f:
+                    dataset = self._select_hdf5_dataset(f)
+                    return self._read_hdf5_samples(dataset, start, start + count)
+
+            if self._is_numpy(filename):
+                return self._numpy_samples(self._open_numpy(filename), start, start + count, copy=True)
+
+            data_path, scale = self._raw_layout(filename)
+            with open(data_path, "rb") as handle:
+                return self._read_binary_block(handle, start, count, scale)
+        except Exception:
+            logger.exception("FileManager.read_range failed for %s", filename)
+            return None
+
+    def iter_chunks(
+        self,
+        filename: str,
+        chunk: int = DEFAULT_CHUNK_SAMPLES,
+        start: int = 0,
+        count: Optional[int] = None,
+    ) -> Iterator[np.ndarray]:
+        """按块迭代文件中的样本，内存占用只与块大小有关
+
+        文件在整个迭代期间保持打开；读取错误会直接抛出给调用者。
+        """
+        chunk = int(chunk)
+        if chunk <= 0:
+            raise ValueError(f"chunk must be positive, got {chunk}")
+
+        total = self.get_sample_count(filename)
+        position = max(0, int(start))
+        end = total if count is None else min(total, position + int(count))
+
+        if Path(filename).suffix.lower() == ".h5":
+            with h5py.File(filename, "r") as f:
+                dataset = self._select_hdf5_dataset(f)
+                while position < end:
+                    stop = min(position + chunk, end)
+                    yield self._read_hdf5_samples(dataset, position, stop)
+                    position = stop
+            return
+
+        if self._is_numpy(filename):
+            array = self._open_numpy(filename)
+            while position < end:
+                stop = min(position + chunk, end)
+                yield self._numpy_samples(array, position, stop, copy=True)
+                position = stop
+            return
+
+        data_path, scale = self._raw_layout(filename)
+        with open(data_path, "rb") as handle:
+            while position < end:
+                block = self._read_binary_block(handle, position, min(chunk, end - position), scale)
+                if block.size == 0:
+                    break
+                yield block
+                position += block.size
+
+    def resampler_for(
+        self, filename: str, output_rate: Optional[float] = None, shift_hz: float = 0.0
+    ) -> StreamingResampler:
+        """按文件头采样率构造重采样器；output_rate 为 None 时保持原采样率（仅频移）"""
+        metadata = self.load_metadata(filename)
+        if metadata is None or not metadata.sample_rate or metadata.sample_rate <= 0:
+            raise ValueError(f"Cannot resample {filename}: unknown sample rate")
+        return StreamingResampler.from_rates(
+            metadata.sample_rate, output_rate or metadata.sample_rate, shift_hz=shift_hz
+        )
+
+    def iter_resampled(
+        self,
+        filename: str,
+        output_rate: Optional[float] = None,
+        shift_hz: float = 0.0,
+        chunk: int = DEFAULT_CHUNK_SAMPLES,
+        start: int = 0,
+        count: Optional[int] = None,
+    ) -> Iterator[np.ndarray]:
+        """按块迭代重采样（可选频移）后的样本，滤波器与 NCO 状态跨块延续
+
+        输出块长度约为 chunk * output_rate / sample_rate；结束时输出滤波器尾部。
+        """
+        resampler = self.resampler_for(filename, output_rate, shift_hz)
+        return resampler.process_chunks(self.iter_chunks(filename, chunk, start, count))
+
+    def iter_filtered(
+        self,
+        filename: str,
+        taps,
+        chunk: int = DEFAULT_CHUNK_SAMPLES,
+        start: int = 0,
+        count: Optional[int] = None,
+    ) -> Iterator[np.ndarray]:
+        """按块迭代 FIR 滤波后的样本（与 mode="same" 对齐，总长度不变），内存只与块大小有关"""
+        return StreamingFIR(taps).process_chunks(self.iter_chunks(filename, chunk, start, count))
+
+    @staticmethod
+    def resampled_metadata(metadata: SignalMetadata, resampler: StreamingResampler) -> SignalMetadata:
+        """重采样/频移后的元数据：更新采样率、中心频率与样本数，丢弃不再适用的缓存统计"""
+        extra = {
+            key: value
+            for key, value in metadata.additional_metadata.items()
+            if key not in PERSISTED_FIELDS
+        }
+        extra["source_sample_rate"] = float(metadata.sample_rate)
+        if resampler.shift_hz:
+            extra["frequency_shift"] = resampler.shift_hz
+        return SignalMetadata(
+            sample_rate=resampler.output_rate,
+            # 频移 +f 把原 center - f 处的信号搬到零频
+            center_freq=metadata.center_freq - resampler.shift_hz,
+            timestamp=metadata.timestamp,
+            duration=metadata.duration,
+            samples_count=resampler.output_length(metadata.samples_count),
+            signal_type=metadata.signal_type,
+            rf_channel=metadata.rf_channel,
+            gain=metadata.gain,
+            additional_metadata=extra,
+        )
+
+    def _binary_sample_count(self, filename: str) -> int:
+        data_path, scale = self._raw_layout(filename)
+        itemsize = 2 * np.dtype(np.int16).itemsize if scale is not None else np.dtype(np.complex64).itemsize
+        return os.path.getsize(data_path) // itemsize
+
+    def _raw_layout(self, filename: str) -> Tuple[Path, Optional[float]]:
+        """返回原始样本数据文件路径与 sc16 缩放系数（fc32 数据为 None）"""
+        path = Path(filename)
+        suffix = path.suffix.lower()
+        if suffix == SC16_SUFFIX:
+            metadata = self._read_binary_metadata(filename, 0)
+            return path, float(metadata.additional_metadata.get("scale", SC16_DEFAULT_SCALE))
+        if suffix in (SIGMF_DATA_SUFFIX, SIGMF_META_SUFFIX):
+            global_meta = self._read_sigmf_json(filename).get("global", {})
+            datatype = global_meta.get("core:datatype")
+            if datatype not in SIGMF_DATATYPES:
+                raise ValueError(f"Unsupported SigMF datatype: {datatype}")
+            scale = None
+            if SIGMF_DATATYPES[datatype] == "sc16":
+                scale = float(global_meta.get("rpt:scale", SC16_DEFAULT_SCALE))
+            return self._data_path(filename), scale
+        return path, None
+
+    @staticmethod
+    def _is_sigmf(filename) -> bool:
+        return Path(filename).suffix.lower() in (SIGMF_DATA_SUFFIX, SIGMF_META_SUFFIX)
+
+    @staticmethod
+    def _is_numpy(filename) -> bool:
+        return Path(filename).suffix.lower() in NUMPY_SUFFIXES
+
+    def _open_numpy(self, filename) -> np.ndarray:
+        """打开 NumPy 样本数组：.npy 只读内存映射，.npz 读取 "samples"（或第一个）数组
+
+        支持一维复数数组或 (N, 2) 实数 I/Q 数组。.npz 无法内存映射，解压结果按
+        (路径, mtime, 大小) 缓存（只读），逐块读取同一文件时只解压一次。
+        """
+        if Path(filename).suffix.lower() == NPZ_SUFFIX:
+            stat = os.stat(filename)
+            array = _load_npz_samples(str(Path(filename).resolve()), stat.st_mtime_ns, stat.st_size)
+        else:
+            array = np.load(filename, mmap_mode="r", allow_pickle=False)
+        _check_numpy_samples(array.shape, array.dtype)
+        return array
+
+    def _numpy_header(self, filename) -> Tuple[Tuple[int, ...], np.dtype]:
+        """只读取 .npy 头（.npz 中为成员的 .npy 头）得到 (shape, dtype)，不加载样本"""
+        if Path(filename).suffix.lower() == NPZ_SUFFIX:
+            with zipfile.ZipFile(filename) as archive:
+                with archive.open(_npz_member(archive)) as handle:
+                    shape, dtype = _read_npy_header(handle)
+        else:
+            with open(filename, "rb") as handle:
+                shape, dtype = _read_npy_header(handle)
+        _check_numpy_samples(shape, dtype)
+        return shape, dtype
+
+    def _numpy_samples(
+        self, array: np.ndarray, start: int = 0, stop: Optional[int] = None, copy: bool = False
+    ) -> np.ndarray:
+        """取 NumPy 样本数组切片并转换为策略样本类型；复数类型匹配且 copy=False 时为视图"""
+        block = array[start:stop]
+        if block.dtype == get_sample_dtype() and not copy:
+            return block
+        if block.dtype.kind == "c":
+            return as_samples(block, copy=copy)
+        samples = np.empty(len(block), dtype=get_sample_dtype())
+        samples.real = block[:, 0]
+        samples.imag = block[:, 1]
+        return samples
+
+    def _read_binary_block(self, handle, start: int, count: int, scale: Optional[float] = None) -> np.ndarray:
+        """从交织 float32 文件中读取一段样本，返回 complex64 视图
+
+        scale 不为 None 时按交织 int16 (sc16) 读取并转换。
+        """
+        if scale is not None:
+            handle.seek(start * 2 * np.dtype(np.int16).itemsize)
+            interleaved = np.fromfile(handle, dtype=np.int16, count=2 * count)
+            if interleaved.size % 2 != 0:
+                interleaved = interleaved[:-1]
+            return from_sc16(interleaved, scale)
+
+        itemsize = np.dtype(np.complex64).itemsize
+        handle.seek(start * itemsize)
+        interleaved = np.fromfile(handle, dtype=np.float32, count=2 * count)
+        if interleaved.size % 2 != 0:
+            interleaved = interleaved[:-1]
+        return as_samples(interleaved.view(np.complex64))
+
+    def _read_hdf5_samples(self, dataset, start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+        """读取复数数据集切片，由 HDF5 在读取时直接转换为策略样本类型
+
+        sc16 数据集 ((N, 2) int16 + scale 属性) 按块读取并转换，不生成 float64 中间数组。
+        """
+        if self._is_sc16_dataset(dataset):
+            start, stop, _ = slice(start, stop).indices(dataset.shape[0])
+            scale = float(dataset.attrs.get("scale", SC16_DEFAULT_SCALE))
+            out = np.empty(max(0, stop - start), dtype=get_sample_dtype())
+            for offset in range(start, stop, DEFAULT_CHUNK_SAMPLES):
+                block = dataset[offset : min(offset + DEFAULT_CHUNK_SAMPLES, stop)]
+                out[offset - start : offset - start + len(block)] = from_sc16(block, scale)
+            return out
+        if dataset.dtype.kind == "c" and dataset.dtype != get_sample_dtype():
+            return dataset.astype(get_sample_dtype())[start:stop]
+        return dataset[start:stop]
+
+    @staticmethod
+    def _is_sc16_dataset(dataset) -> bool:
+        return dataset.dtype == np.int16 and dataset.ndim == 2 and dataset.shape[1] == 2
+
     def _load_hdf5(
-        self, filename: str
+        self, filename: str, mmap: bool = False
     ) -> Tuple[Optional[np.ndarray], Optional[SignalMetadata]]:
         """加载HDF5文件"""
         if not H5PY_AVAILABLE:
@@ -252,134 +1016,382 @@ class FileManager:
         try:
             with h5py.File(filename, "r") as f:
                 # 加载样本数据
-                if "samples" in f:
-                    samples = f["samples"][:]
-                else:
-                    # 尝试其他数据集名称
-                    datasets = list(f.keys())
-                    if datasets:
-                        samples = f[datasets[0]][:]
-                    else:
-                        raise ValueError("No datasets found in file")
-
-                # 加载元数据
-                metadata = SignalMetadata(
-                    sample_rate=f.attrs.get("sample_rate", 0),
-                    center_freq=f.attrs.get("center_freq", 0),
-                    timestamp=f.attrs.get("timestamp", ""),
-                    duration=f.attrs.get("duration", 0),
-                    samples_count=f.attrs.get("samples_count", len(samples)),
-                    signal_type=f.attrs.get("signal_type", "unknown"),
-                    rf_channel=f.attrs.get("rf_channel", 0),
-                    gain=f.attrs.get("gain", 0.0),
-                )
+                dataset = self._select_hdf5_dataset(f)
 
-                # 加载附加元数据
-                for key in f.attrs:
-                    if key not in [
-                        "sample_rate",
-                        "center_freq",
-                        "timestamp",
-                        "duration",
-                        "samples_count",
-                        "signal_type",
-                        "rf_channel",
-                        "gain",
-                    ]:
-                        metadata.additional_metadata[key] = f.attrs[key]
+                samples = self._map_hdf5_dataset(filename, dataset) if mmap else None
+                if samples is None:
+                    samples = self._read_hdf5_samples(dataset)
+                elif samples.dtype != get_sample_dtype():
+                    samples = as_samples(samples)
+
+                metadata = self._read_hdf5_metadata(f, len(samples))
 
             return samples, metadata
         except Exception as e:
             print(f"Error loading HDF5 file: {e}")
             return None, None
 
-    def _load_binary(
-        self, filename: str
-    ) -> Tuple[Optional[np.ndarray], Optional[SignalMetadata]]:
-        """加载二进制文件"""
+    def _select_hdf5_dataset(self, f):
+        """返回 HDF5 文件中的样本数据集"""
+        if "samples" in f:
+            return f["samples"]
+        # 尝试其他数据集名称
+        datasets = list(f.keys())
+        if datasets:
+            return f[datasets[0]]
+        raise ValueError("No datasets found in file")
+
+    def _read_hdf5_metadata(self, f, samples_count: int) -> SignalMetadata:
+        """从 HDF5 文件属性构建元数据"""
+        # 加载元数据
+        metadata = SignalMetadata(
+            sample_rate=f.attrs.get("sample_rate", 0),
+            center_freq=f.attrs.get("center_freq", 0),
+            timestamp=f.attrs.get("timestamp", ""),
+            duration=f.attrs.get("duration", 0),
+            samples_count=f.attrs.get("samples_count", samples_count),
+            signal_type=f.attrs.get("signal_type", "unknown"),
+            rf_channel=f.attrs.get("rf_channel", 0),
+            gain=f.attrs.get("gain", 0.0),
+        )
+
+        # 加载附加元数据
+        for key in f.attrs:
+            if key not in [
+                "sample_rate",
+                "center_freq",
+                "timestamp",
+                "duration",
+                "samples_count",
+                "signal_type",
+                "rf_channel",
+                "gain",
+            ]:
+                metadata.additional_metadata[key] = f.attrs[key]
+
+        return metadata
+
+    def _map_hdf5_dataset(self, filename: str, dataset) -> Optional[np.ndarray]:
+        """对未压缩的连续复数数据集建立内存映射，不满足条件时返回 None"""
         try:
-            # 读取二进制数据
-            interleaved = np.fromfile(filename, dtype=np.float32)
-
-            # 转换为复数
-            if len(interleaved) % 2 != 0:
-                print("Warning: Binary file has odd number of floats, truncating")
-                interleaved = interleaved[: len(interleaved) // 2 * 2]
-
-            samples = interleaved[0::2] + 1j * interleaved[1::2]
-
-            # 尝试加载元数据
-            meta_file = Path(filename).with_suffix(".txt")
-            metadata = SignalMetadata(
-                sample_rate=200e3,  # 默认值
-                center_freq=10e6,
-                timestamp=datetime.now().isoformat(),
-                duration=len(samples) / 200e3,
-                samples_count=len(samples),
+            if dataset.chunks is not None or dataset.dtype.kind != "c":
+                return None
+            offset = dataset.id.get_offset()
+            if offset is None or dataset.shape[0] == 0:
+                return None
+            return np.memmap(
+                filename,
+                dtype=dataset.dtype,
+                mode="r",
+                offset=offset,
+                shape=dataset.shape,
             )
+        except Exception as exc:
+            logger.debug("Unable to memory-map HDF5 dataset in %s: %s", filename, exc)
+            return None
+
+    def _map_binary(self, filename: str) -> np.ndarray:
+        """以 complex64 内存映射交织 float32 IQ 数据（I/Q 字节布局与 complex64 一致）"""
+        itemsize = np.dtype(np.complex64).itemsize
+        file_size = os.path.getsize(filename)
+        if file_size % itemsize != 0:
+            print("Warning: Binary file has odd number of floats, truncating")
 
-            if meta_file.exists():
-                with open(meta_file, "r") as f:
-                    for line in f:
-                        if ":" in line:
-                            key, value = line.strip().split(":", 1)
-                            key = key.strip()
-                            value = value.strip()
-
-                            if key == "Sample_Rate":
-                                metadata.sample_rate = float(value)
-                            elif key == "Center_Freq":
-                                metadata.center_freq = float(value)
-                            elif key == "Timestamp":
-                                metadata.timestamp = value
-                            elif key == "Duration":
-                                metadata.duration = float(value)
-                            elif key == "Samples_Count":
-                                metadata.samples_count = int(value)
-                            elif key == "Signal_Type":
-                                metadata.signal_type = value
-                            elif key == "RF_Channel":
-                                metadata.rf_channel = int(value)
-                            elif key == "Gain":
-                                metadata.gain = float(value)
+        count = file_size // itemsize
+        if count == 0:
+            return np.zeros(0, dtype=np.complex64)
+        return np.memmap(filename, dtype=np.complex64, mode="r", shape=(count,))
 
+    def _load_binary(
+        self, filename: str, mmap: bool = False
+    ) -> Tuple[Optional[np.ndarray], Optional[SignalMetadata]]:
+        """加载二进制文件"""
+        try:
+            samples = self._read_fc32_samples(filename, mmap)
+            metadata = self._read_binary_metadata(filename, len(samples))
             return samples, metadata
         except Exception as e:
             print(f"Error loading binary file: {e}")
             return None, None
 
+    def _read_fc32_samples(self, data_path, mmap: bool = False) -> np.ndarray:
+        """读取交织 float32 样本，mmap=True 时返回内存映射视图"""
+        if mmap:
+            samples = self._map_binary(data_path)
+            if samples.dtype != get_sample_dtype():
+                samples = as_samples(samples)
+            return samples
+
+        # 读取二进制数据
+        interleaved = np.fromfile(data_path, dtype=np.float32)
+
+        # 转换为复数（交织 float32 即 complex64 的内存布局，直接视图）
+        if len(interleaved) % 2 != 0:
+            print("Warning: Binary file has odd number of floats, truncating")
+            interleaved = interleaved[: len(interleaved) // 2 * 2]
+
+        return as_samples(interleaved.view(np.complex64))
+
+    def _read_sc16_samples(self, data_path, count: int, scale: float) -> np.ndarray:
+        """内存映射 int16 I/Q 数据并按块转换为 complex64"""
+        samples = np.empty(count, dtype=get_sample_dtype())
+        if count:
+            raw = np.memmap(data_path, dtype=np.int16, mode="r", shape=(count, 2))
+            for start in range(0, count, DEFAULT_CHUNK_SAMPLES):
+                stop = min(start + DEFAULT_CHUNK_SAMPLES, count)
+                samples[start:stop] = from_sc16(raw[start:stop], scale)
+            del raw
+        return samples
+
+    def _load_sigmf(
+        self, filename: str, mmap: bool = False
+    ) -> Tuple[Optional[np.ndarray], Optional[SignalMetadata]]:
+        """加载 SigMF 录音：cf32_le 可直接内存映射，ci16_le 按块转换"""
+        try:
+            data_path, scale = self._raw_layout(filename)
+            if scale is None:
+                samples = self._read_fc32_samples(data_path, mmap)
+            else:
+                samples = self._read_sc16_samples(data_path, self._binary_sample_count(filename), scale)
+            return samples, self._read_sigmf_metadata(filename, len(samples))
+        except Exception as e:
+            print(f"Error loading SigMF file: {e}")
+            return None, None
+
+    def _load_numpy(
+        self, filename: str, mmap: bool = False
+    ) -> Tuple[Optional[np.ndarray], Optional[SignalMetadata]]:
+        """加载 .npy/.npz 文件，元数据取自 FormatConverter 写出的 .json 旁路"""
+        try:
+            array = self._open_numpy(filename)
+            samples = self._numpy_samples(array, copy=not mmap)
+            return samples, self._read_numpy_metadata(filename, len(samples))
+        except Exception as e:
+            print(f"Error loading NumPy file: {e}")
+            return None, None
+
+    def _read_numpy_metadata(self, filename: str, samples_count: int) -> SignalMetadata:
+        """读取 NumPy 文件的 .json 元数据旁路文件"""
+        meta_file = self._metadata_path(Path(filename))
+        metadata = SignalMetadata(
+            sample_rate=200e3,  # 默认值，与二进制文件一致
+            center_freq=10e6,
+            timestamp=datetime.now().isoformat(),
+            duration=samples_count / 200e3,
+            samples_count=samples_count,
+        )
+
+        if meta_file.exists():
+            with open(meta_file, "r") as f:
+                meta_data = json.load(f)
+            fields = {
+                "sample_rate": float,
+                "center_freq": float,
+                "timestamp": str,
+                "duration": float,
+                "samples_count": int,
+                "signal_type": str,
+                "rf_channel": int,
+                "gain": float,
+            }
+            for key, value in meta_data.items():
+                if key in fields:
+                    setattr(metadata, key, fields[key](value))
+                else:
+                    metadata.additional_metadata[key] = value
+
+        return metadata
+
+    def _read_sigmf_json(self, filename) -> Dict:
+        meta_path = self._metadata_path(self._data_path(filename))
+        with open(meta_path, "r") as f:
+            return json.load(f)
+
+    def _read_sigmf_metadata(self, filename: str, samples_count: int) -> SignalMetadata:
+        """从 .sigmf-meta 的 global 与首个 capture 段构建元数据"""
+        meta = self._read_sigmf_json(filename)
+        global_meta = meta.get("global", {})
+        captures = meta.get("captures") or [{}]
+        capture = captures[0]
+
+        sample_rate = float(global_meta.get("core:sample_rate", 0.0))
+        metadata = SignalMetadata(
+            sample_rate=sample_rate,
+            center_freq=float(capture.get("core:frequency", 0.0)),
+            timestamp=str(capture.get("core:datetime", capture.get("rpt:timestamp", ""))),
+            duration=samples_count / sample_rate if sample_rate else 0.0,
+            samples_count=samples_count,
+            signal_type=str(global_meta.get("rpt:signal_type", "unknown")),
+            rf_channel=int(global_meta.get("rpt:rf_channel", 0)),
+            gain=float(capture.get("rpt:gain", 0.0)),
+        )
+
+        extra = metadata.additional_metadata
+        extra["sample_dtype"] = "sc16" if SIGMF_DATATYPES.get(global_meta.get("core:datatype")) == "sc16" else "complex64"
+        extra["sigmf_datatype"] = global_meta.get("core:datatype")
+        for key, value in global_meta.items():
+            if key.startswith("rpt:") and key not in ("rpt:signal_type", "rpt:rf_channel"):
+                extra[key[len("rpt:"):]] = value
+        if len(captures) > 1:
+            extra["sigmf_capture_count"] = len(captures)
+        return metadata
+
+    def _load_sc16(self, filename: str) -> Tuple[Optional[np.ndarray], Optional[SignalMetadata]]:
+        """加载 .sc16 文件：内存映射 int16 数据并按块转换为 complex64"""
+        try:
+            count = self._binary_sample_count(filename)
+            metadata = self._read_binary_metadata(filename, count)
+            scale = float(metadata.additional_metadata.get("scale", SC16_DEFAULT_SCALE))
+            return self._read_sc16_samples(filename, count, scale), metadata
+        except Exception as e:
+            print(f"Error loading sc16 file: {e}")
+            return None, None
+
+    def _read_binary_metadata(self, filename: str, samples_count: int) -> SignalMetadata:
+        """读取二进制文件的 .txt 元数据旁路文件"""
+        # 尝试加载元数据
+        meta_file = Path(filename).with_suffix(".txt")
+        metadata = SignalMetadata(
+            sample_rate=200e3,  # 默认值
+            center_freq=10e6,
+            timestamp=datetime.now().isoformat(),
+            duration=samples_count / 200e3,
+            samples_count=samples_count,
+        )
+
+        if meta_file.exists():
+            with open(meta_file, "r") as f:
+                for line in f:
+                    if ":" in line:
+                        key, value = line.strip().split(":", 1)
+                        key = key.strip()
+                        value = value.strip()
+
+                        if key == "Sample_Rate":
+                            metadata.sample_rate = float(value)
+                        elif key == "Center_Freq":
+                            metadata.center_freq = float(value)
+                        elif key == "Timestamp":
+                            metadata.timestamp = value
+                        elif key == "Duration":
+                            metadata.duration = float(value)
+                        elif key == "Samples_Count":
+                            metadata.samples_count = int(value)
+                        elif key == "Signal_Type":
+                            metadata.signal_type = value
+                        elif key == "RF_Channel":
+                            metadata.rf_channel = int(value)
+                        elif key == "Gain":
+                            metadata.gain = float(value)
+                        elif key == "Sample_Dtype":
+                            metadata.additional_metadata["sample_dtype"] = value
+                        elif key in _SIDECAR_STATS:
+                            metadata.additional_metadata[_SIDECAR_STATS[key]] = float(value)
+
+        return metadata
+
     def get_file_info(self, filename: str) -> Dict:
-        """获取文件信息"""
-        samples, metadata = self.load_signal(filename)
+        """获取文件信息
+
+        只读取文件头/旁路元数据；功率统计优先使用保存时缓存的字段，
+        旧文件回退为分块流式计算（结果按 mtime/大小缓存在内存中）。
+        """
+        metadata = self.load_metadata(filename)
 
-        if samples is None:
+        if metadata is None:
             return {"error": "Failed to load file"}
 
-        file_path = Path(filename)
-        file_size = file_path.stat().st_size
+        try:
+            samples_count, sample_dtype = self._describe_samples(filename)
+            power_stats = self._cached_power_stats(metadata)
+            if power_stats is None:
+                power_stats = self._legacy_power_stats(filename)
+        except Exception as e:
+            print(f"Error reading signal samples: {e}")
+            return {"error": "Failed to load file"}
 
-        power_stats = {
-            "average_power": np.mean(np.abs(samples) ** 2),
-            "peak_power": np.max(np.abs(samples) ** 2),
-        }
+        file_size = self._data_path(filename).stat().st_size
 
         return {
             "filename": filename,
             "file_size": file_size,
             "file_size_mb": file_size / 1024 / 1024,
-            "samples_count": len(samples),
-            "duration": len(samples) / metadata.sample_rate,
+            "samples_count": samples_count,
+            "sample_dtype": metadata.additional_metadata.get("sample_dtype", sample_dtype),
+            "duration": samples_count / metadata.sample_rate,
             "sample_rate": metadata.sample_rate,
             "center_freq": metadata.center_freq,
             "signal_type": metadata.signal_type,
             "rf_channel": metadata.rf_channel,
             "gain": metadata.gain,
+            "timestamp": metadata.timestamp,
             "power_stats": power_stats,
         }
 
+    def _describe_samples(self, filename: str) -> Tuple[int, str]:
+        """从文件头读取样本数与数据类型"""
+        if Path(filename).suffix.lower() == ".h5":
+            if not H5PY_AVAILABLE:
+                raise RuntimeError("h5py not available: cannot read HDF5 file")
+            with h5py.File(filename, "r") as f:
+                dataset = self._select_hdf5_dataset(f)
+                if self._is_sc16_dataset(dataset):
+                    return int(dataset.shape[0]), "sc16"
+                return int(dataset.shape[0]), dataset.dtype.name
+        if self._is_numpy(filename):
+            shape, dtype = self._numpy_header(filename)
+            return shape[0], get_sample_dtype().name if dtype.kind != "c" else dtype.name
+        _, scale = self._raw_layout(filename)
+        if scale is not None:
+            return self._binary_sample_count(filename), "sc16"
+        return self._binary_sample_count(filename), np.dtype(np.complex64).name
+
+    def _cached_power_stats(self, metadata: SignalMetadata) -> Optional[Dict[str, float]]:
+        extra = metadata.additional_metadata
+        if "average_power" not in extra or "peak_power" not in extra:
+            return None
+        # 新文件还缓存了 I/Q 矩、直流偏置与功率分位数
+        return {key: float(extra[key]) for key in PERSISTED_FIELDS if key in extra}
+
+    def _legacy_power_stats(self, filename: str) -> Dict[str, float]:
+        stat = os.stat(filename)
+        path = str(Path(filename).resolve())
+        version = (stat.st_mtime_ns, stat.st_size)
+        entry = self._stats_cache.get(path)
+        if entry is None or entry[0] != version:
+            entry = (version, self.compute_power_stats(filename))
+            self._stats_cache[path] = entry
+            while len(self._stats_cache) > STATS_CACHE_SIZE:
+                self._stats_cache.popitem(last=False)
+        self._stats_cache.move_to_end(path)
+        return dict(entry[1])
+
+    def compute_power_stats(self, filename: str) -> Dict[str, float]:
+        """分块计算平均功率与峰值功率"""
+        return self.compute_stats(filename).power_stats()
+
+    def compute_stats(self, filename: str) -> RunningStats:
+        """分块读取文件并累计全部样本统计（见 core.running_stats）"""
+        return RunningStats.from_chunks(self.iter_chunks(filename))
+
+    def get_power_stats(self, filename: str, metadata: Optional[SignalMetadata] = None) -> Dict[str, float]:
+        """平均/峰值功率：优先使用文件头缓存，旧文件回退为分块计算（按 mtime 缓存）"""
+        if metadata is None:
+            metadata = self.load_metadata(filename)
+        cached = self._cached_power_stats(metadata) if metadata is not None else None
+        return cached if cached is not None else self._legacy_power_stats(filename)
+
     def list_available_files(self, directory: str = ".") -> List[Dict]:
-        """列出可用文件"""
+        """列出可用文件
+
+        设置了 catalog（utils.signal_catalog.SignalCatalog）时使用增量索引，
+        只重新读取新增或修改过的文件。
+        """
         dir_path = Path(directory)
+        if self.catalog is not None:
+            self.catalog.rescan(dir_path, self.supported_formats, recursive=False)
+            return self.catalog.list_file_infos(dir_path)
+
         signal_files = []
 
         for fmt in self.supported_formats:
@@ -388,3 +1400,183 @@ class FileManager:
                 signal_files.append(file_info)
 
         return signal_files
+
+
+class SignalWriter:
+    """增量信号写入器
+
+    样本先写入目标路径旁的临时文件（HDF5 可扩展分块数据集或交织 float32 /
+    int16 原始数据），close() 时更新元数据、fsync 并通过 os.replace 原子替换目标文件。
+    """
+
+    def __init__(
+        self,
+        file_manager: FileManager,
+        file_path: Path,
+        metadata: SignalMetadata,
+        profile: Optional[StorageProfile] = None,
+        sample_format: str = "fc32",
+        scale: float = SC16_DEFAULT_SCALE,
+    ):
+        if sample_format not in SAMPLE_FORMATS:
+            raise ValueError(f"Unsupported sample format: {sample_format}")
+        self.files = file_manager
+        self.path = Path(file_path)
+        self.metadata = metadata
+        self.sample_format = sample_format
+        self.scale = float(scale)
+        self.samples_written = 0
+        self.closed = False
+        # 写入过程中累计的样本统计，close() 时写入文件头
+        self.stats = RunningStats()
+        self._is_hdf5 = self.path.suffix.lower() == ".h5"
+        self.temp_path = file_manager._build_temp_path(self.path)
+        self._h5file = None
+        self._dataset = None
+        self._handle = None
+
+        if self._is_hdf5:
+            if not H5PY_AVAILABLE:
+                raise RuntimeError("h5py not available: cannot write HDF5 file")
+            self._h5file = h5py.File(self.temp_path, "w")
+            profile = profile or get_storage_profile(file_manager.storage_profile)
+            if sample_format == "sc16":
+                self._dataset = self._h5file.create_dataset(
+                    "samples",
+                    shape=(0, 2),
+                    maxshape=(None, 2),
+                    dtype=np.int16,
+                    **profile.dataset_kwargs(row_shape=(2,)),
+                )
+                self._dataset.attrs["scale"] = self.scale
+            else:
+                self._dataset = self._h5file.create_dataset(
+                    "samples",
+                    shape=(0,),
+                    maxshape=(None,),
+                    dtype=np.complex64,
+                    **profile.dataset_kwargs(),
+                )
+            file_manager._write_hdf5_attrs(self._h5file, metadata)
+        else:
+            self._handle = open(self.temp_path, "wb")
+
+    def __enter__(self) -> "SignalWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if self.closed:
+            return
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def append(self, chunk: np.ndarray) -> None:
+        """追加一块样本（转换为 complex64）"""
+        if self.closed:
+            raise ValueError("SignalWriter is closed")
+
+        block = np.ascontiguousarray(chunk, dtype=np.complex64).ravel()
+        if block.size == 0:
+            return
+
+        data = to_sc16(block, self.scale) if self.sample_format == "sc16" else block
+        if self._is_hdf5:
+            start = self._dataset.shape[0]
+            self._dataset.resize(start + block.size, axis=0)
+            self._dataset[start:] = data
+        else:
+            # complex64 的内存布局即交织 float32 I/Q；sc16 为 (N, 2) int16
+            data.tofile(self._handle)
+        self.samples_written += block.size
+        self.stats.update(block)
+
+    def flush(self) -> None:
+        """将已写入数据刷新到磁盘，便于异常中断后恢复"""
+        if self.closed:
+            return
+        if self._is_hdf5:
+            self._h5file.flush()
+        else:
+            self._handle.flush()
+            os.fsync(self._handle.fileno())
+
+    def close(self, filename: Optional[str] = None) -> bool:
+        """完成写入并原子替换目标文件；filename 可改写最终文件名（目录与扩展名须与原目标一致）"""
+        if self.closed:
+            return False
+
+        if filename is not None:
+            # 临时文件与格式在打开时已确定，只允许同目录、同扩展名改名
+            target = Path(self.files._resolve_output_path(filename))
+            same_dir = target.parent.resolve() == self.path.parent.resolve()
+            if target.suffix.lower() != self.path.suffix.lower() or not same_dir:
+                raise ValueError(f"filename must keep the directory and suffix of {self.path}: {filename}")
+            self.path = target
+        self.closed = True
+
+        meta_path = self.files._metadata_path(self.path)
+        temp_meta_path = self.files._build_temp_path(meta_path)
+        try:
+            self.metadata.samples_count = int(self.samples_written)
+            if self.metadata.sample_rate:
+                self.metadata.duration = self.samples_written / self.metadata.sample_rate
+            stats = self.stats.persisted()
+            if self.sample_format == "sc16":
+                stats["sample_dtype"] = "sc16"
+                stats["scale"] = self.scale
+            else:
+                stats["sample_dtype"] = np.dtype(np.complex64).name
+
+            if self._is_hdf5:
+                self.files._write_hdf5_attrs(self._h5file, self.metadata, stats)
+                self._h5file.flush()
+                self._h5file.close()
+                self.files._fsync_file(self.temp_path)
+                os.replace(self.temp_path, self.path)
+                self.files._sync_directory(self.path.parent)
+                return True
+
+            self._handle.flush()
+            os.fsync(self._handle.fileno())
+            self._handle.close()
+
+            if not self.files._write_sidecar(self.metadata, self.path, temp_meta_path, stats):
+                logger.error("Buffered samples kept at %s", self.temp_path)
+                return False
+
+            os.replace(self.temp_path, self.path)
+            self.files._sync_directory(self.path.parent)
+
+            self.files._fsync_file(temp_meta_path)
+            os.replace(temp_meta_path, meta_path)
+            self.files._sync_directory(self.path.parent)
+            return True
+        except Exception:
+            logger.exception(
+                "SignalWriter.close failed for %s; buffered samples kept at %s",
+                self.path,
+                self.temp_path,
+            )
+            return False
+        finally:
+            self._release()
+            temp_meta_path.unlink(missing_ok=True)
+
+    def abort(self) -> None:
+        """放弃写入并删除临时文件"""
+        if self.closed:
+            return
+        self.closed = True
+        self._release()
+        self.temp_path.unlink(missing_ok=True)
+
+    def _release(self) -> None:
+        try:
+            if self._h5file is not None:
+                self._h5file.close()
+            if self._handle is not None and not self._handle.closed:
+                self._handle.close()
+        except Exception as exc:
+            logger.debug("Unable to release writer handles for %s: %s", self.path, exc)
@@ -0,0 +1,146 @@
+"""流式 FIR 滤波（直接型 / FFT 重叠保留）
+
+StreamingFIR 逐块滤波，块之间延续 ntaps - 1 个历史样本，内存只与块大小有关，可用于
+录制回调、文件流式读取与信号生成。抽头数不超过 DIRECT_MAX_TAPS 时按抽头直接累加，
+否则使用重叠保留法：输入切成重叠 ntaps - 1 的帧，一次批量 FFT（fft_engine 线程数）、
+与预先计算的滤波器频谱相乘后逆变换，丢弃每帧前 ntaps - 1 个点。
+
+compensate_delay=True（默认）时丢弃前 (ntaps - 1) // 2 个输出并在 flush() 中补齐尾部，
+逐块 process() + flush() 的结果与 scipy.signal.convolve(x, taps, mode="same") 一致。
+实数与复数抽头均可；样本类型遵循 core.dtypes 的样本策略。
+"""
+from typing import Iterable, Iterator, Optional, Sequence
+
+import numpy as np
+import scipy.fft as sp_fft
+
+from .dtypes import as_samples, get_sample_dtype, real_dtype
+from .fft_engine import fft_segments, ifft
+
+# 抽头数不超过该值时直接型更快，超过时使用 FFT 重叠保留
+DIRECT_MAX_TAPS = 8
+
+FIR_METHODS = ("auto", "direct", "fft")
+
+
+def overlap_save_size(num_taps: int) -> int:
+    """重叠保留的 FFT 长度：约 8 倍抽头数，至少 1024 点"""
+    return sp_fft.next_fast_len(max(8 * int(num_taps), 1024))
+
+
+class StreamingFIR:
+    """带状态的分块 FIR 滤波器"""
+
+    def __init__(
+        self,
+        taps: Sequence,
+        method: str = "auto",
+        compensate_delay: bool = True,
+        fft_size: Optional[int] = None,
+        workers: Optional[int] = None,
+    ):
+        taps = np.asarray(taps)
+        if taps.ndim != 1 or taps.size == 0:
+            raise ValueError("taps must be a non-empty 1-D array")
+        method = str(method).lower()
+        if method not in FIR_METHODS:
+            raise ValueError(f"Unsupported FIR method: {method} (expected {', '.join(FIR_METHODS)})")
+
+        self.taps = taps.astype(get_sample_dtype() if np.iscomplexobj(taps) else real_dtype())
+        self.num_taps = self.taps.size
+        self.method = method if method != "auto" else ("direct" if self.num_taps <= DIRECT_MAX_TAPS else "fft")
+        self.delay = (self.num_taps - 1) // 2 if compensate_delay else 0
+        self.workers = workers
+
+        if self.method == "fft":
+            self.fft_size = int(fft_size) if fft_size else overlap_save_size(self.num_taps)
+            if self.fft_size < self.num_taps:
+                raise ValueError(f"fft_size {self.fft_size} shorter than {self.num_taps} taps")
+            self._step = self.fft_size - self.num_taps + 1
+            self._spectrum = sp_fft.fft(self.taps, self.fft_size).astype(get_sample_dtype())
+        self.reset()
+
+    def reset(self) -> None:
+        """清除滤波器历史"""
+        self._history = np.zeros(self.num_taps - 1, dtype=get_sample_dtype())
+        self._pending_skip = self.delay
+
+    def process(self, chunk: np.ndarray) -> np.ndarray:
+        """滤波一块样本；延迟补偿期间输出会比输入短，合计差值由 flush() 补齐"""
+        block = as_samples(np.asarray(chunk).ravel())
+        if block.size == 0:
+            return block
+        buffer = np.concatenate((self._history, block))
+        if self.method == "direct":
+            out = self._direct(buffer, block.size)
+        else:
+            out = self._overlap_save(buffer, block.size)
+        self._history = buffer[buffer.size - (self.num_taps - 1) :].copy()
+
+        if self._pending_skip:
+            skip = min(self._pending_skip, out.size)
+            self._pending_skip -= skip
+            out = out[skip:]
+        return out
+
+    def flush(self) -> np.ndarray:
+        """输入结束：以零补齐输出被延迟补偿推迟的尾部样本"""
+        if not self.delay:
+            return as_samples(np.empty(0))
+        return self.process(np.zeros(self.delay, dtype=self._history.dtype))
+
+    def process_chunks(self, chunks: Iterable[np.ndarray]) -> Iterator[np.ndarray]:
+        """逐块滤波一个样本块迭代器，结束时自动 flush；跳过空输出"""
+        for chunk in chunks:
+            out = self.process(chunk)
+            if out.size:
+                yield out
+        tail = self.flush()
+        if tail.size:
+            yield tail
+
+    def _direct(self, buffer: np.ndarray, count: int) -> np.ndarray:
+        """y[n] = sum_k taps[k] * x[n - k]，逐抽头对整块累加"""
+        last = self.num_taps - 1
+        out = buffer[last : last + count] * self.taps[0]
+        for k in range(1, self.num_taps):
+            out += buffer[last - k : last - k + count] * self.taps[k]
+        return out
+
+    def _overlap_save(self, buffer: np.ndarray, count: int) -> np.ndarray:
+        frames = -(-count // self._step)
+        padded_size = (frames - 1) * self._step + self.fft_size
+        if padded_size > buffer.size:
+            buffer = np.concatenate((buffer, np.zeros(padded_size - buffer.size, dtype=buffer.dtype)))
+        windows = np.lib.stride_tricks.sliding_window_view(buffer, self.fft_size)[:: self._step][:frames]
+        spectra = fft_segments(windows, workers=self.workers)
+        spectra *= self._spectrum
+        filtered = ifft(spectra, workers=self.workers)
+        return filtered[:, self.num_taps - 1 :].ravel()[:count]
+
+
+def fir_filter(samples: np.ndarray, taps: Sequence, mode: str = "same", method: str = "auto") -> np.ndarray:
+    """整段 FIR 滤波（mode: "same" 与输入等长且对齐中心，"full" 为完整卷积）"""
+    mode = str(mode).lower()
+    if mode not in ("same", "full"):
+        raise ValueError(f"Unsupported mode: {mode} (expected same or full)")
+    fir = StreamingFIR(taps, method=method, compensate_delay=mode == "same")
+    head = fir.process(samples)
+    if mode == "same":
+        return np.concatenate((head, fir.flush()))
+    return np.concatenate((head, fir.process(np.zeros(fir.num_taps - 1))))
+
+
+def process_stages(stages: Sequence, block: np.ndarray) -> np.ndarray:
+    """依次通过一组流式处理级（StreamingFIR / StreamingResampler 等，需提供 process/flush）"""
+    for stage in stages:
+        block = stage.process(block)
+    return block
+
+
+def flush_stages(stages: Sequence) -> np.ndarray:
+    """输入结束：逐级 flush，前级尾部依次经过后级"""
+    carry = as_samples(np.empty(0))
+    for stage in stages:
+        carry = np.concatenate((stage.process(carry), stage.flush()))
+    return carry
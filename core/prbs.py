@@ -0,0 +1,102 @@
+"""标准 PRBS 伪随机比特序列（PRBS7/9/15/23/31，ITU-T O.150 多项式）
+
+与逐位移位的斐波那契 LFSR 输出一致：
+    new = ((state >> (n - 1)) ^ (state >> (m - 1))) & 1; state = ((state << 1) | new) & mask
+即 s[k] = s[k - n] ^ s[k - m]。seed 为输出第一位之前的寄存器状态（默认全 1），
+其第 b 位为 s[-1 - b]。
+
+批量生成：GF(2) 上 (1 + D^m + D^n)^(2^j) = 1 + D^(m*2^j) + D^(n*2^j)，因此
+s[k] = s[k - n*2^j] ^ s[k - m*2^j] 同样成立，一次切片异或即可算出 m*2^j 个新比特；
+j 随已生成长度增大（不超过 MAX_LAG），整段生成只需少量数组运算。
+phase offset 通过伴随矩阵的 GF(2) 幂（平方-乘）直接跳到目标状态。
+"""
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+# 阶数 -> (n, m)：生成多项式 x^n + x^m + 1
+PRBS_POLYNOMIALS: Dict[int, Tuple[int, int]] = {
+    7: (7, 6),
+    9: (9, 5),
+    15: (15, 14),
+    23: (23, 18),
+    31: (31, 28),
+}
+
+# 递推最大滞后（比特），也是块之间保留的历史长度
+MAX_LAG = 1 << 18
+
+
+def check_prbs_order(order) -> int:
+    """校验 PRBS 阶数（接受 15 或 "prbs15" 形式）"""
+    text = str(order).lower()
+    value = int(text[4:]) if text.startswith("prbs") else int(text)
+    if value not in PRBS_POLYNOMIALS:
+        raise ValueError(f"Unsupported PRBS order: {order} (expected {', '.join(map(str, PRBS_POLYNOMIALS))})")
+    return value
+
+
+def prbs_period(order) -> int:
+    return (1 << check_prbs_order(order)) - 1
+
+
+def _gf2_matmul(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    return (a.astype(np.int64) @ b.astype(np.int64) & 1).astype(np.uint8)
+
+
+def _jump_window(window: np.ndarray, m: int, steps: int) -> np.ndarray:
+    """窗口 (s[k-n], ..., s[k-1]) 前进 steps 步"""
+    n = window.size
+    # 伴随矩阵：w'[i] = w[i + 1]，w'[n-1] = w[0] ^ w[n-m]
+    companion = np.zeros((n, n), dtype=np.uint8)
+    companion[np.arange(n - 1), np.arange(1, n)] = 1
+    companion[n - 1, 0] = 1
+    companion[n - 1, n - m] ^= 1
+    result = window[:, None].astype(np.uint8)
+    while steps:
+        if steps & 1:
+            result = _gf2_matmul(companion, result)
+        companion = _gf2_matmul(companion, companion)
+        steps >>= 1
+    return result[:, 0]
+
+
+class PRBSGenerator:
+    """带状态的 PRBS 比特源：next(count) 连续输出，块之间保留递推所需历史"""
+
+    def __init__(self, order=15, seed: Optional[int] = None, offset: int = 0):
+        self.order = check_prbs_order(order)
+        self.n, self.m = PRBS_POLYNOMIALS[self.order]
+        mask = (1 << self.n) - 1
+        self.seed = mask if seed is None else int(seed) & mask
+        if self.seed == 0:
+            raise ValueError("PRBS seed must be non-zero")
+        self.offset = int(offset) % prbs_period(self.order)
+
+        # 窗口按时间顺序：window[i] = s[i - n]
+        window = np.array([(self.seed >> (self.n - 1 - i)) & 1 for i in range(self.n)], dtype=np.uint8)
+        self._history = _jump_window(window, self.m, self.offset) if self.offset else window
+
+    def next(self, count: int) -> np.ndarray:
+        """输出接下来的 count 个比特（uint8 0/1）"""
+        count = max(0, int(count))
+        start = self._history.size
+        buffer = np.empty(start + count, dtype=np.uint8)
+        buffer[:start] = self._history
+        pos = start
+        while pos < buffer.size:
+            lag_n, lag_m = self.n, self.m
+            while 2 * lag_n <= min(pos, MAX_LAG):
+                lag_n, lag_m = 2 * lag_n, 2 * lag_m
+            stop = min(pos + lag_m, buffer.size)
+            np.bitwise_xor(
+                buffer[pos - lag_n : stop - lag_n], buffer[pos - lag_m : stop - lag_m], out=buffer[pos:stop]
+            )
+            pos = stop
+        self._history = buffer[max(0, buffer.size - MAX_LAG) :].copy()
+        return buffer[start:]
+
+
+def prbs_bits(order=15, length: int = 0, seed: Optional[int] = None, offset: int = 0) -> np.ndarray:
+    """PRBS 序列从第 offset 位开始的 length 个比特（uint8 0/1）"""
+    return PRBSGenerator(order, seed, offset).next(length)
@@ -0,0 +1,262 @@
+"""流式有理数重采样（多相 FIR）与 NCO 频移
+
+StreamingResampler 以 up/down 有理比例重采样，可选在滤波前用数控振荡器（NCO）把
+目标信道搬到基带。滤波器历史与 NCO 相位在块之间延续，因此可以直接串在录制回调、
+文件流式读取与格式转换的分块路径上：逐块 process() 后再 flush()，结果与对整段信号
+调用 scipy.signal.resample_poly（同一组抽头）一致。
+
+抽头按 (up, down) 缓存，设计方法与 resample_poly 相同（Kaiser 窗 sinc，半长 10 * max(up, down)）。
+纯抽取（up == 1，宽带采集取窄带信道的常见情形）把多相分量排成矩阵，一次矩阵乘完成，
+只计算保留的输出；纯插值（down == 1，如符号脉冲成形）同样用输入滑窗乘多相矩阵，
+每个输入样本一次得到 up 个输出，不对插入的零做乘法；其他比例使用 scipy.signal.upfirdn。
+"""
+from fractions import Fraction
+from functools import lru_cache
+from typing import Iterable, Iterator, Optional, Tuple
+
+import numpy as np
+import scipy.signal as signal
+
+from .dtypes import as_samples, real_dtype
+
+# from_rates 近似输出/输入采样率比例时允许的最大分母
+MAX_RATIO_DENOMINATOR = 1000
+
+_KAISER_BETA = 5.0
+
+# NCO 相位表长度：每块振荡器 = 块起点相量 x 相位表，避免对每个样本求 exp
+_NCO_TABLE_SIZE = 4096
+
+
+@lru_cache(maxsize=32)
+def resampler_taps(up: int, down: int) -> np.ndarray:
+    """up/down 重采样的低通抽头（已乘以 up 补偿插零损失，只读，按比例缓存）"""
+    up, down = _reduce_ratio(up, down)
+    max_rate = max(up, down)
+    half_len = 10 * max_rate
+    taps = signal.firwin(2 * half_len + 1, 1.0 / max_rate, window=("kaiser", _KAISER_BETA)) * up
+    taps.flags.writeable = False
+    return taps
+
+
+def _reduce_ratio(up: int, down: int) -> Tuple[int, int]:
+    up, down = int(up), int(down)
+    if up <= 0 or down <= 0:
+        raise ValueError(f"up/down must be positive integers, got {up}/{down}")
+    ratio = Fraction(up, down)
+    return ratio.numerator, ratio.denominator
+
+
+def rate_ratio(input_rate: float, output_rate: float, max_denominator: int = MAX_RATIO_DENOMINATOR) -> Tuple[int, int]:
+    """输出/输入采样率的最简有理近似 (up, down)"""
+    if not np.isfinite(input_rate) or not np.isfinite(output_rate) or input_rate <= 0 or output_rate <= 0:
+        raise ValueError(f"invalid sample rates: {input_rate} -> {output_rate}")
+    ratio = Fraction(float(output_rate) / float(input_rate)).limit_denominator(max_denominator)
+    if ratio.numerator == 0:
+        raise ValueError(f"output rate {output_rate} too low for input rate {input_rate}")
+    return ratio.numerator, ratio.denominator
+
+
+class StreamingResampler:
+    """带状态的多相重采样器（可选 NCO 频移）
+
+    shift_hz 为滤波前施加的频移：输出 = 重采样(x * exp(j*2*pi*shift_hz*n/input_rate))，
+    例如要把 +300 kHz 处的信道搬到基带，传 shift_hz=-300e3。
+    """
+
+    def __init__(
+        self,
+        up: int,
+        down: int,
+        input_rate: Optional[float] = None,
+        shift_hz: float = 0.0,
+        taps: Optional[np.ndarray] = None,
+    ):
+        self.up, self.down = _reduce_ratio(up, down)
+        self.input_rate = None if input_rate is None else float(input_rate)
+        self.shift_hz = float(shift_hz or 0.0)
+        if self.shift_hz and not self.input_rate:
+            raise ValueError("input_rate is required for a frequency shift")
+        if self.shift_hz:
+            self._nco_step = 2.0 * np.pi * self.shift_hz / self.input_rate
+            self._nco_table = np.exp(1j * self._nco_step * np.arange(_NCO_TABLE_SIZE))
+
+        self.passthrough = self.up == self.down == 1 and taps is None
+        if not self.passthrough:
+            source = resampler_taps(self.up, self.down) if taps is None else np.asarray(taps, dtype=float)
+            if source.ndim != 1 or source.size == 0:
+                raise ValueError("taps must be a non-empty 1-D array")
+            self.taps = source.astype(real_dtype())
+            # 输出 k 对应插值域位置 k*down + delay，使 y[0] 与 x[0] 对齐（同 resample_poly）
+            self.delay = (self.taps.size - 1) // 2
+            # 缓冲起点 s 需满足 s*up ≡ delay (mod down)，upfirdn 的输出格点才与全局输出对齐
+            self._start_residue = (self.delay * pow(self.up, -1, self.down)) % self.down if self.down > 1 else 0
+            self._polyphase = self._polyphase_matrix() if self.up == 1 and self.down > 1 else None
+            self._interpolator = self._interpolator_matrix() if self.down == 1 and self.up > 1 else None
+        self.reset()
+
+    @classmethod
+    def from_rates(
+        cls,
+        input_rate: float,
+        output_rate: float,
+        shift_hz: float = 0.0,
+        max_denominator: int = MAX_RATIO_DENOMINATOR,
+    ) -> "StreamingResampler":
+        """按输入/输出采样率构造（比例取最简有理近似，实际输出率见 output_rate）"""
+        up, down = rate_ratio(input_rate, output_rate, max_denominator)
+        return cls(up, down, input_rate=input_rate, shift_hz=shift_hz)
+
+    @property
+    def output_rate(self) -> Optional[float]:
+        return None if self.input_rate is None else self.input_rate * self.up / self.down
+
+    def output_length(self, input_length: int) -> int:
+        """输入 input_length 个样本（含 flush）的总输出样本数"""
+        return -(-int(input_length) * self.up // self.down)
+
+    def reset(self) -> None:
+        """清除滤波器历史与 NCO 相位"""
+        self._phase = 0.0
+        self._consumed = 0
+        self._next_out = 0
+        if not self.passthrough:
+            start = self._align_start(self.delay - (self.taps.size - 1))
+            self._buffer = np.zeros(-start, dtype=as_samples(np.empty(0)).dtype)
+            self._buffer_start = start
+
+    def process(self, chunk: np.ndarray) -> np.ndarray:
+        """处理一块样本，返回此时已可确定的输出样本"""
+        block = self._mix(as_samples(np.asarray(chunk).ravel()))
+        self._consumed += block.size
+        if self.passthrough:
+            self._next_out += block.size
+            return block
+        return self._filter(block, None)
+
+    def flush(self) -> np.ndarray:
+        """输入结束：以零补齐滤波器尾部，输出剩余样本（总数为 output_length(已输入样本数)）"""
+        if self.passthrough:
+            return as_samples(np.empty(0))
+        total = self.output_length(self._consumed)
+        # 最后一个输出需要的输入下标为 floor(((total-1)*down + delay) / up)
+        last_needed = ((total - 1) * self.down + self.delay) // self.up if total else -1
+        pad = max(0, last_needed + 1 - (self._buffer_start + self._buffer.size))
+        return self._filter(np.zeros(pad, dtype=self._buffer.dtype), total)
+
+    def process_chunks(self, chunks: Iterable[np.ndarray]) -> Iterator[np.ndarray]:
+        """逐块重采样一个样本块迭代器，结束时自动 flush；跳过空输出"""
+        for chunk in chunks:
+            out = self.process(chunk)
+            if out.size:
+                yield out
+        tail = self.flush()
+        if tail.size:
+            yield tail
+
+    def _mix(self, block: np.ndarray) -> np.ndarray:
+        if not self.shift_hz or block.size == 0:
+            return block
+        size = block.size
+        rows = -(-size // _NCO_TABLE_SIZE)
+        starts = np.exp(1j * (self._phase + self._nco_step * _NCO_TABLE_SIZE * np.arange(rows)))
+        oscillator = np.multiply.outer(starts.astype(block.dtype), self._nco_table.astype(block.dtype))
+        self._phase = float((self._phase + self._nco_step * size) % (2.0 * np.pi))
+        return block * oscillator.ravel()[:size]
+
+    def _polyphase_matrix(self) -> np.ndarray:
+        """抽取用多相矩阵 P[c, l] = taps[(down - 1 - c) + down * l]（复数，供矩阵乘）"""
+        branches = -(-self.taps.size // self.down)
+        padded = np.zeros(branches * self.down, dtype=self.taps.dtype)
+        padded[: self.taps.size] = self.taps
+        matrix = padded.reshape(branches, self.down).T[::-1]
+        return np.ascontiguousarray(matrix).astype(np.result_type(matrix.dtype, np.complex64))
+
+    def _decimate(self, buffer: np.ndarray, first: int, stop: int) -> np.ndarray:
+        """upfirdn(taps, buffer, 1, down)[first:stop]，只计算所需输出
+
+        输入按 down 分行后与多相矩阵相乘得 Z[n, l]（第 l 个分支在第 n 行的部分和），
+        输出 m 为 sum_l Z[m - l, l]。
+        """
+        down = self.down
+        branches = self._polyphase.shape[1]
+        row0 = first - (branches - 1)
+        rows = stop - row0
+        lo = row0 * down - (down - 1)
+        hi = lo + rows * down
+        segment = buffer[max(lo, 0) : min(hi, buffer.size)]
+        if lo < 0 or hi > buffer.size:
+            segment = np.concatenate(
+                (np.zeros(max(0, -lo), buffer.dtype), segment, np.zeros(max(0, hi - buffer.size), buffer.dtype))
+            )
+        partial = segment.reshape(rows, down) @ self._polyphase
+        count = stop - first
+        out = partial[branches - 1 :, 0].copy()
+        for branch in range(1, branches):
+            start = branches - 1 - branch
+            out += partial[start : start + count, branch]
+        return out
+
+    def _interpolator_matrix(self) -> np.ndarray:
+        """插值用多相矩阵 Q[j, p] = taps[(branches - 1 - j) * up + p]（复数，供矩阵乘）"""
+        branches = -(-self.taps.size // self.up)
+        padded = np.zeros(branches * self.up, dtype=self.taps.dtype)
+        padded[: self.taps.size] = self.taps
+        matrix = padded.reshape(branches, self.up)[::-1]
+        return np.ascontiguousarray(matrix).astype(np.result_type(matrix.dtype, np.complex64))
+
+    def _interpolate(self, buffer: np.ndarray, first: int, stop: int) -> np.ndarray:
+        """upfirdn(taps, buffer, up, 1)[first:stop]，只计算所需输出
+
+        第 n 行滑窗为 buffer[n - branches + 1 : n + 1]，与插值矩阵相乘得输出 n*up ... n*up + up - 1。
+        """
+        up = self.up
+        branches = self._interpolator.shape[0]
+        row0 = first // up
+        row1 = -(-stop // up)
+        lo = row0 - (branches - 1)
+        segment = buffer[max(lo, 0) : min(row1, buffer.size)]
+        if lo < 0 or row1 > buffer.size:
+            segment = np.concatenate(
+                (np.zeros(max(0, -lo), buffer.dtype), segment, np.zeros(max(0, row1 - buffer.size), buffer.dtype))
+            )
+        windows = np.lib.stride_tricks.sliding_window_view(segment, branches)
+        out = (windows @ self._interpolator).ravel()
+        return out[first - row0 * up : stop - row0 * up]
+
+    def _align_start(self, position: int) -> int:
+        """不大于 position 且满足对齐条件的缓冲起点"""
+        return position - (position - self._start_residue) % self.down
+
+    def _filter(self, block: np.ndarray, limit: Optional[int]) -> np.ndarray:
+        buffer = np.concatenate((self._buffer, block)) if self._buffer.size else block
+        start = self._buffer_start
+        end = start + buffer.size
+
+        # 可输出到 k_end（不含）：输出 k 需要的最后一个输入 floor((k*down + delay)/up) < end
+        k_end = -((self.delay - end * self.up) // self.down)
+        if limit is not None:
+            k_end = min(k_end, limit)
+        out = as_samples(np.empty(0))
+        if k_end > self._next_out:
+            # 全局输出 k 对应 upfirdn(buffer) 的第 k - offset 个输出
+            offset = (start * self.up - self.delay) // self.down
+            if self._polyphase is not None:
+                out = as_samples(self._decimate(buffer, self._next_out - offset, k_end - offset))
+            elif self._interpolator is not None:
+                out = as_samples(self._interpolate(buffer, self._next_out - offset, k_end - offset))
+            else:
+                filtered = signal.upfirdn(self.taps, buffer, self.up, self.down)
+                out = as_samples(filtered[self._next_out - offset : k_end - offset])
+                if out.size < k_end - self._next_out:
+                    # upfirdn 在最后一个非零贡献处截断；其后的输出只落在插入的零上，补零
+                    out = np.concatenate((out, np.zeros(k_end - self._next_out - out.size, dtype=out.dtype)))
+            self._next_out = k_end
+
+        # 只保留下一个输出所需的历史
+        keep_from = self._align_start((self._next_out * self.down + self.delay - (self.taps.size - 1)) // self.up)
+        # 起点必须留在对齐格点上：所需历史超出缓冲末尾时（抽头短于 down）改为多保留一段
+        keep_from = max(min(keep_from, self._align_start(end)), start)
+        self._buffer = buffer[keep_from - start :].copy()
+        self._buffer_start = keep_from
+        return out
@@ -0,0 +1,183 @@
+"""可合并的流式样本统计
+
+RunningStats 按块累加（录制回调、写入器、分块读取），结束时直接得到平均/峰值功率、
+I/Q 均值与方差、直流偏置以及功率分位数，不必再对整段样本重复计算 np.abs(x)**2。
+两个累加器可以 merge()，用于多线程/多进程分块统计后汇总。
+
+功率分位数使用对数分桶草图：取 float32 功率值的指数位与高 SKETCH_MANTISSA_BITS 位尾数
+作为桶号（每倍频程 2**SKETCH_MANTISSA_BITS 个桶），无需计算对数，合并即桶计数相加；
+相对误差不超过 2**-(SKETCH_MANTISSA_BITS + 1)。
+"""
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+
+from .dtypes import ACCUMULATOR_DTYPE
+
+SKETCH_MANTISSA_BITS = 5
+_SKETCH_SHIFT = 23 - SKETCH_MANTISSA_BITS
+_SKETCH_BUCKETS = 1 << (8 + SKETCH_MANTISSA_BITS)
+
+# as_dict() 输出的分位数（百分比）
+DEFAULT_PERCENTILES = (50, 90, 99)
+
+# 写入文件头的统计字段
+PERSISTED_FIELDS = (
+    "average_power",
+    "peak_power",
+    "i_mean",
+    "q_mean",
+    "i_std",
+    "q_std",
+    "dc_offset",
+    "power_p50",
+    "power_p90",
+    "power_p99",
+)
+
+_STATS_CHUNK = 1 << 20
+
+
+class RunningStats:
+    """逐块累计的样本统计，可与其他实例合并"""
+
+    def __init__(self):
+        self.count = 0
+        self.power_sum = 0.0
+        self.peak_power = float("-inf")
+        self.i_mean = 0.0
+        self.q_mean = 0.0
+        # 与均值的偏差平方和（Chan 并行方差算法）
+        self.i_m2 = 0.0
+        self.q_m2 = 0.0
+        self.sketch = np.zeros(_SKETCH_BUCKETS, dtype=np.int64)
+
+    @classmethod
+    def from_samples(cls, samples: np.ndarray, chunk: int = _STATS_CHUNK) -> "RunningStats":
+        """对整段样本分块统计（限制临时数组大小）"""
+        stats = cls()
+        samples = np.asarray(samples)
+        for start in range(0, samples.size, chunk):
+            stats.update(samples[start : start + chunk])
+        return stats
+
+    @classmethod
+    def from_chunks(cls, chunks: Iterable[np.ndarray]) -> "RunningStats":
+        stats = cls()
+        for block in chunks:
+            stats.update(block)
+        return stats
+
+    def update(self, block: np.ndarray) -> None:
+        """累加一块复数样本"""
+        block = np.asarray(block).ravel()
+        n = block.size
+        if n == 0:
+            return
+
+        # 复数样本的 |x|^2 与 I/Q 一阶/二阶矩；累加在 float32 中以成对求和/BLAS 完成，
+        # 跨块合并使用 float64
+        power = np.abs(block) ** 2
+        if power.dtype != np.float32:
+            power = power.astype(np.float32)
+        self.power_sum += float(np.sum(power, dtype=ACCUMULATOR_DTYPE))
+        self.peak_power = max(self.peak_power, float(np.max(power)))
+        buckets = np.bincount(np.right_shift(power.view(np.uint32), _SKETCH_SHIFT), minlength=_SKETCH_BUCKETS)
+        if buckets.size > _SKETCH_BUCKETS:  # 符号位为 1 的 NaN
+            buckets[_SKETCH_BUCKETS - 1] += buckets[_SKETCH_BUCKETS:].sum()
+        self.sketch += buckets[:_SKETCH_BUCKETS]
+
+        i_mean, i_m2 = _moments(block.real)
+        q_mean, q_m2 = _moments(block.imag)
+        self._combine(n, i_mean, q_mean, i_m2, q_m2)
+
+    def merge(self, other: "RunningStats") -> "RunningStats":
+        """并入另一个累加器的统计，返回 self"""
+        if other.count:
+            self.power_sum += other.power_sum
+            self.peak_power = max(self.peak_power, other.peak_power)
+            self.sketch += other.sketch
+            self._combine(other.count, other.i_mean, other.q_mean, other.i_m2, other.q_m2)
+        return self
+
+    def _combine(self, n: int, i_mean: float, q_mean: float, i_m2: float, q_m2: float) -> None:
+        total = self.count + n
+        di = i_mean - self.i_mean
+        dq = q_mean - self.q_mean
+        self.i_m2 += i_m2 + di * di * self.count * n / total
+        self.q_m2 += q_m2 + dq * dq * self.count * n / total
+        self.i_mean += di * n / total
+        self.q_mean += dq * n / total
+        self.count = total
+
+    @property
+    def average_power(self) -> float:
+        return self.power_sum / self.count if self.count else float("nan")
+
+    @property
+    def i_var(self) -> float:
+        return self.i_m2 / self.count if self.count else float("nan")
+
+    @property
+    def q_var(self) -> float:
+        return self.q_m2 / self.count if self.count else float("nan")
+
+    @property
+    def dc_offset(self) -> float:
+        return float(np.hypot(self.i_mean, self.q_mean)) if self.count else float("nan")
+
+    def power_percentile(self, q: float) -> float:
+        """功率的近似 q 百分位数（0-100），取所在桶的几何中点"""
+        if not self.count:
+            return float("nan")
+        rank = min(self.count - 1, max(0, int(np.ceil(q / 100.0 * self.count)) - 1))
+        bucket = int(np.searchsorted(np.cumsum(self.sketch), rank, side="right"))
+        bounds = (np.array([bucket, bucket + 1], dtype=np.uint32) << _SKETCH_SHIFT).view(np.float32)
+        if bounds[0] == 0:
+            return 0.0
+        return float(min(np.sqrt(bounds[0] * float(bounds[1])), self.peak_power))
+
+    def power_stats(self) -> Dict[str, float]:
+        """平均功率与峰值功率（文件头缓存字段）"""
+        return {
+            "average_power": self.average_power,
+            "peak_power": self.peak_power if self.count else float("nan"),
+        }
+
+    def as_dict(self, percentiles: Iterable[float] = DEFAULT_PERCENTILES) -> Dict[str, float]:
+        """全部统计量（平坦字典，可直接写入 HDF5 属性/JSON）"""
+        result = {
+            "count": self.count,
+            **self.power_stats(),
+            "rms_amplitude": float(np.sqrt(self.average_power)),
+            "peak_amplitude": float(np.sqrt(self.peak_power)) if self.count else float("nan"),
+            "i_mean": self.i_mean if self.count else float("nan"),
+            "q_mean": self.q_mean if self.count else float("nan"),
+            "i_std": float(np.sqrt(self.i_var)),
+            "q_std": float(np.sqrt(self.q_var)),
+            "dc_offset": self.dc_offset,
+        }
+        for q in percentiles:
+            result[f"power_p{q:g}"] = self.power_percentile(q)
+        return result
+
+    def persisted(self) -> Dict[str, float]:
+        """写入文件头的统计子集（见 PERSISTED_FIELDS）"""
+        values = self.as_dict()
+        return {key: values[key] for key in PERSISTED_FIELDS}
+
+
+def _moments(values: np.ndarray):
+    """一块实数数据的均值与偏差平方和"""
+    mean = values.mean(dtype=values.dtype if values.dtype == np.float32 else ACCUMULATOR_DTYPE)
+    deviation = values - mean
+    return float(mean), float(np.dot(deviation, deviation))
+
+
+def merge_stats(parts: Iterable[Optional[RunningStats]]) -> RunningStats:
+    """合并多个累加器（忽略 None）"""
+    total = RunningStats()
+    for part in parts:
+        if part is not None:
+            total.merge(part)
+    return total
@@ -1,9 +1,15 @@
 import numpy as np
 import scipy.signal as signal
-from scipy.fft import fft, fftshift
-from typing import Tuple, Dict, Any
+from scipy.fft import fftshift
+from typing import Tuple, Dict, Any, Optional
 from dataclasses import dataclass
 
+from .dtypes import as_samples, compute_dtype, output_dtype
+from .fft_engine import fft, fft_segments
+from .resampler import StreamingResampler
+from .running_stats import RunningStats
+from .spectral_cache import spectral_params
+
 
 @dataclass
 class ProcessingConfig:
@@ -12,6 +18,18 @@ class ProcessingConfig:
     fft_size: int = 8192
     filter_alpha: float = 0.35
     filter_span: int = 6
+    # Welch 平均功率谱（calculate_psd）参数
+    psd_overlap: float = 0.5  # 相邻分段重叠比例 [0, 1)
+    psd_window: str = "hann"  # scipy.signal.get_window 支持的窗名称
+    psd_average: str = "mean"  # mean / median / max（最大保持）
+    psd_max_segments: int = 256  # 分段数上限，超出时在整段信号上均匀抽取
+    # FFT 线程数；None 使用全局设置（PerformanceConfig.fft_workers）
+    fft_workers: Optional[int] = None
+    # 频谱计算精度：double（float64 输出）或 single（全程 float32/complex64），见 core.dtypes
+    precision: str = "double"
+
+
+PSD_AVERAGES = ("mean", "median", "max")
 
 
 class SignalProcessor:
@@ -20,10 +38,16 @@ class SignalProcessor:
     def __init__(self, config: ProcessingConfig = None):
         self.config = config or ProcessingConfig()
 
+    def spectral_dtypes(self) -> Tuple[np.dtype, np.dtype, np.dtype]:
+        """当前精度下的 (FFT 输入复数类型, 窗类型, 输出实数类型)"""
+        cdtype = compute_dtype(self.config.precision)
+        return cdtype, np.finfo(cdtype).dtype, output_dtype(self.config.precision)
+
     def normalize_signal(
         self, samples: np.ndarray, target_peak: float = 0.7
     ) -> np.ndarray:
         """信号归一化"""
+        samples = as_samples(samples)
         peak_value = np.max(np.abs(samples))
 
         if peak_value > 0:
@@ -41,9 +65,16 @@ class SignalProcessor:
 
         return normalized_signal
 
-    def detect_signal_power(self, samples: np.ndarray) -> Dict[str, float]:
-        """检测信号功率"""
-        if len(samples) == 0:
+    def detect_signal_power(
+        self, samples: np.ndarray, stats: Optional[RunningStats] = None
+    ) -> Dict[str, float]:
+        """检测信号功率
+
+        stats 为录制/写入时已累计的 RunningStats 时直接使用，不再遍历样本。
+        """
+        if stats is None:
+            stats = RunningStats.from_samples(as_samples(samples))
+        if stats.count == 0:
             return {
                 "average_power": 0,
                 "average_power_db": -120,
@@ -53,8 +84,8 @@ class SignalProcessor:
                 "peak_amplitude": 0,
             }
 
-        power = np.mean(np.abs(samples) ** 2)
-        peak_power = np.max(np.abs(samples) ** 2)
+        power = stats.average_power
+        peak_power = stats.peak_power
 
         return {
             "average_power": power,
@@ -75,21 +106,24 @@ class SignalProcessor:
         if fft_size <= 0:
             return np.array([]), np.array([])
 
-        # 应用窗函数
-        window = np.hanning(fft_size)
+        cdtype, wdtype, odtype = self.spectral_dtypes()
+
+        # 应用窗函数（窗、窗能量校正与频率轴来自共享缓存）
+        params = spectral_params(fft_size, "hann", sample_rate, dtype=wdtype)
+        window = params.window
         # window_correction 是窗的二范数均值，用于能量归一化
-        window_correction = np.mean(window**2) if window.size > 0 else 0.0
+        window_correction = params.window_power
         # 保护性地清理输入片段中的 NaN/Inf，避免在后续运算中产生 RuntimeWarning
-        segment = samples[:fft_size]
+        segment = as_samples(samples[:fft_size], dtype=cdtype)
         segment = np.nan_to_num(segment, nan=0.0, posinf=0.0, neginf=0.0)
         windowed_signal = segment * window
 
         # 计算频谱
-        spectrum = fft(windowed_signal)
+        spectrum = fft(windowed_signal, workers=self.config.fft_workers)
         spectrum_shifted = fftshift(spectrum)
 
         # 创建频率轴
-        freq_axis = fftshift(np.fft.fftfreq(fft_size, 1.0 / sample_rate))
+        freq_axis = params.freq_axis
 
         # 计算功率谱
         denominator = sample_rate * fft_size * window_correction
@@ -101,12 +135,118 @@ class SignalProcessor:
             )
 
         # 计算幅度平方并清理 NaN/Inf 值，再进行除法（保证返回实数能量谱）
-        mag2 = np.abs(spectrum_shifted) ** 2
+        mag2 = np.abs(spectrum_shifted).astype(odtype, copy=False) ** 2
         mag2 = np.nan_to_num(mag2, nan=0.0, posinf=0.0, neginf=0.0)
-        power_spectrum = (mag2 / float(denominator)).astype(float)
+        power_spectrum = mag2 / odtype.type(denominator)
 
         return freq_axis, power_spectrum
 
+    def calculate_spectra(
+        self,
+        batch: np.ndarray,
+        sample_rate: float,
+        fft_size: Optional[int] = None,
+        window: str = "hann",
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """批量计算多段频谱（dB）
+
+        batch 为 (N, M) 数组，每行取前 fft_size 个样本加窗（M 不足时补零到 fft_size），
+        一次批量 FFT 得到 (N, fft_size) 的功率谱密度 dB 值，归一化与 calculate_spectrum 相同。
+        fft_size 缺省时取 min(ProcessingConfig.fft_size, M)；调用不会修改 self.config。
+        """
+        cdtype, wdtype, odtype = self.spectral_dtypes()
+        batch = np.atleast_2d(as_samples(batch, dtype=cdtype))
+        if batch.ndim != 2:
+            raise ValueError(f"batch must be a 2-D array (N, M), got shape {batch.shape}")
+        if not np.isfinite(sample_rate) or sample_rate <= 0:
+            raise ValueError(f"Invalid sample rate: {sample_rate}")
+
+        rows, width = batch.shape
+        nfft = int(fft_size) if fft_size else min(self.config.fft_size, width)
+        seg_len = min(nfft, width)
+        if rows == 0 or seg_len <= 0:
+            return np.array([]), np.empty((rows, 0), dtype=odtype)
+
+        params = spectral_params(seg_len, window, dtype=wdtype)
+        freq_axis = spectral_params(nfft, window, sample_rate).freq_axis
+        frames = np.nan_to_num(batch[:, :seg_len], nan=0.0, posinf=0.0, neginf=0.0)
+        spectra = fft_segments(frames, params.window, workers=self.config.fft_workers, shift=True, n=nfft)
+
+        denominator = sample_rate * seg_len * params.window_power
+        if not np.isfinite(denominator) or denominator <= 0:
+            raise ValueError(f"Invalid window: window={window}, fft_size={seg_len}")
+        power = np.abs(spectra).astype(odtype, copy=False) ** 2 / odtype.type(denominator)
+        return freq_axis, 10 * np.log10(np.maximum(power, odtype.type(1e-12)))
+
+    def calculate_psd(
+        self,
+        samples: np.ndarray,
+        sample_rate: float,
+        fft_size: Optional[int] = None,
+        overlap: Optional[float] = None,
+        window: Optional[str] = None,
+        average: Optional[str] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Welch 平均功率谱
+
+        按 fft_size 分段（步进 fft_size * (1 - overlap)），通过跨步视图取帧后一次批量 FFT，
+        再按 average 在分段间求均值、中值或最大保持。参数缺省时取 ProcessingConfig。
+        样本不足一段时退化为单段（与 calculate_spectrum 一致）；返回 fftshift 后的频率轴与 PSD。
+        """
+        cfg = self.config
+        overlap = cfg.psd_overlap if overlap is None else float(overlap)
+        window = window or cfg.psd_window
+        average = (average or cfg.psd_average).lower()
+        if not 0.0 <= overlap < 1.0:
+            raise ValueError(f"overlap must be in [0, 1), got {overlap}")
+        if average not in PSD_AVERAGES:
+            raise ValueError(f"Unsupported PSD average: {average} (expected {', '.join(PSD_AVERAGES)})")
+        if not np.isfinite(sample_rate) or sample_rate <= 0:
+            raise ValueError(f"Invalid sample rate: {sample_rate}")
+
+        cdtype, wdtype, odtype = self.spectral_dtypes()
+        samples = as_samples(samples, dtype=cdtype)
+        nperseg = min(int(fft_size or cfg.fft_size), len(samples))
+        if nperseg <= 0:
+            return np.array([]), np.array([])
+
+        # 分段起点；超过上限时在整段信号上均匀抽取，保证覆盖完整录音
+        step = max(1, int(nperseg * (1.0 - overlap)))
+        starts = np.arange(0, len(samples) - nperseg + 1, step)
+        max_segments = int(cfg.psd_max_segments or 0)
+        if max_segments > 0 and len(starts) > max_segments:
+            starts = starts[np.linspace(0, len(starts) - 1, max_segments).round().astype(int)]
+
+        params = spectral_params(nperseg, window, sample_rate, symmetric=False, dtype=wdtype)
+        win = params.window
+        frames = np.lib.stride_tricks.sliding_window_view(samples, nperseg)[starts] * win
+        frames = np.nan_to_num(frames, nan=0.0, posinf=0.0, neginf=0.0)
+
+        # 一次批量 FFT，各分段在 FFT 线程间并行
+        mag2 = np.abs(fft_segments(frames, workers=self.config.fft_workers)) ** 2
+        if average == "mean":
+            power = np.mean(mag2, axis=0, dtype=odtype)
+        elif average == "median":
+            # 周期图服从指数分布，中值相对均值有偏，按分段数校正（同 scipy.signal.welch）
+            power = np.median(mag2, axis=0).astype(odtype) / odtype.type(_median_bias(len(starts)))
+        else:
+            power = np.max(mag2, axis=0).astype(odtype)
+
+        # 与 calculate_spectrum 相同的密度归一化：fs * sum(w^2)
+        denominator = sample_rate * nperseg * params.window_power
+        if not np.isfinite(denominator) or denominator <= 0:
+            raise ValueError(f"Invalid window: window={window}, fft_size={nperseg}")
+
+        power_spectrum = np.nan_to_num(fftshift(power) / odtype.type(denominator), nan=0.0, posinf=0.0, neginf=0.0)
+        return params.freq_axis, power_spectrum
+
+    def resample(
+        self, samples: np.ndarray, input_rate: float, output_rate: float, shift_hz: float = 0.0
+    ) -> np.ndarray:
+        """整段重采样（可选频移）；分块处理请直接使用 core.resampler.StreamingResampler"""
+        resampler = StreamingResampler.from_rates(input_rate, output_rate, shift_hz=shift_hz)
+        return np.concatenate((resampler.process(samples), resampler.flush()))
+
     def estimate_bandwidth(
         self, power_spectrum_db: np.ndarray, freq_axis: np.ndarray
     ) -> float:
@@ -159,3 +299,9 @@ class SignalProcessor:
         closest = min(candidates, key=lambda x: abs(x - 2e6))  # 默认2MHz
 
         return closest
+
+
+def _median_bias(n: int) -> float:
+    """n 个指数分布样本中值相对均值的偏差（与 scipy.signal.welch 的校正一致）"""
+    ii_2 = 2 * np.arange(1.0, (n - 1) // 2 + 1)
+    return 1 + np.sum(1.0 / (ii_2 + 1) - 1.0 / ii_2)
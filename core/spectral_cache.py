@@ -0,0 +1,152 @@
+"""窗函数与 FFT 频率轴缓存
+
+频谱计算（SignalProcessor、流式可视化、PNG 绘图）在每帧都会用到相同长度的窗函数、
+窗能量校正系数与 fftshift 后的频率轴。这里按 (n, 窗类型, sample_rate) 缓存这些只读数组，
+LRU 淘汰，命中/未命中计数可通过 cache_info() 查看。
+"""
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Hashable, Optional
+
+import numpy as np
+import scipy.signal as signal
+from scipy.fft import fftfreq, fftshift
+
+from .dtypes import ACCUMULATOR_DTYPE, real_dtype
+
+DEFAULT_CACHE_SIZE = 64
+
+# 配置中的窗名称 -> scipy.signal.get_window 名称
+_WINDOW_ALIASES = {
+    "hanning": "hann",
+    "rectangular": "boxcar",
+    "rect": "boxcar",
+    "none": "boxcar",
+}
+
+
+@dataclass(frozen=True)
+class SpectralParams:
+    """一组 FFT 参数对应的只读数组"""
+
+    window: np.ndarray  # 与样本同精度的实数窗
+    window_power: float  # mean(w^2)，功率谱密度归一化用
+    freq_axis: Optional[np.ndarray]  # fftshift 后的频率轴 (Hz)；sample_rate 为 None 时为 None
+
+
+class _LRUCache:
+    """线程安全的 LRU 字典，记录命中/未命中次数"""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = max(1, int(maxsize))
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, SpectralParams]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[SpectralParams]:
+        with self._lock:
+            value = self._data.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: SpectralParams) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def resize(self, maxsize: int) -> None:
+        with self._lock:
+            self.maxsize = max(1, int(maxsize))
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._data), "maxsize": self.maxsize}
+
+
+_cache = _LRUCache(DEFAULT_CACHE_SIZE)
+
+
+def normalize_window_name(window) -> Hashable:
+    """统一窗名称（支持 FFTWindow 枚举、字符串或 scipy 的 (名称, 参数) 元组）"""
+    if window is None:
+        return "hann"
+    if isinstance(window, tuple):
+        return window
+    key = str(getattr(window, "value", window)).lower()
+    return _WINDOW_ALIASES.get(key, key)
+
+
+def spectral_params(
+    n: int,
+    window="hann",
+    sample_rate: Optional[float] = None,
+    symmetric: bool = True,
+    dtype=None,
+) -> SpectralParams:
+    """返回 n 点窗函数、窗能量系数与频率轴（缓存，数组只读）
+
+    symmetric=True 与 np.hanning/np.hamming/np.blackman 一致（单帧频谱）；
+    symmetric=False 为 scipy.signal.welch 使用的周期窗。
+    dtype 为窗的实数类型，缺省与样本策略同精度。
+    """
+    n = int(n)
+    if n <= 0:
+        raise ValueError(f"n must be positive, got {n}")
+    name = normalize_window_name(window)
+    rate = None if sample_rate is None else float(sample_rate)
+    win_dtype = real_dtype() if dtype is None else np.dtype(dtype)
+    key = (n, name, rate, bool(symmetric), win_dtype.str)
+
+    params = _cache.get(key)
+    if params is not None:
+        return params
+
+    win = signal.get_window(name, n, fftbins=not symmetric).astype(win_dtype)
+    win.flags.writeable = False
+    axis = None
+    if rate is not None:
+        axis = fftshift(fftfreq(n, 1.0 / rate))
+        axis.flags.writeable = False
+    params = SpectralParams(
+        window=win,
+        window_power=float(np.mean(win.astype(ACCUMULATOR_DTYPE) ** 2)),
+        freq_axis=axis,
+    )
+    _cache.put(key, params)
+    return params
+
+
+def get_window(n: int, window="hann", symmetric: bool = True, dtype=None) -> np.ndarray:
+    """缓存的只读窗函数"""
+    return spectral_params(n, window, None, symmetric, dtype).window
+
+
+def cache_info() -> Dict[str, int]:
+    """命中/未命中次数与当前条目数"""
+    return _cache.info()
+
+
+def clear_cache() -> None:
+    """清空缓存并重置计数"""
+    _cache.clear()
+
+
+def set_cache_size(maxsize: int) -> None:
+    """调整 LRU 容量"""
+    _cache.resize(maxsize)
@@ -3,6 +3,7 @@ import scipy.signal as signal
 from scipy.fft import fft, fftshift
 import matplotlib.pyplot as plt
 from typing import Dict, Tuple, Optional, Callable
+from core.running_stats import RunningStats
 from core.signal_processor import SignalProcessor
 from utils.visualizer import SignalVisualizer
 import threading
@@ -21,12 +22,14 @@ class SignalAnalyzer:
         sample_rate: float,
         progress_callback: Optional[Callable[[int, Optional[str]], None]] = None,
         cancel_event: Optional["threading.Event"] = None,
+        stats: Optional[RunningStats] = None,
     ) -> Dict:
         """综合分析
 
         Supports cooperative cancellation and progress reporting via:
         - progress_callback(percent:int, message:str)
         - cancel_event: threading.Event (if set(), function should abort)
+        - stats: 已累计的 RunningStats（如录制时逐块统计）；缺省时遍历一次样本计算
         """
         results: Dict = {}
 
@@ -46,7 +49,9 @@ class SignalAnalyzer:
             except Exception:
                 pass
         _check_cancel()
-        results["time_domain"] = self._time_domain_analysis(samples)
+        if stats is None:
+            stats = RunningStats.from_samples(samples)
+        results["time_domain"] = self._time_domain_analysis(samples, stats)
 
         # 2) 频域分析
         if progress_callback:
@@ -82,7 +87,7 @@ class SignalAnalyzer:
             except Exception:
                 pass
         _check_cancel()
-        results["quality"] = self._quality_assessment(samples)
+        results["quality"] = self._quality_assessment(samples, stats)
 
         if progress_callback:
             try:
@@ -92,28 +97,26 @@ class SignalAnalyzer:
 
         return results
 
-    def _time_domain_analysis(self, samples: np.ndarray) -> Dict:
+    def _time_domain_analysis(self, samples: np.ndarray, stats: Optional[RunningStats] = None) -> Dict:
         """时域分析"""
-        magnitude = np.abs(samples)
-        i_data = np.real(samples)
-        q_data = np.imag(samples)
+        values = (stats or RunningStats.from_samples(samples)).as_dict()
 
         return {
-            "average_power": np.mean(magnitude**2),
-            "peak_power": np.max(magnitude**2),
-            "rms_amplitude": np.sqrt(np.mean(magnitude**2)),
-            "peak_amplitude": np.max(magnitude),
-            "i_std": np.std(i_data),
-            "q_std": np.std(q_data),
-            "iq_imbalance": np.std(i_data) - np.std(q_data),
-            "dc_offset": np.abs(np.mean(samples)),
+            "average_power": values["average_power"],
+            "peak_power": values["peak_power"],
+            "rms_amplitude": values["rms_amplitude"],
+            "peak_amplitude": values["peak_amplitude"],
+            "i_std": values["i_std"],
+            "q_std": values["q_std"],
+            "iq_imbalance": values["i_std"] - values["q_std"],
+            "dc_offset": values["dc_offset"],
         }
 
     def _frequency_domain_analysis(
         self, samples: np.ndarray, sample_rate: float
     ) -> Dict:
-        """频域分析"""
-        freq_axis, power_spectrum = self.processor.calculate_spectrum(
+        """频域分析（Welch 平均功率谱，覆盖整段信号）"""
+        freq_axis, power_spectrum = self.processor.calculate_psd(
             samples, sample_rate
         )
         power_spectrum_db = 10 * np.log10(power_spectrum + 1e-12)
@@ -171,13 +174,15 @@ class SignalAnalyzer:
         else:
             return "Unknown"
 
-    def _quality_assessment(self, samples: np.ndarray) -> Dict:
+    def _quality_assessment(self, samples: np.ndarray, stats: Optional[RunningStats] = None) -> Dict:
         """质量评估"""
-        power_stats = self.processor.detect_signal_power(samples)
+        stats = stats or RunningStats.from_samples(samples)
+        power_stats = self.processor.detect_signal_power(samples, stats=stats)
+        # 复数样本标准差 = sqrt(var(I) + var(Q))
+        std = np.sqrt(stats.i_var + stats.q_var)
 
         return {
-            "dynamic_range": 20
-            * np.log10(np.max(np.abs(samples)) / (np.std(samples) + 1e-12)),
-            "dc_offset": np.abs(np.mean(samples)),
+            "dynamic_range": 20 * np.log10(np.sqrt(stats.peak_power) / (std + 1e-12)),
+            "dc_offset": stats.dc_offset,
             "power_stats": power_stats,
         }
@@ -1,25 +1,71 @@
+import logging
+import multiprocessing
+import os
+import time
+import wave
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import numpy as np
-import scipy.io.wavfile as wavfile
 from pathlib import Path
-from typing import Dict, List, Tuple
-from core.file_manager import FileManager
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from dataclasses import replace
+from core.dtypes import get_sample_dtype
+from core.file_manager import (
+    DEFAULT_CHUNK_SAMPLES,
+    SC16_DEFAULT_SCALE,
+    FileManager,
+    sc16_scale_for,
+)
+from core.running_stats import RunningStats
 from datetime import datetime
-import json
+
+logger = logging.getLogger(__name__)
+
+# 输出格式 -> 输出文件扩展名
+OUTPUT_SUFFIXES = {
+    "h5": ".h5",
+    "sc16": ".sc16",
+    "sigmf": ".sigmf-data",
+    "wav": ".wav",
+    "csv": ".csv",
+    "npy": ".npy",
+}
+
+# CSV 列选择 -> (表头, 单行格式)
+CSV_COLUMNS = {
+    "iq": ("Sample_Index,I_Component,Q_Component", "%d,%.6f,%.6f\n"),
+    "all": (
+        "Sample_Index,I_Component,Q_Component,Magnitude,Phase",
+        "%d,%.6f,%.6f,%.6f,%.6f\n",
+    ),
+}
+# CSV 每次格式化的行数
+CSV_FORMAT_ROWS = 8192
 
 
 class FormatConverter:
     """格式转换器"""
 
-    def __init__(self, file_manager: FileManager):
+    def __init__(self, file_manager: FileManager, chunk_samples: int = DEFAULT_CHUNK_SAMPLES):
         self.files = file_manager
+        # 流式转换每块样本数（complex64 下 8 MB）
+        self.chunk_samples = chunk_samples
+        # CSV 导出选项：列选择（"iq" / "all"）与抽取因子
+        self.csv_columns = "all"
+        self.csv_decimation = 1
+        # 可选的流式重采样（输出采样率，None 为保持原采样率）与 NCO 频移 (Hz)
+        self.output_rate: Optional[float] = None
+        self.frequency_shift = 0.0
 
     def convert_format(
         self, input_file: str, output_format: str, output_file: str = None
     ) -> bool:
-        """转换格式"""
-        # 加载输入文件
-        samples, metadata = self.files.load_signal(input_file)
-        if samples is None:
+        """转换格式
+
+        输入按块读取、输出按块写入，内存占用只与 chunk_samples 有关。
+        """
+        # 只读取文件头；样本在各格式写入时按块迭代
+        metadata = self.files.load_metadata(input_file)
+        if metadata is None:
             return False
 
         input_path = Path(input_file)
@@ -30,14 +76,20 @@ class FormatConverter:
             output_file = f"{base_name}.{output_format}"
 
         try:
+            if self._resampling:
+                metadata = self.files.resampled_metadata(metadata, self._resampler(input_file))
             if output_format.lower() == "h5":
-                return self._convert_to_hdf5(samples, metadata, output_file)
+                return self._convert_to_hdf5(input_file, metadata, output_file)
+            elif output_format.lower() == "sc16":
+                return self._convert_to_sc16(input_file, metadata, output_file)
+            elif output_format.lower() == "sigmf":
+                return self._convert_to_sigmf(input_file, metadata, output_file)
             elif output_format.lower() == "wav":
-                return self._convert_to_wav(samples, metadata, output_file)
+                return self._convert_to_wav(input_file, metadata, output_file)
             elif output_format.lower() == "csv":
-                return self._convert_to_csv(samples, metadata, output_file)
+                return self._convert_to_csv(input_file, metadata, output_file)
             elif output_format.lower() == "npy":
-                return self._convert_to_npy(samples, metadata, output_file)
+                return self._convert_to_npy(input_file, metadata, output_file)
             else:
                 print(f"Unsupported output format: {output_format}")
                 return False
@@ -46,86 +98,260 @@ class FormatConverter:
             print(f"Format conversion failed: {e}")
             return False
 
-    def _convert_to_hdf5(self, samples: np.ndarray, metadata, output_file: str) -> bool:
+    @property
+    def _resampling(self) -> bool:
+        return bool(self.output_rate) or bool(self.frequency_shift)
+
+    def _resampler(self, input_file: str):
+        return self.files.resampler_for(input_file, self.output_rate, self.frequency_shift)
+
+    def _iter_samples(self, input_file: str) -> Iterator[np.ndarray]:
+        if self._resampling:
+            return self.files.iter_resampled(
+                input_file, self.output_rate, self.frequency_shift, self.chunk_samples
+            )
+        return self.files.iter_chunks(input_file, self.chunk_samples)
+
+    def _sample_count(self, input_file: str) -> int:
+        """输出样本数（重采样时按比例换算）"""
+        total = self.files.get_sample_count(input_file)
+        return self._resampler(input_file).output_length(total) if self._resampling else total
+
+    def _stream_to_writer(self, input_file: str, metadata, output_file: str) -> bool:
+        """通过 FileManager 增量写入器转换（HDF5 / sc16 / SigMF）"""
+        scale = SC16_DEFAULT_SCALE
+        if self.files.resolve_sample_format(Path(output_file)) == "sc16":
+            scale = self._sc16_scale(input_file, metadata)
+
+        writer = self.files.open_writer(output_file, metadata, scale=scale)
+        try:
+            for block in self._iter_samples(input_file):
+                writer.append(block)
+        except Exception:
+            writer.abort()
+            raise
+        return writer.close()
+
+    def _sc16_scale(self, input_file: str, metadata) -> float:
+        """sc16 输出的缩放系数：优先使用文件头缓存的峰值功率，否则先扫描一遍峰值"""
+        peak_power = metadata.additional_metadata.get("peak_power")
+        if peak_power is not None and np.isfinite(peak_power):
+            # |I|、|Q| 不超过 |x| = sqrt(peak_power)
+            return max(float(np.sqrt(peak_power)), 1.0) / 32767
+        scale = SC16_DEFAULT_SCALE
+        for block in self._iter_samples(input_file):
+            scale = max(scale, sc16_scale_for(block))
+        return scale
+
+    def convert_batch(
+        self,
+        inputs: Iterable[str],
+        output_format: str,
+        workers: Optional[int] = None,
+        output_dir: Optional[str] = None,
+        overwrite: bool = False,
+        progress_callback: Optional[Callable[[int, int, Dict], None]] = None,
+    ) -> Dict:
+        """批量转换格式，使用进程池并行处理
+
+        workers 默认取 PerformanceConfig.max_workers；输出默认与输入同目录。
+        输出文件已存在、非空且不早于输入文件时视为最新并跳过（overwrite=True 时强制转换）；
+        启用重采样 / 频移时总是重新转换，因为已有输出可能是以不同设置生成的。
+        progress_callback(done, total, result) 在每个文件完成后于调用进程中回调。
+        """
+        output_format = output_format.lower()
+        if output_format not in OUTPUT_SUFFIXES:
+            raise ValueError(f"Unsupported output format: {output_format}")
+
+        if workers is None:
+            from utils.config_manager import get_config_manager
+
+            workers = get_config_manager().performance.max_workers
+        workers = max(1, int(workers))
+
+        jobs = []
+        results: List[Dict] = []
+        for input_file in inputs:
+            output_file = self._batch_output_path(Path(input_file), output_format, output_dir)
+            if not overwrite and not self._resampling and self._is_up_to_date(Path(input_file), output_file):
+                results.append(
+                    {"input": str(input_file), "output": str(output_file), "status": "skipped", "error": None}
+                )
+            else:
+                jobs.append((str(input_file), output_format, str(output_file)))
+
+        total = len(results) + len(jobs)
+        done = 0
+        for result in results:
+            done += 1
+            if progress_callback:
+                progress_callback(done, total, result)
+
+        settings = {
+            "base_dir": str(self.files.base_dir),
+            "storage_profile": self.files.storage_profile,
+            "sample_format": self.files.sample_format,
+            "csv_columns": self.csv_columns,
+            "csv_decimation": self.csv_decimation,
+            "output_rate": self.output_rate,
+            "frequency_shift": self.frequency_shift,
+        }
+
+        def finish(result: Dict) -> None:
+            nonlocal done
+            done += 1
+            results.append(result)
+            if result["status"] == "failed":
+                logger.warning("Conversion failed for %s: %s", result["input"], result["error"])
+            if progress_callback:
+                progress_callback(done, total, result)
+
+        if workers == 1 or len(jobs) <= 1:
+            for job in jobs:
+                finish(_convert_job(job, settings))
+        elif jobs:
+            # spawn：调用方（如 Web 服务）通常是多线程进程，fork 不安全
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=min(workers, len(jobs)), mp_context=context) as pool:
+                futures = {pool.submit(_convert_job, job, settings): job for job in jobs}
+                for future in as_completed(futures):
+                    input_file, _, output_file = futures[future]
+                    try:
+                        result = future.result()
+                    except Exception as e:  # 子进程崩溃等
+                        result = {"input": input_file, "output": output_file, "status": "failed", "error": str(e)}
+                    finish(result)
+
+        summary = {"total": total, "converted": 0, "skipped": 0, "failed": 0, "results": results}
+        for result in results:
+            summary[result["status"]] += 1
+        return summary
+
+    @staticmethod
+    def _batch_output_path(input_path: Path, output_format: str, output_dir: Optional[str]) -> Path:
+        directory = Path(output_dir) if output_dir else input_path.parent
+        name = input_path.name
+        if input_path.suffix:
+            name = name[: -len(input_path.suffix)]
+        return directory / f"{name}{OUTPUT_SUFFIXES[output_format]}"
+
+    @staticmethod
+    def _is_up_to_date(input_path: Path, output_path: Path) -> bool:
+        try:
+            source = input_path.stat()
+            target = output_path.stat()
+        except OSError:
+            return False
+        return target.st_size > 0 and target.st_mtime_ns >= source.st_mtime_ns
+
+    def _convert_to_hdf5(self, input_file: str, metadata, output_file: str) -> bool:
         """转换为HDF5格式"""
-        return self.files.save_signal(samples, metadata, output_file)
+        return self._stream_to_writer(input_file, metadata, output_file)
+
+    def _convert_to_sc16(self, input_file: str, metadata, output_file: str) -> bool:
+        """转换为 sc16 格式（交织 int16 + .txt 旁路，scale 按峰值选取）"""
+        return self._stream_to_writer(input_file, metadata, output_file)
 
-    def _convert_to_wav(self, samples: np.ndarray, metadata, output_file: str) -> bool:
-        """转换为WAV格式"""
+    def _convert_to_sigmf(self, input_file: str, metadata, output_file: str) -> bool:
+        """转换为 SigMF 录音（.sigmf-data + .sigmf-meta，cf32_le）"""
+        output_path = Path(output_file)
+        if output_path.suffix.lower() not in (".sigmf-data", ".sigmf-meta"):
+            output_path = output_path.with_suffix(".sigmf-data")
+        return self._stream_to_writer(input_file, metadata, str(output_path))
+
+    def _convert_to_wav(self, input_file: str, metadata, output_file: str) -> bool:
+        """转换为WAV格式（第一遍求实部峰值用于归一化，第二遍按块写入 16-bit PCM）"""
         try:
             # 使用实部作为音频数据
-            audio_data = np.real(samples)
+            max_audio = 0.0
+            for block in self._iter_samples(input_file):
+                if block.size:
+                    max_audio = max(max_audio, float(np.max(np.abs(block.real))))
 
             # 归一化音频数据
-            max_audio = np.max(np.abs(audio_data))
-            if max_audio > 0:
-                audio_data = audio_data / max_audio
-
-            audio_int16 = (audio_data * 32767).astype(np.int16)
-            wavfile.write(output_file, int(metadata.sample_rate), audio_int16)
+            gain = np.float32(32767 / max_audio if max_audio > 0 else 32767)
+            frames = 0
+            with wave.open(str(output_file), "wb") as wav_file:
+                wav_file.setnchannels(1)
+                wav_file.setsampwidth(2)
+                wav_file.setframerate(int(metadata.sample_rate))
+                for block in self._iter_samples(input_file):
+                    audio_int16 = (block.real * gain).astype("<i2")
+                    wav_file.writeframes(audio_int16.tobytes())
+                    frames += audio_int16.size
 
             print(f"Converted to WAV file: {output_file}")
-            print(f"Duration: {len(audio_data)/metadata.sample_rate:.2f} seconds")
+            print(f"Duration: {frames/metadata.sample_rate:.2f} seconds")
             return True
         except Exception as e:
             print(f"WAV conversion failed: {e}")
             return False
 
-    def _convert_to_csv(self, samples: np.ndarray, metadata, output_file: str) -> bool:
-        """转换为CSV格式"""
+    def _convert_to_csv(self, input_file: str, metadata, output_file: str) -> bool:
+        """转换为CSV格式（全长导出，按块向量化格式化）
+
+        csv_columns: "iq" 仅输出 I/Q，"all" 额外输出幅度/相位；
+        csv_decimation: 每 N 个样本取 1 个，Sample_Index 保持原始样本序号。
+        """
         try:
-            max_samples = min(10000, len(samples))  # 限制CSV文件大小
-            export_samples = samples[:max_samples]
+            columns = self.csv_columns.lower()
+            if columns not in CSV_COLUMNS:
+                raise ValueError(f"Unsupported CSV columns: {self.csv_columns}")
+            decimation = int(self.csv_decimation)
+            if decimation < 1:
+                raise ValueError(f"CSV decimation must be >= 1: {self.csv_decimation}")
 
-            with open(output_file, "w") as f:
-                f.write("Sample_Index,I_Component,Q_Component,Magnitude,Phase\n")
-                for i, sample in enumerate(export_samples):
-                    f.write(
-                        f"{i},{np.real(sample):.6f},{np.imag(sample):.6f},{np.abs(sample):.6f},{np.angle(sample):.6f}\n"
-                    )
+            header, row_format = CSV_COLUMNS[columns]
+            rows = 0
+            position = 0
+            with open(output_file, "w", newline="") as f:
+                f.write(header + "\n")
+                for block in self._iter_samples(input_file):
+                    # 抽取相位对齐到全局样本序号，不受块边界影响
+                    first = (-position) % decimation
+                    picked = block[first::decimation]
+                    index = np.arange(position + first, position + block.size, decimation, dtype=np.float64)
+                    position += block.size
+                    for start in range(0, picked.size, CSV_FORMAT_ROWS):
+                        part = picked[start : start + CSV_FORMAT_ROWS]
+                        table = [index[start : start + part.size], part.real, part.imag]
+                        if columns == "all":
+                            table += [np.abs(part), np.angle(part)]
+                        # 一次 % 运算格式化整块，避免逐行 Python 调用
+                        values = np.column_stack(table).ravel().tolist()
+                        f.write((row_format * part.size) % tuple(values))
+                        rows += part.size
 
-            print(f"Converted to CSV file (first {max_samples} samples): {output_file}")
+            print(f"Converted to CSV file ({rows} rows, decimation={decimation}): {output_file}")
             return True
         except Exception as e:
             print(f"CSV conversion failed: {e}")
             return False
 
-    def _convert_to_npy(self, samples: np.ndarray, metadata, output_file: str) -> bool:
-        """转换为NumPy格式"""
+    def _convert_to_npy(self, input_file: str, metadata, output_file: str) -> bool:
+        """转换为NumPy格式（open_memmap 预分配输出，按块写入）"""
         try:
-            np.save(output_file, samples)
+            total = self._sample_count(input_file)
+            dtype = get_sample_dtype()
+            output = np.lib.format.open_memmap(output_file, mode="w+", dtype=dtype, shape=(total,))
+            stats = RunningStats()
+            position = 0
+            for block in self._iter_samples(input_file):
+                output[position : position + block.size] = block
+                stats.update(block)
+                position += block.size
+            output.flush()
+            del output
 
-            # 保存元数据
+            # 保存元数据（与 FileManager 保存 .npy 时的旁路相同，含缓存统计）
             meta_file = Path(output_file).with_suffix(".json")
-            # coerce numpy scalar types to native Python types so json.dump won't fail
-            def _to_py(v):
-                try:
-                    # numpy scalar and other single-value wrappers
-                    if hasattr(v, "item"):
-                        return v.item()
-                except Exception:
-                    pass
-                # fallback for basic types
-                if isinstance(v, (np.integer,)):
-                    return int(v)
-                if isinstance(v, (np.floating,)):
-                    return float(v)
-                return v
-
-            meta_data = {
-                "sample_rate": _to_py(metadata.sample_rate),
-                "center_freq": _to_py(metadata.center_freq),
-                "timestamp": _to_py(metadata.timestamp),
-                "duration": _to_py(metadata.duration),
-                "samples_count": _to_py(metadata.samples_count),
-                "signal_type": _to_py(metadata.signal_type),
-                "rf_channel": _to_py(metadata.rf_channel),
-                "gain": _to_py(metadata.gain),
-                "conversion_time": datetime.now().isoformat(),
-            }
-
-            with open(meta_file, "w") as f:
-                json.dump(meta_data, f, indent=2)
+            extra = dict(metadata.additional_metadata)
+            extra["conversion_time"] = datetime.now().isoformat()
+            sidecar_meta = replace(metadata, samples_count=int(total), additional_metadata=extra)
+            sidecar_stats = stats.persisted() if total else {}
+            sidecar_stats["sample_dtype"] = dtype.name
+            if not self.files._write_numpy_metadata(sidecar_meta, meta_file, sidecar_stats):
+                return False
 
             print(f"Converted to NumPy .npy format: {output_file}")
             print(f"Metadata saved to: {meta_file}")
@@ -133,3 +359,29 @@ class FormatConverter:
         except Exception as e:
             print(f"NumPy conversion failed: {e}")
             return False
+
+
+def _convert_job(job: Tuple[str, str, str], settings: Dict) -> Dict:
+    """进程池任务：在子进程中转换单个文件"""
+    input_file, output_format, output_file = job
+    started = time.time()
+    result = {"input": input_file, "output": output_file, "status": "failed", "error": None}
+    try:
+        files = FileManager()
+        files.base_dir = Path(settings["base_dir"])
+        files.storage_profile = settings["storage_profile"]
+        files.sample_format = settings["sample_format"]
+        os.makedirs(Path(output_file).parent, exist_ok=True)
+        converter = FormatConverter(files)
+        converter.csv_columns = settings.get("csv_columns", converter.csv_columns)
+        converter.csv_decimation = settings.get("csv_decimation", converter.csv_decimation)
+        converter.output_rate = settings.get("output_rate")
+        converter.frequency_shift = settings.get("frequency_shift") or 0.0
+        if converter.convert_format(input_file, output_format, output_file):
+            result["status"] = "converted"
+        else:
+            result["error"] = "conversion failed"
+    except Exception as e:
+        result["error"] = str(e)
+    result["elapsed"] = time.time() - started
+    return result
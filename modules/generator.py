@@ -1,10 +1,16 @@
 import math
 import numpy as np
-import scipy.signal as signal
-from typing import Dict, Optional
+from typing import Callable, Dict, Iterator, Optional
+from core.dtypes import get_sample_dtype
+from core.modulation import bits_per_symbol, check_modulation, constellation, map_bits
+from core.prbs import PRBSGenerator, prbs_bits
+from core.resampler import StreamingResampler
 from core.signal_processor import SignalProcessor
 from utils.filters import FilterDesigner
 
+# iter_modulated 每块的符号数
+DEFAULT_CHUNK_SYMBOLS = 65536
+
 
 class SignalGenerator:
     """信号生成器"""
@@ -15,13 +21,102 @@ class SignalGenerator:
 
     def generate_qpsk(self, params: Dict) -> np.ndarray:
         """生成QPSK信号"""
+        return self.generate_modulated(params, "qpsk")
+
+    def generate_bpsk(self, params: Dict) -> np.ndarray:
+        """生成BPSK信号"""
+        return self.generate_modulated(params, "bpsk")
+
+    def generate_8psk(self, params: Dict) -> np.ndarray:
+        """生成8PSK信号"""
+        return self.generate_modulated(params, "8psk")
+
+    def generate_16qam(self, params: Dict) -> np.ndarray:
+        """生成16QAM信号"""
+        return self.generate_modulated(params, "16qam")
+
+    def generate_64qam(self, params: Dict) -> np.ndarray:
+        """生成64QAM信号"""
+        return self.generate_modulated(params, "64qam")
+
+    def generate_modulated(self, params: Dict, modulation: Optional[str] = None) -> np.ndarray:
+        """生成指定调制的成形信号（modulation 缺省取 params["modulation"]，再缺省为 QPSK）"""
+        plan = self._waveform_plan(params, modulation)
+
+        # 生成比特（随机或 PRBS）
+        bits = self._bit_source(params)(plan["num_symbols"] * bits_per_symbol(plan["modulation"]))
+
+        # 符号映射（查表）
+        symbols = map_bits(bits, plan["modulation"], plan["mapping"])
+
+        # 脉冲成形
+        shaped_signal = self._pulse_shape(symbols, plan["sps"], plan["alpha"], plan["span"])
+
+        # 信号归一化
+        normalized_signal = self.processor.normalize_signal(shaped_signal)
+
+        target_samples = plan["target_samples"]
+        if target_samples is not None and len(normalized_signal) > target_samples:
+            normalized_signal = normalized_signal[:target_samples]
+        elif target_samples is not None and len(normalized_signal) < target_samples:
+            pad_width = target_samples - len(normalized_signal)
+            normalized_signal = np.pad(normalized_signal, (0, pad_width), mode="constant")
+
+        sample_rate = plan["sample_rate"]
+        actual_duration = len(normalized_signal) / sample_rate if sample_rate else 0.0
+        print(f"  Generated signal duration: {actual_duration:.3f} seconds")
+
+        return normalized_signal
+
+    def iter_modulated(
+        self,
+        params: Dict,
+        modulation: Optional[str] = None,
+        chunk_symbols: int = DEFAULT_CHUNK_SYMBOLS,
+    ) -> Iterator[np.ndarray]:
+        """分块生成成形信号，内存只与 chunk_symbols 有关，适合任意长度的波形
+
+        参数与 generate_modulated 相同。整段峰值未知，因此按成形滤波器的最坏峰值
+        （星座最大幅度 x 多相分支抽头绝对值和的最大值）缩放到 0.7，保证不削波。
+        """
+        plan = self._waveform_plan(params, modulation)
+        modulation, mapping, sps = plan["modulation"], plan["mapping"], plan["sps"]
+        shaper = self.pulse_shaper(sps, plan["alpha"], plan["span"])
+        peak = np.max(np.abs(constellation(modulation, mapping))) * self._shaping_gain(shaper.taps, sps)
+        scale = 0.7 / float(peak) if peak > 0 else 1.0
+
+        total = plan["target_samples"] if plan["target_samples"] is not None else plan["num_symbols"] * sps
+        k = bits_per_symbol(modulation)
+        next_bits = self._bit_source(params)
+        chunk_symbols = max(1, int(chunk_symbols))
+        emitted = 0
+        remaining_symbols = plan["num_symbols"]
+        while emitted < total:
+            if remaining_symbols > 0:
+                count = min(chunk_symbols, remaining_symbols)
+                remaining_symbols -= count
+                bits = next_bits(count * k)
+                block = shaper.process(map_bits(bits, modulation, mapping))
+                if remaining_symbols == 0:
+                    block = np.concatenate((block, shaper.flush()))
+            else:
+                # 时长要求超过符号数对应的长度时补零
+                block = np.zeros(min(chunk_symbols * sps, total - emitted), dtype=get_sample_dtype())
+            block = block[: total - emitted] * scale
+            emitted += block.size
+            if block.size:
+                yield block
+
+    def _waveform_plan(self, params: Dict, modulation: Optional[str] = None) -> Dict:
+        """解析生成参数：调制/映射、每符号采样数、符号数与目标样本数"""
         # 参数提取
+        modulation, mapping = check_modulation(
+            modulation or params.get("modulation", "qpsk"), params.get("mapping", "gray")
+        )
         symbol_rate = params.get("symbol_rate", 500e3)
         sample_rate = params.get("sample_rate", 2e6)
         requested_duration = params.get("duration")
         num_symbols = params.get("num_symbols")
-        alpha = params.get("alpha", 0.35)
-        span = params.get("span", 6)
 
         # 计算每符号采样数
         sps = max(8, int(round(sample_rate / symbol_rate)))
@@ -45,80 +140,60 @@ class SignalGenerator:
             if num_symbols <= 0:
                 num_symbols = 1000
 
-        print(f"Generating QPSK signal...")
+        print(f"Generating {modulation.upper()} signal ({mapping} mapping)...")
         print(f"  Samples per symbol: {sps}")
         print(f"  Actual sample rate: {sample_rate/1e3:.1f} kHz")
         print(f"  Generating {num_symbols} symbols")
         if target_samples is not None:
             print(f"  Target samples: {target_samples}")
 
-        # 生成随机比特
-        bits = np.random.randint(0, 2, num_symbols * 2)
-
-        # QPSK调制
-        symbols = self._qpsk_modulate(bits)
-
-        # 脉冲成形
-        shaped_signal = self._pulse_shape(symbols, sps, alpha, span)
-
-        # 信号归一化
-        normalized_signal = self.processor.normalize_signal(shaped_signal)
-
-        if target_samples is not None and len(normalized_signal) > target_samples:
-            normalized_signal = normalized_signal[:target_samples]
-        elif target_samples is not None and len(normalized_signal) < target_samples:
-            pad_width = target_samples - len(normalized_signal)
-            normalized_signal = np.pad(normalized_signal, (0, pad_width), mode="constant")
-
-        actual_duration = len(normalized_signal) / sample_rate if sample_rate else 0.0
-        print(f"  Generated signal duration: {actual_duration:.3f} seconds")
-
-        return normalized_signal
-
-    def _qpsk_modulate(self, bits: np.ndarray) -> np.ndarray:
-        """QPSK调制"""
-        if len(bits) % 2 != 0:
-            bits = np.append(bits, 0)  # 填充0
-
-        # 格雷码映射
-        gray_map = {(0, 0): 0, (0, 1): 1, (1, 1): 2, (1, 0): 3}
-        constellation = np.array([1 + 1j, -1 + 1j, -1 - 1j, 1 - 1j]) / np.sqrt(2)
-
-        symbols = []
-        for i in range(0, len(bits), 2):
-            symbol_idx = gray_map[(bits[i], bits[i + 1])]
-            symbols.append(constellation[symbol_idx])
-
-        return np.array(symbols)
-
-    def _pulse_shape(
-        self, symbols: np.ndarray, sps: int, alpha: float, span: int
-    ) -> np.ndarray:
-        """脉冲成形"""
+        return {
+            "modulation": modulation,
+            "mapping": mapping,
+            "sample_rate": sample_rate,
+            "sps": sps,
+            "alpha": params.get("alpha", 0.35),
+            "span": params.get("span", 6),
+            "num_symbols": num_symbols,
+            "target_samples": target_samples,
+        }
+
+    def pulse_shaper(self, sps: int, alpha: float, span: int) -> StreamingResampler:
+        """RRC 脉冲成形器：多相插值（upfirdn），不对插入的零做乘法
+
+        输出第 n 个样本对齐到 convolve(插零序列, taps, mode="same") 的第 n 个样本，
+        逐块 process() 后 flush()，总长度为 符号数 x sps。
+        """
         # 设计RRC滤波器
         num_taps = span * sps
         if num_taps % 2 == 0:
             num_taps += 1
 
         rrc_taps = self.filter_designer.rrc_taps(num_taps, alpha, sps)
+        return StreamingResampler(sps, 1, taps=rrc_taps)
 
-        # 上采样
-        upsampled = np.zeros(len(symbols) * sps, dtype=complex)
-        upsampled[::sps] = symbols
-
-        # 卷积
-        shaped_signal = signal.convolve(upsampled, rrc_taps, mode="same")
-
-        return shaped_signal
-
-    def generate_prbs(self, length: int) -> np.ndarray:
-        """生成PRBS序列"""
-        state = 0xACE1
-        prbs = []
-
-        for _ in range(length):
-            new_bit = (state ^ (state >> 1)) & 1
-            state = (state >> 1) | (new_bit << 15)
-            prbs.append(new_bit)
-
-        return np.array(prbs, dtype=int)
+    def _pulse_shape(
+        self, symbols: np.ndarray, sps: int, alpha: float, span: int
+    ) -> np.ndarray:
+        """脉冲成形"""
+        shaper = self.pulse_shaper(sps, alpha, span)
+        return np.concatenate((shaper.process(symbols), shaper.flush()))
+
+    @staticmethod
+    def _shaping_gain(taps: np.ndarray, sps: int) -> float:
+        """成形输出相对符号幅度的最大增益：各多相分支抽头绝对值和的最大值"""
+        padded = np.zeros(-(-taps.size // sps) * sps, dtype=float)
+        padded[: taps.size] = np.abs(taps)
+        return float(padded.reshape(-1, sps).sum(axis=0).max())
+
+    def generate_prbs(self, length: int, order=15, seed: Optional[int] = None, offset: int = 0) -> np.ndarray:
+        """生成PRBS序列（标准 PRBS7/9/15/23/31，uint8 0/1；seed 为初始寄存器，offset 为相位偏移）"""
+        return prbs_bits(order, length, seed=seed, offset=offset)
+
+    @staticmethod
+    def _bit_source(params: Dict) -> Callable[[int], np.ndarray]:
+        """比特源：params["prbs"] 指定阶数时用 PRBS（prbs_seed / prbs_offset），否则为随机比特"""
+        order = params.get("prbs")
+        if order:
+            return PRBSGenerator(order, seed=params.get("prbs_seed"), offset=params.get("prbs_offset", 0)).next
+        return lambda count: np.random.randint(0, 2, count, dtype=np.uint8)
@@ -18,9 +18,9 @@ class SignalPlayer:
     def play_signal(self, filename: str, tx_params: Dict) -> bool:
         """播放信号 - 使用简化的发射方法"""
         try:
-            # 加载信号文件
-            samples, metadata = self.files.load_signal(filename)
-            if samples is None:
+            # 读取元数据与统计量（分块，不整文件加载）
+            metadata = self.files.load_metadata(filename)
+            if metadata is None:
                 print("Failed to load signal file")
                 return False
 
@@ -34,9 +34,10 @@ class SignalPlayer:
 
             actual_rate = self.usrp.configure_tx(tx_freq, tx_rate, tx_gain, tx_channel)
 
-            # 计算基础统计数据，方便诊断信号幅度
-            peak_amp = float(np.max(np.abs(samples))) if samples.size else 0.0
-            rms_amp = float(np.sqrt(np.mean(np.abs(samples) ** 2))) if samples.size else 0.0
+            # 基础统计数据（优先使用文件头缓存），方便诊断信号幅度
+            power_stats = self.files.get_power_stats(filename, metadata)
+            peak_amp = float(np.sqrt(np.nan_to_num(power_stats["peak_power"])))
+            rms_amp = float(np.sqrt(np.nan_to_num(power_stats["average_power"])))
 
             recommended_scale = 1.0
             if 0.0 < peak_amp < 0.95:
@@ -48,23 +49,28 @@ class SignalPlayer:
             print(f"  Suggested scale for ~0.95 peak: {recommended_scale:.3f}")
             print(f"  TX scale (applied):            {tx_scale:.3f}")
 
-            playback_samples = np.ascontiguousarray(samples, dtype=np.complex64)
-            if tx_scale and tx_scale != 1.0:
-                playback_samples = np.ascontiguousarray(
-                    playback_samples * tx_scale, dtype=np.complex64
-                )
-
-            peak_after = float(np.max(np.abs(playback_samples))) if playback_samples.size else 0.0
+            # 先由统计量确定总缩放系数，只对样本做一次乘法
+            total_scale = tx_scale
+            peak_after = peak_amp * tx_scale
             if peak_after > 1.0:
                 clip_scale = 0.98 / peak_after
                 print(
                     f"Warning: scaled samples exceed full scale (peak {peak_after:.3f}). "
                     f"Applying safety factor {clip_scale:.3f} to avoid distortion."
                 )
-                playback_samples = np.ascontiguousarray(
-                    playback_samples * clip_scale, dtype=np.complex64
+                total_scale *= clip_scale
+                peak_after = peak_amp * total_scale
+
+            samples, _ = self.files.load_signal(filename, mmap=True)
+            if samples is None:
+                print("Failed to load signal file")
+                return False
+
+            playback_samples = np.ascontiguousarray(samples, dtype=np.complex64)
+            if total_scale != 1.0:
+                playback_samples = np.multiply(
+                    playback_samples, np.complex64(total_scale), dtype=np.complex64
                 )
-                peak_after = float(np.max(np.abs(playback_samples)))
 
             print(f"\nStarting signal replay...")
             print(f"Transmit Frequency: {tx_freq/1e6:.3f} MHz")
@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import os
-import tempfile
 import numpy as np
 import time
 from typing import Dict, Optional, TYPE_CHECKING, Callable
@@ -9,7 +8,17 @@ from datetime import datetime
 from dataclasses import asdict
 from threading import Event
 from pathlib import Path
-from core.file_manager import FileManager, SignalMetadata
+from core.file_manager import (
+    SC16_DEFAULT_SCALE,
+    FileManager,
+    SignalMetadata,
+    SignalWriter,
+    get_storage_profile,
+    to_sc16,
+)
+from core.fir_filter import StreamingFIR, flush_stages, process_stages
+from core.resampler import StreamingResampler
+from core.running_stats import RunningStats
 from core.signal_processor import SignalProcessor
 from config.settings import RecordConfig
 
@@ -69,9 +78,8 @@ class SignalRecorder:
         actual_rate: Optional[float] = None
         expected_samples: Optional[int] = None
         overflow_count = 0
-        temp_file: Optional[tempfile.NamedTemporaryFile] = None
-        temp_path: Optional[Path] = None
-        cleanup_temp = False
+        writer: Optional[SignalWriter] = None
+        write_error: Optional[Exception] = None
 
         try:
             if freq is None or rate is None or gain is None or duration is None:
@@ -86,18 +94,6 @@ class SignalRecorder:
             print("\nStarting signal recording...")
             print("Press Ctrl+C to interrupt recording")
 
-            try:
-                temp_file = tempfile.NamedTemporaryFile(
-                    prefix="rpt_capture_",
-                    suffix=".iq",
-                    delete=False,
-                )
-                temp_path = Path(temp_file.name)
-            except Exception as temp_exc:
-                print(f"Warning: unable to create disk buffer, proceeding without disk safety buffer: {temp_exc}")
-                temp_file = None
-                temp_path = None
-
             flush_interval_value = params.get("flush_interval", 1.0)
             try:
                 flush_interval = float(flush_interval_value)
@@ -155,21 +151,37 @@ class SignalRecorder:
             processed_samples = 0
             expected_samples = int(actual_rate * duration) if duration and duration > 0 else None
 
+            # 样本边采集边写入目标文件（临时文件 + 原子替换），只写一次
+            metadata = SignalMetadata(
+                sample_rate=actual_rate or rate,
+                center_freq=freq,
+                timestamp=datetime.now().isoformat(),
+                duration=0.0,
+                samples_count=0,
+                signal_type="complex",
+                rf_channel=channel,
+                gain=gain,
+                additional_metadata={
+                    "target_sample_rate": rate,
+                    "recording_mode": "power_detection",
+                },
+            )
+            writer = self.files.open_writer(filename, metadata)
+
             def chunk_handler(chunk):
-                nonlocal processed_samples, last_flush
+                nonlocal processed_samples, last_flush, write_error
                 processed_samples += len(chunk)
 
-                if temp_file:
+                if write_error is None:
                     try:
-                        chunk_view = np.asarray(chunk, dtype=np.complex64)
-                        temp_file.write(chunk_view.tobytes())
+                        writer.append(chunk)
                         now = time.time()
                         if now - last_flush >= flush_interval:
-                            temp_file.flush()
-                            os.fsync(temp_file.fileno())
+                            writer.flush()
                             last_flush = now
-                    except Exception as buffer_exc:
-                        print(f"Warning: disk buffer write failed: {buffer_exc}")
+                    except Exception as write_exc:
+                        print(f"Warning: recording write failed: {write_exc}")
+                        write_error = write_exc
 
                 if on_chunk:
                     try:
@@ -195,30 +207,14 @@ class SignalRecorder:
 
             samples = np.asarray(samples, dtype=np.complex64)
 
-            if temp_file:
-                try:
-                    temp_file.flush()
-                    os.fsync(temp_file.fileno())
-                except Exception as flush_exc:
-                    print(f"Warning: unable to flush disk buffer: {flush_exc}")
-                finally:
-                    temp_file.close()
-
-            disk_samples = None
-            if temp_path and temp_path.exists():
-                try:
-                    disk_samples = np.fromfile(temp_path, dtype=np.complex64)
-                except Exception as disk_exc:
-                    print(f"Warning: unable to read disk buffer: {disk_exc}")
-                    disk_samples = None
-
-            if disk_samples is not None and disk_samples.size:
-                if len(samples) != disk_samples.size:
-                    print("Warning: mismatch between buffered samples and in-memory samples; using buffered copy to preserve continuity")
-                    samples = disk_samples
-                cleanup_temp = True
-
-            if len(samples) == 0:
+            if writer.samples_written == 0 and len(samples) > 0 and write_error is None:
+                # record_samples might return samples without invoking the chunk handler
+                writer.append(samples)
+            if write_error is not None:
+                raise write_error
+
+            samples_count = writer.samples_written
+            if samples_count == 0:
                 print("No data recorded")
                 emit_complete(False, {"error": "no_samples"})
                 return False
@@ -228,7 +224,10 @@ class SignalRecorder:
                 emit_complete(False, {"cancelled": True})
                 return False
 
-            actual_duration = len(samples) / actual_rate if actual_rate else 0.0
+            if len(samples) != samples_count:
+                print("Warning: mismatch between in-memory samples and written samples; file keeps the written stream")
+
+            actual_duration = samples_count / actual_rate if actual_rate else 0.0
 
             metadata_extra = {
                 "target_sample_rate": rate,
@@ -245,38 +244,28 @@ class SignalRecorder:
                 metadata_extra["bandwidth"] = float(bandwidth)
             if expected_samples is not None:
                 metadata_extra["expected_samples"] = int(expected_samples)
-                missing = max(0, expected_samples - len(samples))
+                missing = max(0, expected_samples - samples_count)
                 metadata_extra["missing_samples"] = int(missing)
 
-            metadata = SignalMetadata(
-                sample_rate=actual_rate or rate,
-                center_freq=freq,
-                timestamp=datetime.now().isoformat(),
-                duration=actual_duration,
-                samples_count=len(samples),
-                signal_type="complex",
-                rf_channel=channel,
-                gain=gain,
-                additional_metadata=metadata_extra,
-            )
+            metadata.timestamp = datetime.now().isoformat()
+            metadata.additional_metadata = metadata_extra
 
-            success = self.files.save_signal(samples, metadata, filename)
+            success = writer.close()
 
             if success:
-                cleanup_temp = True
-                target_path = self.files.base_dir / filename if not Path(filename).is_absolute() else Path(filename)
+                target_path = writer.path
                 try:
                     target_path = target_path.resolve()
                 except Exception:
                     target_path = Path(filename)
 
-                validation_ok = self.files.validate_signal_integrity(str(target_path), len(samples))
+                validation_ok = self.files.validate_signal_integrity(str(target_path), samples_count)
                 if not validation_ok:
                     print("Warning: saved file failed post-write validation; please verify integrity manually")
 
                 print(f"\nSignal saved successfully: {filename}")
                 print(f"Actual recording duration: {actual_duration:.2f} seconds")
-                print(f"Sample count: {len(samples)}")
+                print(f"Sample count: {samples_count}")
                 file_info = {}
                 file_size_mb = None
                 try:
@@ -295,7 +284,8 @@ class SignalRecorder:
                 except Exception as info_exc:
                     print(f"Warning: unable to read file info: {info_exc}")
 
-                power_stats = self.processor.detect_signal_power(samples)
+                # 写入器已逐块累计统计，无需再遍历样本
+                power_stats = self.processor.detect_signal_power(samples, stats=writer.stats)
                 print(f"Average Power: {power_stats['average_power_db']:.1f} dB")
                 print(f"Peak Power: {power_stats['peak_power_db']:.1f} dB")
 
@@ -304,10 +294,11 @@ class SignalRecorder:
 
                 completion_payload = {
                     "metadata": asdict(metadata),
-                    "samples_count": len(samples),
+                    "samples_count": samples_count,
                     "overflow_count": overflow_count,
                     "file_path": str(target_path),
                     "validation_passed": bool(validation_ok),
+                    "stats": writer.stats.as_dict(),
                 }
 
                 if file_size_mb is not None:
@@ -325,30 +316,10 @@ class SignalRecorder:
         except Exception as e:
             partial_payload = {"error": str(e)}
 
-            if temp_file and not temp_file.closed:
-                try:
-                    temp_file.flush()
-                    os.fsync(temp_file.fileno())
-                except Exception:
-                    pass
-                temp_file.close()
-
-            buffered_samples = None
-            if temp_path and temp_path.exists():
-                try:
-                    buffered_samples = np.fromfile(temp_path, dtype=np.complex64)
-                    partial_payload["buffer_sample_count"] = int(buffered_samples.size)
-                except Exception as read_exc:
-                    partial_payload["buffer_read_error"] = str(read_exc)
-                    buffered_samples = None
-
             recovered = False
-            if buffered_samples is not None and buffered_samples.size > 0:
+            if writer is not None and not writer.closed and writer.samples_written > 0:
+                partial_payload["buffer_sample_count"] = int(writer.samples_written)
                 try:
-                    recovery_rate = actual_rate or rate or 0.0
-                    recovery_duration = (
-                        buffered_samples.size / recovery_rate if recovery_rate else 0.0
-                    )
                     recovery_extra = {
                         "target_sample_rate": rate,
                         "recording_mode": "power_detection_recovery",
@@ -358,67 +329,37 @@ class SignalRecorder:
                     if bandwidth is not None:
                         recovery_extra["bandwidth"] = float(bandwidth)
 
-                    recovery_metadata = SignalMetadata(
-                        sample_rate=recovery_rate,
-                        center_freq=freq or 0.0,
-                        timestamp=datetime.now().isoformat(),
-                        duration=recovery_duration,
-                        samples_count=len(buffered_samples),
-                        signal_type="complex",
-                        rf_channel=channel or 0,
-                        gain=gain or 0.0,
-                        additional_metadata=recovery_extra,
-                    )
+                    writer.metadata.sample_rate = actual_rate or rate or 0.0
+                    writer.metadata.timestamp = datetime.now().isoformat()
+                    writer.metadata.additional_metadata = recovery_extra
 
-                    if filename:
-                        original_path = Path(filename)
-                        if original_path.suffix:
-                            recovery_name = f"{original_path.stem}_recovered{original_path.suffix}"
-                        else:
-                            recovery_name = f"{original_path.name}_recovered"
-                        recovery_filename = str(original_path.with_name(recovery_name))
+                    original_path = Path(filename)
+                    if original_path.suffix:
+                        recovery_name = f"{original_path.stem}_recovered{original_path.suffix}"
                     else:
-                        recovery_filename = self._build_recovery_filename(freq, rate)
-                    recovery_success = self.files.save_signal(
-                        buffered_samples,
-                        recovery_metadata,
-                        recovery_filename,
-                    )
+                        recovery_name = f"{original_path.name}_recovered"
+                    recovery_filename = str(original_path.with_name(recovery_name))
 
-                    if recovery_success:
+                    if writer.close(recovery_filename):
                         recovered = True
-                        cleanup_temp = True
-                        recovered_path = (
-                            self.files.base_dir / recovery_filename
-                            if not Path(recovery_filename).is_absolute()
-                            else Path(recovery_filename)
-                        )
-                        partial_payload["recovered_file"] = str(recovered_path)
+                        partial_payload["recovered_file"] = str(writer.path)
                 except Exception as recover_exc:
                     partial_payload["recovery_error"] = str(recover_exc)
 
             partial_payload["recovered"] = recovered
-            if temp_path and temp_path.exists() and not recovered:
-                partial_payload["buffer_path"] = str(temp_path)
+            if writer is not None and not recovered and writer.temp_path.exists():
+                partial_payload["buffer_path"] = str(writer.temp_path)
 
             emit_complete(False, partial_payload)
             print(f"Recording failed: {e}")
             return False
 
         finally:
-            if temp_file and not temp_file.closed:
-                try:
-                    temp_file.close()
-                except Exception:
-                    pass
-            if temp_path and temp_path.exists():
-                if cleanup_temp:
-                    try:
-                        temp_path.unlink()
-                    except Exception as cleanup_exc:
-                        print(f"Warning: unable to remove temporary buffer file: {cleanup_exc}")
-                else:
-                    print(f"Buffered samples retained at {temp_path} for manual recovery")
+            if writer is not None:
+                if not writer.closed:
+                    writer.abort()
+                elif writer.temp_path.exists():
+                    print(f"Buffered samples retained at {writer.temp_path} for manual recovery")
 
     def record_with_bandpass_sampling(self, params: Dict) -> bool:
         """带通采样录制"""
@@ -436,12 +377,6 @@ class SignalRecorder:
 
         return self.record_with_power_detection(params)
 
-    def _build_recovery_filename(self, freq: Optional[float], rate: Optional[float]) -> str:
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        freq_part = f"{int(freq / 1e6)}MHz" if freq else "unknown"
-        rate_part = f"{int(rate / 1e3)}kHz" if rate else "unknown"
-        return f"hf_record_recovery_{freq_part}_{rate_part}_{timestamp}.h5"
-
     def record_high_speed(
         self,
         params: Dict,
@@ -507,12 +442,23 @@ class SignalRecorder:
         except (TypeError, ValueError):
             chunk_samples = 1024 * 1024
 
-        compression = params.get("compression", "lzf")
-        if isinstance(compression, str) and compression.lower() in {"none", "off", "false"}:
-            compression = None
+        # storage_profile 优先；兼容旧的 compression 参数（lzf/gzip/none）
+        profile_name = params.get("storage_profile") or params.get("compression") or "lzf"
+        try:
+            storage_profile = get_storage_profile(str(profile_name), chunk_samples)
+        except ValueError as exc:
+            print(f"High-speed recording: {exc}")
+            return False
+
+        # sc16: 以 int16 I/Q 存储（固定 UHD 缩放系数），磁盘与 I/O 减半
+        sample_format = str(params.get("sample_format") or self.files.sample_format or "fc32").lower()
+        if sample_format not in ("fc32", "sc16"):
+            print(f"High-speed recording: unsupported sample format {sample_format}")
+            return False
 
         print(f"\nStarting high-speed recording at {rate/1e6:.1f} MSps")
-        print(f"Expected throughput ~{rate * 8 / 1e6:.1f} MB/s (complex64)")
+        bytes_per_sample = 4 if sample_format == "sc16" else 8
+        print(f"Expected throughput ~{rate * bytes_per_sample / 1e6:.1f} MB/s ({sample_format})")
 
         actual_rate = self.usrp.configure_rx(
             freq,
@@ -545,12 +491,42 @@ class SignalRecorder:
                 f"requested={requested_rate:.3f}, actual={actual_rate_f:.3f}, rel_diff={rel_diff:.3f}",
             )
 
+        # 可选的内联重采样 / 频移：宽带采集、只存储目标信道（output_rate、frequency_shift）
+        resampler: Optional[StreamingResampler] = None
+        stored_rate = actual_rate
+        stored_freq = freq
+        output_rate = params.get("output_rate")
+        frequency_shift = params.get("frequency_shift") or 0.0
+        if output_rate or frequency_shift:
+            try:
+                resampler = StreamingResampler.from_rates(
+                    float(actual_rate), float(output_rate or actual_rate), shift_hz=float(frequency_shift)
+                )
+            except (TypeError, ValueError) as exc:
+                print(f"High-speed recording: invalid resampling parameters: {exc}")
+                return False
+            stored_rate = resampler.output_rate
+            stored_freq = freq - resampler.shift_hz
+            print(f"Resampling inline to {stored_rate/1e3:.1f} kSps (shift {resampler.shift_hz/1e3:+.1f} kHz)")
+
+        # 可选的内联 FIR（filter_taps，按采集采样率设计），在重采样之前执行
+        stages = []
+        filter_taps = params.get("filter_taps")
+        if filter_taps is not None and len(filter_taps):
+            try:
+                stages.append(StreamingFIR(filter_taps))
+            except (TypeError, ValueError) as exc:
+                print(f"High-speed recording: invalid filter taps: {exc}")
+                return False
+        if resampler is not None:
+            stages.append(resampler)
+
         if on_start:
             try:
                 on_start(
-                    actual_rate,
+                    stored_rate,
                     {
-                        "freq": freq,
+                        "freq": stored_freq,
                         "rate": rate,
                         "channel": channel,
                         "bandwidth": bandwidth,
@@ -561,9 +537,12 @@ class SignalRecorder:
                 print(f"Streaming start callback error: {cb_exc}")
 
         processed_samples = 0
+        received_samples = 0
         overflow_count = 0
         write_error: Optional[Exception] = None
-        total_expected = int(actual_rate * duration) if duration and duration > 0 else None
+        # 逐块累计的样本统计，结束时写入文件头
+        stats = RunningStats()
+        total_expected = int(stored_rate * duration) if duration and duration > 0 else None
         last_flush = time.time()
         recording_started = datetime.now().isoformat()
 
@@ -574,29 +553,40 @@ class SignalRecorder:
 
         try:
             with h5py.File(temp_path, "w", libver="latest") as h5f:
-                dataset_kwargs = {
-                    "shape": (0,),
-                    "maxshape": (None,),
-                    "dtype": np.complex64,
-                    "chunks": (chunk_samples,),
-                    "fletcher32": True,
-                }
-                if compression:
-                    dataset_kwargs["compression"] = compression
-                    dataset_kwargs["shuffle"] = True
-
-                dataset = h5f.create_dataset("samples", **dataset_kwargs)
+                if sample_format == "sc16":
+                    dataset = h5f.create_dataset(
+                        "samples",
+                        shape=(0, 2),
+                        maxshape=(None, 2),
+                        dtype=np.int16,
+                        fletcher32=True,
+                        **storage_profile.dataset_kwargs(row_shape=(2,)),
+                    )
+                    dataset.attrs["scale"] = SC16_DEFAULT_SCALE
+                else:
+                    dataset = h5f.create_dataset(
+                        "samples",
+                        shape=(0,),
+                        maxshape=(None,),
+                        dtype=np.complex64,
+                        fletcher32=True,
+                        **storage_profile.dataset_kwargs(),
+                    )
 
                 file_attrs = h5f.attrs
-                file_attrs["sample_rate"] = float(actual_rate)
-                file_attrs["center_freq"] = float(freq)
+                file_attrs["sample_rate"] = float(stored_rate)
+                file_attrs["center_freq"] = float(stored_freq)
                 file_attrs["timestamp"] = recording_started
                 file_attrs["signal_type"] = "complex"
                 file_attrs["rf_channel"] = int(channel)
                 file_attrs["gain"] = float(gain)
                 file_attrs["target_sample_rate"] = float(rate)
                 file_attrs["recording_mode"] = "high_speed"
+                file_attrs["storage_profile"] = storage_profile.name
                 file_attrs["overflow_count"] = 0
+                if resampler is not None:
+                    file_attrs["source_sample_rate"] = float(actual_rate)
+                    file_attrs["frequency_shift"] = float(resampler.shift_hz)
                 if bandwidth is not None:
                     file_attrs["bandwidth"] = float(bandwidth)
                 try:
@@ -606,33 +596,47 @@ class SignalRecorder:
                 except Exception:
                     pass
 
+                def write_block(chunk_view: np.ndarray):
+                    nonlocal processed_samples, last_flush
+                    current_size = dataset.shape[0]
+                    new_size = current_size + len(chunk_view)
+                    dataset.resize(new_size, axis=0)
+                    if sample_format == "sc16":
+                        dataset[current_size:new_size] = to_sc16(chunk_view, SC16_DEFAULT_SCALE)
+                    else:
+                        dataset[current_size:new_size] = chunk_view
+                    processed_samples += len(chunk_view)
+
+                    stats.update(chunk_view)
+
+                    now = time.time()
+                    if now - last_flush >= flush_interval:
+                        h5f.flush()
+                        last_flush = now
+
+                    if on_chunk:
+                        on_chunk(
+                            chunk_view,
+                            {
+                                "sample_rate": stored_rate,
+                                "processed_samples": processed_samples,
+                                "expected_samples": total_expected,
+                                "timestamp": now,
+                            },
+                        )
+
                 def chunk_handler(chunk: np.ndarray):
-                    nonlocal processed_samples, last_flush, write_error, overflow_count
+                    nonlocal received_samples, write_error
                     if write_error is not None:
                         return
                     try:
                         chunk_view = np.asarray(chunk, dtype=np.complex64)
-                        current_size = dataset.shape[0]
-                        new_size = current_size + len(chunk_view)
-                        dataset.resize((new_size,))
-                        dataset[current_size:new_size] = chunk_view
-                        processed_samples += len(chunk_view)
-
-                        now = time.time()
-                        if now - last_flush >= flush_interval:
-                            h5f.flush()
-                            last_flush = now
-
-                        if on_chunk:
-                            on_chunk(
-                                chunk_view,
-                                {
-                                    "sample_rate": actual_rate,
-                                    "processed_samples": processed_samples,
-                                    "expected_samples": total_expected,
-                                    "timestamp": now,
-                                },
-                            )
+                        received_samples += len(chunk_view)
+                        if stages:
+                            chunk_view = np.asarray(process_stages(stages, chunk_view), dtype=np.complex64)
+                            if chunk_view.size == 0:
+                                return
+                        write_block(chunk_view)
                     except Exception as write_exc:
                         write_error = write_exc
                         if cancel_event is not None:
@@ -648,7 +652,7 @@ class SignalRecorder:
                     collect_samples=False,
                 )
 
-                if samples is not None and len(samples) > 0 and processed_samples == 0:
+                if samples is not None and len(samples) > 0 and received_samples == 0:
                     # record_samples might fallback to returning samples if chunk handler was skipped
                     chunk_handler(samples)
 
@@ -657,11 +661,25 @@ class SignalRecorder:
                     raise RuntimeError("recording_cancelled")
                 if write_error is not None:
                     raise write_error
+                if stages:
+                    # 输出滤波 / 重采样级的尾部
+                    tail = np.asarray(flush_stages(stages), dtype=np.complex64)
+                    if tail.size:
+                        write_block(tail)
 
-                actual_duration = processed_samples / actual_rate if actual_rate else 0.0
+                actual_duration = processed_samples / stored_rate if stored_rate else 0.0
                 file_attrs["duration"] = float(actual_duration)
                 file_attrs["samples_count"] = int(processed_samples)
                 file_attrs["overflow_count"] = int(overflow_count)
+                # 缓存功率统计，get_file_info 只需读取文件头
+                if processed_samples:
+                    for key, value in stats.persisted().items():
+                        file_attrs[key] = value
+                if sample_format == "sc16":
+                    file_attrs["sample_dtype"] = "sc16"
+                    file_attrs["scale"] = SC16_DEFAULT_SCALE
+                else:
+                    file_attrs["sample_dtype"] = np.dtype(np.complex64).name
                 h5f.flush()
 
             os.replace(temp_path, base_path)
@@ -689,12 +707,15 @@ class SignalRecorder:
                 extra_meta["bandwidth"] = float(bandwidth)
             if total_expected is not None:
                 extra_meta["expected_samples"] = int(total_expected)
+            if resampler is not None:
+                extra_meta["source_sample_rate"] = float(actual_rate)
+                extra_meta["frequency_shift"] = float(resampler.shift_hz)
 
             metadata = SignalMetadata(
-                sample_rate=actual_rate,
-                center_freq=freq,
+                sample_rate=stored_rate,
+                center_freq=stored_freq,
                 timestamp=recording_started,
-                duration=processed_samples / actual_rate if actual_rate else 0.0,
+                duration=processed_samples / stored_rate if stored_rate else 0.0,
                 samples_count=int(processed_samples),
                 signal_type="complex",
                 rf_channel=channel,
@@ -708,6 +729,7 @@ class SignalRecorder:
                 "overflow_count": overflow_count,
                 "file_path": str(base_path),
                 "validation_passed": bool(validation_ok),
+                "stats": stats.as_dict(),
             }
             if file_size_mb is not None:
                 completion_payload["file_size_mb"] = float(file_size_mb)
@@ -575,86 +575,70 @@ class SpectrumScanner:
             }
 
     def _capture_and_process_segment(self, center_freq, config, segment_idx):
-        """采集并处理单个频段（无平均处理）"""
-        processor_cfg = getattr(self.processor, "config", None)
-        fft_override = getattr(config, "fft_size", None)
-        previous_fft = None
-        if fft_override and processor_cfg is not None:
-            try:
-                previous_fft = getattr(processor_cfg, "fft_size", None)
-                processor_cfg.fft_size = int(fft_override)
-            except Exception:
-                previous_fft = None
+        """采集并处理单个频段（无平均处理）
 
+        FFT 大小按调用传入，不修改共享的 processor.config。
+        """
+        fft_override = getattr(config, "fft_size", None)
         try:
-            # 直接采集样本，不进行平均
-            if not self.scanning or self._stop_event.is_set():
-                return None
+            fft_size = int(fft_override) if fft_override else None
+        except (TypeError, ValueError):
+            fft_size = None
 
-            # 采集样本（硬件或模拟）
-            samples = self._acquire_samples(config, center_freq)
+        # 直接采集样本，不进行平均
+        if not self.scanning or self._stop_event.is_set():
+            return None
 
-            if samples is not None and len(samples) > 0:
-                # 计算频谱
-                freqs, spectrum_power = self.processor.calculate_spectrum(
-                    samples, config.sample_rate
-                )
-                spectrum_db = 10 * np.log10(np.maximum(spectrum_power, 1e-12))
-
-                # 调整频率为中心频率
-                adjusted_freqs = freqs + center_freq
-
-                # 简化降采样逻辑
-                freq_ds, power_ds = adjusted_freqs, spectrum_db
-
-                # 只在必要时进行降采样
-                if len(freq_ds) > 10000:  # 只有在数据点过多时才降采样
-                    freq_ds, power_ds = self._adaptive_downsample(freq_ds, power_ds, config)
-
-                # 保持原有的频率范围过滤逻辑
-                band_start = float(getattr(config, 'start_freq', 0.0) or 0.0)
-                band_stop = float(getattr(config, 'stop_freq', 0.0) or 0.0)
-                if band_stop < band_start:
-                    band_start, band_stop = band_stop, band_start
-
-                if band_stop > band_start:
-                    filtered_freqs = []
-                    filtered_power = []
-                    for idx, freq_val in enumerate(freq_ds):
-                        try:
-                            freq_numeric = float(freq_val)
-                        except (TypeError, ValueError):
-                            continue
-                        if band_start <= freq_numeric <= band_stop:
-                            filtered_freqs.append(freq_numeric)
-                            if idx < len(power_ds):
-                                filtered_power.append(power_ds[idx])
-                    if filtered_freqs:
-                        freq_ds = filtered_freqs
-                        power_ds = filtered_power[: len(filtered_freqs)]
-
-                center_freq_clamped = center_freq
-                if band_stop > band_start:
-                    try:
-                        center_freq_clamped = min(max(float(center_freq), band_start), band_stop)
-                    except (TypeError, ValueError):
-                        center_freq_clamped = center_freq
-
-                return {
-                    "frequencies": freq_ds.tolist() if hasattr(freq_ds, 'tolist') else list(freq_ds),
-                    "power": power_ds.tolist() if hasattr(power_ds, 'tolist') else list(power_ds),
-                    "segment_index": segment_idx,
-                    "center_freq": center_freq_clamped,
-                    "timestamp": time.time(),
-                }
+        # 采集样本（硬件或模拟）
+        samples = self._acquire_samples(config, center_freq)
 
-            return None
-        finally:
-            if previous_fft is not None and processor_cfg is not None:
+        if samples is not None and len(samples) > 0:
+            # 计算频谱（Welch 平均，降低单帧方差）
+            freqs, spectrum_power = self.processor.calculate_psd(
+                samples, config.sample_rate, fft_size=fft_size
+            )
+            spectrum_db = 10 * np.log10(np.maximum(spectrum_power, 1e-12))
+
+            # 调整频率为中心频率
+            adjusted_freqs = freqs + center_freq
+
+            # 简化降采样逻辑
+            freq_ds, power_ds = adjusted_freqs, spectrum_db
+
+            # 只在必要时进行降采样
+            if len(freq_ds) > 10000:  # 只有在数据点过多时才降采样
+                freq_ds, power_ds = self._adaptive_downsample(freq_ds, power_ds, config)
+
+            # 保持原有的频率范围过滤逻辑
+            band_start = float(getattr(config, 'start_freq', 0.0) or 0.0)
+            band_stop = float(getattr(config, 'stop_freq', 0.0) or 0.0)
+            if band_stop < band_start:
+                band_start, band_stop = band_stop, band_start
+
+            freq_ds = np.asarray(freq_ds, dtype=float)
+            power_ds = np.asarray(power_ds)
+            if band_stop > band_start:
+                in_band = (freq_ds >= band_start) & (freq_ds <= band_stop)
+                if np.any(in_band):
+                    freq_ds = freq_ds[in_band]
+                    power_ds = power_ds[in_band]
+
+            center_freq_clamped = center_freq
+            if band_stop > band_start:
                 try:
-                    processor_cfg.fft_size = previous_fft
-                except Exception:
-                    pass
+                    center_freq_clamped = min(max(float(center_freq), band_start), band_stop)
+                except (TypeError, ValueError):
+                    center_freq_clamped = center_freq
+
+            return {
+                "frequencies": freq_ds.tolist(),
+                "power": power_ds.tolist(),
+                "segment_index": segment_idx,
+                "center_freq": center_freq_clamped,
+                "timestamp": time.time(),
+            }
+
+        return None
 
 
     def _configure_receiver(self, freq_hz: float, sample_rate: float):
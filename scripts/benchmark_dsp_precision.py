@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""Benchmark DSP precision modes: double vs single throughput on 1M-sample frames.
+
+Usage: from the project root run:
+  PYTHONPATH=. python3 scripts/benchmark_dsp_precision.py [--samples 1048576] [--repeat 10]
+
+Each operation runs on the same frame with ProcessingConfig(precision=...) set to
+"double" and "single", under both sample dtype policies (PerformanceConfig.sample_dtype
+complex64 / complex128); throughput is reported in Msamples/s (best of --repeat).
+With the complex64 policy the FFT already runs in single precision, so the gain of
+"single" there is limited to the power/dB stage.
+"""
+import argparse
+import time
+
+import numpy as np
+
+from core.dtypes import PRECISIONS, get_sample_dtype, set_sample_dtype
+from core.signal_processor import ProcessingConfig, SignalProcessor
+
+
+def make_frame(count: int, rate: float) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    t = np.arange(count, dtype=np.float64) / rate
+    tone = 0.5 * np.exp(2j * np.pi * 100e3 * t)
+    noise = 0.05 * (rng.standard_normal(count) + 1j * rng.standard_normal(count))
+    return tone + noise
+
+
+def best_time(func, repeat: int) -> float:
+    func()  # 预热窗缓存与 FFT 计划
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def operations(processor: SignalProcessor, frame: np.ndarray, rate: float, batch_fft: int, psd_fft: int):
+    """calculate_spectrum 对整帧做一次 FFT；calculate_spectra 按 batch_fft 分行；calculate_psd 按 psd_fft 分段"""
+    batch = frame[: (frame.size // batch_fft) * batch_fft].reshape(-1, batch_fft)
+    return {
+        "spectrum": lambda: processor.calculate_spectrum(frame, rate),
+        "spectra": lambda: processor.calculate_spectra(batch, rate, batch_fft),
+        "psd": lambda: processor.calculate_psd(frame, rate, fft_size=psd_fft),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--samples", type=int, default=1 << 20, help="frame length in samples")
+    parser.add_argument("--rate", type=float, default=10e6, help="sample rate in S/s")
+    parser.add_argument("--batch-fft", type=int, default=4096, help="row length for calculate_spectra")
+    parser.add_argument("--psd-fft", type=int, default=8192, help="Welch segment length")
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    frame = make_frame(args.samples, args.rate)
+    policies = ("complex64", "complex128")
+    columns = [(policy, precision) for policy in policies for precision in PRECISIONS]
+    print(f"{args.samples} samples ({frame.nbytes / 1e6:.1f} MB complex128 input), best of {args.repeat}, MS/s")
+    print(f"{'operation':<10} " + " ".join(f"{'c' + policy[7:] + '/' + precision:>12}" for policy, precision in columns))
+
+    results = {}
+    previous = get_sample_dtype()
+    try:
+        for policy, precision in columns:
+            set_sample_dtype(policy)
+            processor = SignalProcessor(
+                ProcessingConfig(fft_size=args.samples, psd_max_segments=0, precision=precision)
+            )
+            ops = operations(processor, frame, args.rate, args.batch_fft, args.psd_fft)
+            for name, func in ops.items():
+                results.setdefault(name, []).append(args.samples / best_time(func, args.repeat) / 1e6)
+    finally:
+        set_sample_dtype(previous)
+
+    for name, throughput in results.items():
+        print(f"{name:<10} " + " ".join(f"{value:>12.1f}" for value in throughput))
+
+if __name__ == "__main__":
+    main()
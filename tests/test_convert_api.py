@@ -0,0 +1,95 @@
+import sys
+import pathlib
+import time
+
+# ensure repo root on path
+repo_root = str(pathlib.Path(__file__).resolve().parents[1])
+if repo_root not in sys.path:
+    sys.path.insert(0, repo_root)
+
+import numpy as np
+import pytest
+pytest.importorskip("h5py")
+from fastapi.testclient import TestClient
+from core.file_manager import SignalMetadata
+from webui import app as webapp
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    from utils.file_management import FileManager
+
+    manager = FileManager()
+    manager._base_path = tmp_path
+    manager.core_manager.base_dir = tmp_path
+    manager.catalog = None
+    monkeypatch.setattr(webapp, "_file_manager", manager)
+
+    samples = np.exp(2j * np.pi * 0.01 * np.arange(2000)).astype(np.complex64)
+    meta = SignalMetadata(
+        sample_rate=1e6, center_freq=1e6, timestamp="now", duration=samples.size / 1e6, samples_count=samples.size
+    )
+    assert manager.core_manager.save_signal(samples, meta, str(tmp_path / "input.h5"))
+    return TestClient(webapp.app)
+
+
+def _wait_for(client, task_id):
+    deadline = time.time() + 10
+    while time.time() < deadline:
+        task = client.get(f"/api/convert/{task_id}").json()
+        if task["status"] != "running":
+            return task
+        time.sleep(0.05)
+    raise AssertionError("conversion did not finish")
+
+
+def test_convert_accepts_ui_form_fields(client, tmp_path):
+    # 与 webui/static/app.js convertSignal 相同：表单字段 filename / format / output
+    resp = client.post("/api/convert", data={"filename": "input.h5", "format": "npy", "output": "exported"})
+    assert resp.status_code == 200, resp.text
+    task = _wait_for(client, resp.json()["task_id"])
+    assert task["status"] == "completed"
+    assert task["converted"] == 1
+    assert (tmp_path / "exported.npy").exists()
+
+    resp = client.post("/api/convert", json={"files": ["input.h5"], "output_format": "csv"})
+    assert resp.status_code == 200, resp.text
+    assert _wait_for(client, resp.json()["task_id"])["converted"] == 1
+    assert (tmp_path / "input.csv").exists()
+
+
+def test_convert_rejects_paths_outside_data_directory(client, tmp_path):
+    outside = tmp_path.parent / "outside.h5"
+    for payload in (
+        {"files": [str(outside)], "output_format": "npy"},
+        {"files": ["../outside.h5"], "output_format": "npy"},
+        {"files": ["input.h5"], "output_format": "npy", "output_dir": "/tmp"},
+        {"filename": "input.h5", "output_format": "npy", "output": "../escape"},
+    ):
+        resp = client.post("/api/convert", json=payload)
+        assert resp.status_code == 400, payload
+        assert resp.json()["success"] is False
+
+    resp = client.post("/api/convert", data={"filename": "input.h5", "format": "exe"})
+    assert resp.status_code == 400
+
+
+def test_convert_form_overwrite_flag_and_workers(client, tmp_path):
+    form = {"filename": "input.h5", "format": "npy", "output": "exported"}
+    assert _wait_for(client, client.post("/api/convert", data=form).json()["task_id"])["converted"] == 1
+    target = tmp_path / "exported.npy"
+    mtime = target.stat().st_mtime_ns
+
+    # 表单字符串 "false" 不能当作 True
+    task = _wait_for(client, client.post("/api/convert", data={**form, "overwrite": "false"}).json()["task_id"])
+    assert task["skipped"] == 1 and task["converted"] == 0
+    assert target.stat().st_mtime_ns == mtime
+
+    task = _wait_for(client, client.post("/api/convert", data={**form, "overwrite": "on"}).json()["task_id"])
+    assert task["converted"] == 1
+
+    for workers in ("abc", "0", "-2"):
+        resp = client.post("/api/convert", data={"filename": "input.h5", "format": "npy", "workers": workers})
+        assert resp.status_code == 400
+    resp = client.post("/api/convert", json={"files": ["input.h5"], "output_format": "npy", "workers": 2})
+    assert _wait_for(client, resp.json()["task_id"])["converted"] == 1
@@ -43,3 +43,82 @@ def test_convert_h5_to_npy_wav_csv(tmp_path):
     csv_out = tmp_path / "out.csv"
     assert converter.convert_format(str(h5_file), "csv", str(csv_out))
     assert csv_out.exists()
+
+
+def test_csv_export_full_length_columns_and_decimation(tmp_path):
+    fm = FileManager()
+    converter = FormatConverter(fm, chunk_samples=1000)
+
+    rng = np.random.default_rng(3)
+    samples = (rng.standard_normal(25_000) + 1j * rng.standard_normal(25_000)).astype(np.complex64)
+    meta = SignalMetadata(
+        sample_rate=1e6,
+        center_freq=1e6,
+        timestamp="now",
+        duration=len(samples) / 1e6,
+        samples_count=len(samples),
+    )
+    h5_file = tmp_path / "input.h5"
+    assert fm.save_signal(samples, meta, str(h5_file))
+
+    # 全长导出，不再截断到 10000 行
+    csv_out = tmp_path / "all.csv"
+    assert converter.convert_format(str(h5_file), "csv", str(csv_out))
+    table = np.loadtxt(csv_out, delimiter=",", skiprows=1)
+    assert table.shape == (len(samples), 5)
+    np.testing.assert_array_equal(table[:, 0], np.arange(len(samples)))
+    np.testing.assert_allclose(table[:, 1] + 1j * table[:, 2], samples, atol=1e-6)
+    np.testing.assert_allclose(table[:, 3], np.abs(samples), atol=1e-5)
+
+    # 仅 I/Q，抽取因子与块大小不整除
+    converter.csv_columns = "iq"
+    converter.csv_decimation = 7
+    csv_out = tmp_path / "iq.csv"
+    assert converter.convert_format(str(h5_file), "csv", str(csv_out))
+    assert csv_out.read_text().splitlines()[0] == "Sample_Index,I_Component,Q_Component"
+    table = np.loadtxt(csv_out, delimiter=",", skiprows=1)
+    np.testing.assert_array_equal(table[:, 0], np.arange(0, len(samples), 7))
+    np.testing.assert_allclose(table[:, 1] + 1j * table[:, 2], samples[::7], atol=1e-6)
+
+    converter.csv_decimation = 0
+    assert converter.convert_format(str(h5_file), "csv", str(tmp_path / "bad.csv")) is False
+
+
+def test_convert_batch_parallel_and_skips_up_to_date(tmp_path):
+    fm = FileManager()
+    converter = FormatConverter(fm)
+
+    samples = (np.arange(256) * (0.001 + 0.002j)).astype(np.complex64)
+    meta = SignalMetadata(
+        sample_rate=16000.0,
+        center_freq=1e6,
+        timestamp="now",
+        duration=len(samples) / 16000.0,
+        samples_count=len(samples),
+    )
+    inputs = []
+    for name in ("a.bin", "b.bin", "c.bin"):
+        assert fm.save_signal(samples, meta, str(tmp_path / name))
+        inputs.append(str(tmp_path / name))
+    (tmp_path / "broken.bin").write_bytes(b"")
+    (tmp_path / "broken.txt").write_text("Sample_Rate: not-a-number\n")
+    inputs.append(str(tmp_path / "broken.bin"))
+
+    progress = []
+    out_dir = tmp_path / "out"
+    summary = converter.convert_batch(
+        inputs, "h5", workers=2, output_dir=str(out_dir), progress_callback=lambda d, t, r: progress.append((d, t))
+    )
+    assert summary["converted"] == 3 and summary["failed"] == 1
+    assert progress[-1] == (4, 4)
+    loaded, _ = fm.load_signal(str(out_dir / "b.h5"))
+    np.testing.assert_array_equal(loaded, samples)
+
+    summary = converter.convert_batch(inputs[:3], "h5", workers=2, output_dir=str(out_dir))
+    assert summary["skipped"] == 3 and summary["converted"] == 0
+
+    # 重采样设置不同：已有输出不能视为最新
+    converter.output_rate = 8000.0
+    summary = converter.convert_batch(inputs[:1], "h5", workers=1, output_dir=str(out_dir))
+    assert summary["converted"] == 1 and summary["skipped"] == 0
+    assert fm.load_metadata(str(out_dir / "a.h5")).sample_rate == 8000.0
@@ -33,3 +33,25 @@ def test_binary_save_and_load(tmp_path):
     assert loaded is not None
     assert loaded_meta is not None
     assert loaded_meta.samples_count == len(samples)
+
+
+def test_binary_mmap_load(tmp_path):
+    fm = FileManager()
+
+    samples = (np.arange(16) + 1j * np.arange(16, 32)).astype(np.complex64)
+    meta = SignalMetadata(
+        sample_rate=1e6,
+        center_freq=10e6,
+        timestamp="now",
+        duration=len(samples) / 1e6,
+        samples_count=len(samples),
+    )
+
+    out = tmp_path / "mapped.bin"
+    assert fm.save_signal(samples, meta, str(out)) is True
+
+    mapped, mapped_meta = fm.load_signal(str(out), mmap=True)
+    assert isinstance(mapped, np.memmap)
+    assert mapped.dtype == np.complex64
+    assert mapped_meta.sample_rate == 1e6
+    np.testing.assert_array_equal(np.asarray(mapped), samples)
@@ -30,3 +30,387 @@ def test_file_save_and_load(tmp_path):
     assert loaded_samples is not None
     assert loaded_meta is not None
     assert loaded_meta.samples_count == len(samples)
+
+
+def test_read_range_and_iter_chunks(tmp_path):
+    import sys
+    import pathlib
+    import numpy as np
+    import pytest
+    pytest.importorskip("h5py")
+
+    repo_root = str(pathlib.Path(__file__).resolve().parents[1])
+    if repo_root not in sys.path:
+        sys.path.insert(0, repo_root)
+
+    from core.file_manager import FileManager, SignalMetadata
+
+    fm = FileManager()
+    samples = (np.arange(1000) - 1j * np.arange(1000)).astype(np.complex64)
+    meta = SignalMetadata(
+        sample_rate=1e6,
+        center_freq=100e6,
+        timestamp="now",
+        duration=len(samples) / 1e6,
+        samples_count=len(samples),
+    )
+
+    for name in ("range.h5", "range.bin"):
+        out = tmp_path / name
+        assert fm.save_signal(samples, meta, str(out)) is True
+
+        assert fm.get_sample_count(str(out)) == len(samples)
+        np.testing.assert_array_equal(fm.read_range(str(out), 100, 50), samples[100:150])
+        assert fm.read_range(str(out), 990, 50).size == 10
+
+        chunks = list(fm.iter_chunks(str(out), 300))
+        assert [c.size for c in chunks] == [300, 300, 300, 100]
+        np.testing.assert_array_equal(np.concatenate(chunks), samples)
+
+        info = fm.get_file_info(str(out))
+        assert info["samples_count"] == len(samples)
+        assert np.isclose(info["power_stats"]["peak_power"], np.max(np.abs(samples) ** 2))
+
+
+def test_open_writer_appends_and_finalizes(tmp_path):
+    import sys
+    import pathlib
+    import numpy as np
+    import pytest
+    pytest.importorskip("h5py")
+
+    repo_root = str(pathlib.Path(__file__).resolve().parents[1])
+    if repo_root not in sys.path:
+        sys.path.insert(0, repo_root)
+
+    from core.file_manager import FileManager, SignalMetadata
+
+    fm = FileManager()
+    samples = (np.random.randn(5000) + 1j * np.random.randn(5000)).astype(np.complex64)
+
+    for name in ("stream.h5", "stream.bin"):
+        meta = SignalMetadata(
+            sample_rate=1e6,
+            center_freq=100e6,
+            timestamp="now",
+            duration=0.0,
+            samples_count=0,
+        )
+        out = tmp_path / name
+        with fm.open_writer(str(out), meta, chunk_samples=1024) as writer:
+            for start in range(0, samples.size, 1500):
+                writer.append(samples[start : start + 1500])
+            # nothing is visible at the target path until close()
+            assert not out.exists()
+
+        assert not writer.temp_path.exists()
+        loaded, loaded_meta = fm.load_signal(str(out))
+        np.testing.assert_array_equal(loaded, samples)
+        assert loaded_meta.samples_count == samples.size
+        assert loaded_meta.duration == pytest.approx(samples.size / 1e6)
+
+    meta = SignalMetadata(sample_rate=1e6, center_freq=0.0, timestamp="now", duration=0.0, samples_count=0)
+    aborted = tmp_path / "aborted.h5"
+    writer = fm.open_writer(str(aborted), meta)
+    writer.append(samples[:10])
+    writer.abort()
+    assert not aborted.exists()
+    assert not writer.temp_path.exists()
+
+    # close(filename) 只允许同目录、同扩展名改名（临时文件格式已固定）
+    writer = fm.open_writer(str(tmp_path / "partial.h5"), meta)
+    writer.append(samples[:10])
+    for bad in ("partial.bin", str(tmp_path / "sub" / "partial.h5")):
+        with pytest.raises(ValueError):
+            writer.close(bad)
+    assert not writer.closed
+    assert writer.close(str(tmp_path / "partial_recovered.h5"))
+    assert writer.path == tmp_path / "partial_recovered.h5"
+    np.testing.assert_array_equal(fm.load_signal(str(writer.path))[0], samples[:10])
+
+
+def test_file_info_uses_cached_stats(tmp_path, monkeypatch):
+    import sys
+    import pathlib
+    import numpy as np
+    import pytest
+    h5py = pytest.importorskip("h5py")
+
+    repo_root = str(pathlib.Path(__file__).resolve().parents[1])
+    if repo_root not in sys.path:
+        sys.path.insert(0, repo_root)
+
+    from core.file_manager import FileManager, SignalMetadata
+
+    fm = FileManager()
+    samples = np.array([1 + 0j, 0 + 2j, 0.5 - 0.5j], dtype=np.complex64)
+    meta = SignalMetadata(
+        sample_rate=1e3,
+        center_freq=0.0,
+        timestamp="now",
+        duration=len(samples) / 1e3,
+        samples_count=len(samples),
+    )
+
+    for name in ("stats.h5", "stats.bin"):
+        out = tmp_path / name
+        assert fm.save_signal(samples, meta, str(out)) is True
+        info = fm.get_file_info(str(out))
+        assert info["samples_count"] == 3
+        assert info["sample_dtype"] == "complex64"
+        assert info["power_stats"]["peak_power"] == pytest.approx(4.0)
+        assert info["power_stats"]["average_power"] == pytest.approx(5.5 / 3)
+
+    # header values are trusted: info must not touch the samples
+    with h5py.File(tmp_path / "stats.h5", "a") as f:
+        f.attrs["peak_power"] = 123.0
+    assert fm.get_file_info(str(tmp_path / "stats.h5"))["power_stats"]["peak_power"] == 123.0
+
+    # legacy files without cached fields fall back to a streaming computation
+    legacy = tmp_path / "legacy.h5"
+    with h5py.File(legacy, "w") as f:
+        f.create_dataset("samples", data=samples)
+        f.attrs["sample_rate"] = 1e3
+    info = fm.get_file_info(str(legacy))
+    assert info["power_stats"]["peak_power"] == pytest.approx(4.0)
+
+    # 统计缓存按路径保存：改写后替换旧条目，总条目数有上限
+    import core.file_manager as file_manager_module
+
+    with h5py.File(legacy, "w") as f:
+        f.create_dataset("samples", data=samples * 2)
+        f.attrs["sample_rate"] = 1e3
+    assert fm.get_file_info(str(legacy))["power_stats"]["peak_power"] == pytest.approx(16.0)
+    assert len(fm._stats_cache) == 1
+    monkeypatch.setattr(file_manager_module, "STATS_CACHE_SIZE", 2)
+    for index in range(3):
+        extra = tmp_path / f"legacy{index}.h5"
+        with h5py.File(extra, "w") as f:
+            f.create_dataset("samples", data=samples)
+            f.attrs["sample_rate"] = 1e3
+        fm.get_file_info(str(extra))
+    assert len(fm._stats_cache) == 2
+
+
+def test_storage_profiles(tmp_path):
+    import sys
+    import pathlib
+    import numpy as np
+    import pytest
+    h5py = pytest.importorskip("h5py")
+
+    repo_root = str(pathlib.Path(__file__).resolve().parents[1])
+    if repo_root not in sys.path:
+        sys.path.insert(0, repo_root)
+
+    from core.file_manager import FileManager, SignalMetadata, get_storage_profile
+
+    assert get_storage_profile("gzip-7").compression_opts == 7
+    with pytest.raises(ValueError):
+        get_storage_profile("zstd-99")
+
+    samples = (np.arange(5000) * (1 + 1j)).astype(np.complex64)
+    meta = SignalMetadata(
+        sample_rate=1e6,
+        center_freq=100e6,
+        timestamp="now",
+        duration=len(samples) / 1e6,
+        samples_count=len(samples),
+    )
+
+    fm = FileManager()
+    fm.storage_profile = "none"
+    plain = tmp_path / "plain.h5"
+    assert fm.save_signal(samples, meta, str(plain)) is True
+    with h5py.File(plain, "r") as f:
+        assert f["samples"].chunks is None
+    mapped, _ = fm.load_signal(str(plain), mmap=True)
+    assert isinstance(mapped, np.memmap)
+
+    fm.storage_profile = "lzf"
+    packed = tmp_path / "packed.h5"
+    assert fm.save_signal(samples, meta, str(packed)) is True
+    with h5py.File(packed, "r") as f:
+        assert f["samples"].compression == "lzf"
+        assert f["samples"].shuffle
+    loaded, _ = fm.load_signal(str(packed))
+    np.testing.assert_array_equal(loaded, samples)
+
+
+def test_sc16_storage_roundtrip(tmp_path):
+    import sys
+    import pathlib
+    import numpy as np
+    import pytest
+    h5py = pytest.importorskip("h5py")
+
+    repo_root = str(pathlib.Path(__file__).resolve().parents[1])
+    if repo_root not in sys.path:
+        sys.path.insert(0, repo_root)
+
+    from core.file_manager import FileManager, SignalMetadata
+    from modules.converter import FormatConverter
+
+    rng = np.random.default_rng(1)
+    samples = (0.5 * (rng.standard_normal(3000) + 1j * rng.standard_normal(3000))).astype(np.complex64)
+    meta = SignalMetadata(
+        sample_rate=1e6,
+        center_freq=100e6,
+        timestamp="now",
+        duration=len(samples) / 1e6,
+        samples_count=len(samples),
+    )
+    fm = FileManager()
+
+    raw = tmp_path / "capture.sc16"
+    assert fm.save_signal(samples, meta, str(raw)) is True
+    assert raw.stat().st_size == len(samples) * 4
+    scale = fm.load_metadata(str(raw)).additional_metadata["scale"]
+
+    loaded, _ = fm.load_signal(str(raw))
+    assert loaded.dtype == np.complex64
+    np.testing.assert_allclose(loaded, samples, atol=scale)
+    np.testing.assert_array_equal(fm.read_range(str(raw), 100, 50), loaded[100:150])
+    np.testing.assert_array_equal(np.concatenate(list(fm.iter_chunks(str(raw), 700))), loaded)
+    assert fm.get_file_info(str(raw))["sample_dtype"] == "sc16"
+
+    packed = tmp_path / "capture.h5"
+    assert fm.save_signal(samples, meta, str(packed), sample_format="sc16") is True
+    with h5py.File(packed, "r") as f:
+        assert f["samples"].dtype == np.int16 and f["samples"].shape == (len(samples), 2)
+    np.testing.assert_array_equal(fm.load_signal(str(packed))[0], loaded)
+
+    with fm.open_writer(str(tmp_path / "stream.h5"), meta, sample_format="sc16", scale=scale) as writer:
+        writer.append(samples[:1000])
+        writer.append(samples[1000:])
+    streamed, streamed_meta = fm.load_signal(str(tmp_path / "stream.h5"))
+    assert streamed_meta.samples_count == len(samples)
+    np.testing.assert_array_equal(streamed, loaded)
+
+    converter = FormatConverter(fm)
+    assert converter.convert_format(str(packed), "sc16", str(tmp_path / "converted.sc16")) is True
+    # 流式转换使用缓存的峰值功率选取 scale，允许一次重新量化误差
+    np.testing.assert_allclose(fm.load_signal(str(tmp_path / "converted.sc16"))[0], loaded, atol=2 * scale)
+
+
+def test_sigmf_roundtrip(tmp_path):
+    import sys
+    import json
+    import pathlib
+    import numpy as np
+
+    repo_root = str(pathlib.Path(__file__).resolve().parents[1])
+    if repo_root not in sys.path:
+        sys.path.insert(0, repo_root)
+
+    from core.file_manager import FileManager, SignalMetadata
+
+    samples = (np.arange(2048) * (0.0004 - 0.0002j)).astype(np.complex64)
+    meta = SignalMetadata(
+        sample_rate=2e6,
+        center_freq=433.92e6,
+        timestamp="2024-05-01T12:00:00+00:00",
+        duration=len(samples) / 2e6,
+        samples_count=len(samples),
+        gain=31.5,
+    )
+    fm = FileManager()
+
+    data = tmp_path / "capture.sigmf-data"
+    assert fm.save_signal(samples, meta, str(data)) is True
+    sigmf = json.loads((tmp_path / "capture.sigmf-meta").read_text())
+    assert sigmf["global"]["core:datatype"] == "cf32_le"
+    assert sigmf["global"]["core:sample_rate"] == 2e6
+    assert sigmf["captures"][0]["core:frequency"] == 433.92e6
+    assert sigmf["captures"][0]["core:datetime"] == "2024-05-01T12:00:00.000000Z"
+
+    loaded, loaded_meta = fm.load_signal(str(tmp_path / "capture.sigmf-meta"), mmap=True)
+    assert isinstance(loaded, np.memmap)
+    np.testing.assert_array_equal(loaded, samples)
+    assert loaded_meta.gain == 31.5 and loaded_meta.center_freq == 433.92e6
+    np.testing.assert_array_equal(fm.read_range(str(data), 10, 5), samples[10:15])
+    assert fm.get_file_info(str(data))["power_stats"]["peak_power"] > 0
+
+    with fm.open_writer(str(tmp_path / "stream.sigmf-data"), meta, sample_format="sc16") as writer:
+        for block in np.array_split(samples, 4):
+            writer.append(block)
+    sigmf = json.loads((tmp_path / "stream.sigmf-meta").read_text())
+    assert sigmf["global"]["core:datatype"] == "ci16_le"
+    streamed, _ = fm.load_signal(str(tmp_path / "stream.sigmf-data"))
+    np.testing.assert_allclose(streamed, samples, atol=1.0 / 32767)
+
+
+def test_numpy_load_with_json_sidecar(tmp_path):
+    import sys
+    import pathlib
+    import numpy as np
+    import pytest
+
+    repo_root = str(pathlib.Path(__file__).resolve().parents[1])
+    if repo_root not in sys.path:
+        sys.path.insert(0, repo_root)
+
+    pytest.importorskip("h5py")
+    from core.file_manager import FileManager, SignalMetadata
+    from modules.converter import FormatConverter
+
+    samples = (np.arange(4096) * (0.001 + 0.0005j)).astype(np.complex64)
+    meta = SignalMetadata(
+        sample_rate=1e6,
+        center_freq=915e6,
+        timestamp="2024-05-01T12:00:00",
+        duration=len(samples) / 1e6,
+        samples_count=len(samples),
+        signal_type="QPSK",
+        gain=12.0,
+    )
+    fm = FileManager()
+
+    # FormatConverter 导出的 .npy + .json 可直接读回
+    h5_file = tmp_path / "input.h5"
+    assert fm.save_signal(samples, meta, str(h5_file)) is True
+    npy_file = tmp_path / "export.npy"
+    assert FormatConverter(fm).convert_format(str(h5_file), "npy", str(npy_file))
+
+    loaded, loaded_meta = fm.load_signal(str(npy_file), mmap=True)
+    assert isinstance(loaded, np.memmap)
+    np.testing.assert_array_equal(loaded, samples)
+    assert loaded_meta.sample_rate == 1e6 and loaded_meta.center_freq == 915e6
+    assert loaded_meta.signal_type == "QPSK" and loaded_meta.gain == 12.0
+    assert "conversion_time" in loaded_meta.additional_metadata
+    # 导出旁路与 save_signal 相同：含缓存统计与样本类型
+    assert loaded_meta.additional_metadata["sample_dtype"] == "complex64"
+    assert loaded_meta.additional_metadata["peak_power"] > 0
+
+    np.testing.assert_array_equal(fm.read_range(str(npy_file), 100, 10), samples[100:110])
+    blocks = list(fm.iter_chunks(str(npy_file), 1000))
+    assert [len(b) for b in blocks] == [1000] * 4 + [96]
+    assert fm.get_file_info(str(npy_file))["samples_count"] == len(samples)
+
+    # save_signal 写出 .npy 时缓存统计字段
+    saved = tmp_path / "saved.npy"
+    assert fm.save_signal(samples, meta, str(saved)) is True
+    assert np.load(saved).dtype == np.complex64
+    _, saved_meta = fm.load_signal(str(saved))
+    assert saved_meta.additional_metadata["peak_power"] > 0
+
+    # .npz 与 (N, 2) 实数 I/Q 数组
+    pairs = np.stack([samples.real, samples.imag], axis=1)
+    np.savez_compressed(tmp_path / "pairs.npz", samples=pairs)
+    loaded, loaded_meta = fm.load_signal(str(tmp_path / "pairs.npz"))
+    np.testing.assert_array_equal(loaded, samples)
+    assert loaded_meta.samples_count == len(samples)
+
+    # .npz 的样本数只读取成员头；分块读取复用同一次解压
+    from core.file_manager import _load_npz_samples
+
+    npz_file = str(tmp_path / "pairs.npz")
+    _load_npz_samples.cache_clear()
+    assert fm.get_sample_count(npz_file) == len(samples)
+    assert fm.load_metadata(npz_file).samples_count == len(samples)
+    assert _load_npz_samples.cache_info().misses == 0
+    blocks = list(fm.iter_chunks(npz_file, 1000))
+    np.testing.assert_array_equal(np.concatenate(blocks), samples)
+    for start in range(0, len(samples), 1000):
+        np.testing.assert_array_equal(fm.read_range(npz_file, start, 1000), samples[start : start + 1000])
+    assert _load_npz_samples.cache_info().misses == 1
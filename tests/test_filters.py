@@ -17,3 +17,41 @@ def test_rrc_taps_basic():
     # energy normalized
     energy = np.sum(taps**2)
     assert energy > 0
+
+
+def test_rrc_taps_cached_and_shared():
+    fd = FilterDesigner()
+    taps = fd.rrc_taps(32, 0.35, 8)
+    assert taps.size == 33
+    # 同一参数返回同一个只读数组，偶数抽头的 RRC 与修正版奇数抽头共用缓存
+    assert fd.rrc_taps(33, 0.35, 8) is taps
+    assert fd.corrected_rrc_taps(33, 0.35, 8) is taps
+    assert not taps.flags.writeable
+    np.testing.assert_allclose(taps, taps[::-1])
+
+    # 奇异点 t = ±1/(4*alpha) 落在采样格点上时仍为有限值，且与两侧连续
+    singular = fd.rrc_taps(65, 0.25, 8)
+    assert np.isfinite(singular).all()
+    np.testing.assert_allclose(singular, fd.rrc_taps(65, 0.25 + 1e-7, 8), atol=1e-6)
+
+    even = fd.corrected_rrc_taps(40, 0.35, 8)
+    assert even.size == 40
+    assert np.isclose(np.sum(even**2), 1.0)
+
+
+def test_rc_and_gaussian_taps():
+    import pytest
+
+    fd = FilterDesigner()
+    rc = fd.rc_taps(65, 0.35, 8)
+    # 升余弦满足奈奎斯特准则：符号间隔处为零
+    center = 32
+    assert np.allclose(rc[center % 8 :: 8][np.arange(rc[center % 8 :: 8].size) != center // 8], 0, atol=1e-12)
+    assert np.isfinite(fd.rc_taps(65, 0.25, 8)).all()
+
+    gaussian = fd.gaussian_taps(25, 0.3, 8)
+    assert np.isclose(gaussian.sum(), 1.0)
+    assert np.argmax(gaussian) == 12
+
+    with pytest.raises(ValueError):
+        fd.gaussian_taps(25, 0.0, 8)
@@ -0,0 +1,59 @@
+import sys
+import pathlib
+
+# ensure repo root on path
+repo_root = str(pathlib.Path(__file__).resolve().parents[1])
+if repo_root not in sys.path:
+    sys.path.insert(0, repo_root)
+
+import numpy as np
+import pytest
+import scipy.signal as ss
+from core.fir_filter import StreamingFIR, fir_filter, flush_stages, process_stages
+from core.resampler import StreamingResampler
+
+
+@pytest.mark.parametrize("method,num_taps", [("direct", 5), ("fft", 5), ("fft", 121), ("auto", 301)])
+@pytest.mark.parametrize("complex_taps", [False, True])
+def test_chunked_fir_matches_convolve(method, num_taps, complex_taps):
+    rng = np.random.default_rng(num_taps)
+    n = 20_011
+    x = (rng.standard_normal(n) + 1j * rng.standard_normal(n)).astype(np.complex64)
+    taps = rng.standard_normal(num_taps)
+    if complex_taps:
+        taps = taps + 1j * rng.standard_normal(num_taps)
+
+    fir = StreamingFIR(taps, method=method)
+    # 块边界任意（含长度 1 与空块），历史跨块延续
+    bounds = np.sort(rng.integers(0, n, size=30))
+    parts = [fir.process(block) for block in np.split(x, bounds)]
+    parts.append(fir.flush())
+    y = np.concatenate(parts)
+
+    expected = ss.convolve(x.astype(np.complex128), taps, mode="same")
+    assert y.dtype == np.complex64
+    assert y.size == n
+    np.testing.assert_allclose(y, expected, atol=1e-3 * np.abs(taps).sum())
+
+    full = fir_filter(x, taps, mode="full", method=method)
+    np.testing.assert_allclose(full, ss.convolve(x, taps), atol=1e-3 * np.abs(taps).sum())
+
+
+def test_fir_stages_before_resampler():
+    rng = np.random.default_rng(1)
+    x = (rng.standard_normal(10_000) + 1j * rng.standard_normal(10_000)).astype(np.complex64)
+    taps = ss.firwin(63, 0.2)
+
+    stages = [StreamingFIR(taps), StreamingResampler(1, 4)]
+    parts = [process_stages(stages, block) for block in np.array_split(x, 9)]
+    parts.append(flush_stages(stages))
+    y = np.concatenate(parts)
+
+    expected = StreamingResampler(1, 4)
+    reference = np.concatenate(list(expected.process_chunks([fir_filter(x, taps)])))
+    np.testing.assert_allclose(y, reference, atol=1e-5)
+
+    with pytest.raises(ValueError):
+        StreamingFIR([])
+    with pytest.raises(ValueError):
+        StreamingFIR([1.0], method="bogus")
@@ -0,0 +1,92 @@
+import sys
+import pathlib
+
+# ensure repo root on path
+repo_root = str(pathlib.Path(__file__).resolve().parents[1])
+if repo_root not in sys.path:
+    sys.path.insert(0, repo_root)
+
+import numpy as np
+import pytest
+from core.modulation import MAPPINGS, MODULATIONS, bits_to_symbols, constellation, map_bits
+
+
+def test_qpsk_gray_mapping_matches_legacy_table():
+    bits = np.array([0, 0, 0, 1, 1, 1, 1, 0])
+    expected = np.array([1 + 1j, -1 + 1j, -1 - 1j, 1 - 1j]) / np.sqrt(2)
+    np.testing.assert_allclose(map_bits(bits, "qpsk"), expected, atol=1e-7)
+    # 奇数长度末尾补 0
+    np.testing.assert_allclose(map_bits(np.array([1]), "qpsk"), [expected[3]], atol=1e-7)
+
+
+@pytest.mark.parametrize("modulation", list(MODULATIONS))
+@pytest.mark.parametrize("mapping", MAPPINGS)
+def test_constellations_unit_power_and_gray_neighbours(modulation, mapping):
+    lut = constellation(modulation, mapping)
+    assert not lut.flags.writeable
+    assert lut.size == 1 << MODULATIONS[modulation][0]
+    assert np.isclose(np.mean(np.abs(lut) ** 2), 1.0)
+    assert np.unique(np.round(lut, 9)).size == lut.size
+
+    if mapping == "gray":
+        distance = np.abs(lut[:, None] - lut[None, :])
+        np.fill_diagonal(distance, np.inf)
+        nearest = np.isclose(distance, distance.min())
+        for i, j in zip(*np.nonzero(nearest)):
+            assert bin(i ^ j).count("1") == 1
+
+    # 比特 -> 符号值 -> 星座点，与逐符号查表一致
+    rng = np.random.default_rng(0)
+    k = MODULATIONS[modulation][0]
+    bits = rng.integers(0, 2, 30 * k)
+    values = bits_to_symbols(bits, k)
+    expected_values = bits.reshape(-1, k) @ (1 << np.arange(k - 1, -1, -1))
+    np.testing.assert_array_equal(values, expected_values)
+    np.testing.assert_allclose(map_bits(bits, modulation, mapping), lut[expected_values], atol=1e-6)
+
+
+def test_generator_modulations_share_pulse_shaping():
+    from core.signal_processor import SignalProcessor
+    from modules.generator import SignalGenerator
+
+    generator = SignalGenerator(SignalProcessor())
+    params = {"symbol_rate": 250e3, "sample_rate": 2e6, "num_symbols": 200}
+    for method in ("generate_bpsk", "generate_qpsk", "generate_8psk", "generate_16qam", "generate_64qam"):
+        samples = getattr(generator, method)(params)
+        assert samples.size == 200 * 8
+        assert np.isfinite(samples).all()
+
+    with pytest.raises(ValueError):
+        generator.generate_modulated({"modulation": "ook"})
+    with pytest.raises(ValueError):
+        map_bits(np.zeros(4), "qpsk", mapping="binary")
+
+
+def test_polyphase_pulse_shaping_matches_same_convolution():
+    import scipy.signal as ss
+    from core.signal_processor import SignalProcessor
+    from modules.generator import SignalGenerator
+
+    generator = SignalGenerator(SignalProcessor())
+    rng = np.random.default_rng(3)
+    symbols = map_bits(rng.integers(0, 2, 2 * 501), "qpsk")
+    for sps in (8, 13):
+        taps = generator.filter_designer.rrc_taps(6 * sps + 1, 0.35, sps)
+        upsampled = np.zeros(symbols.size * sps, dtype=complex)
+        upsampled[::sps] = symbols
+        expected = ss.convolve(upsampled, taps, mode="same")
+
+        np.testing.assert_allclose(generator._pulse_shape(symbols, sps, 0.35, 6), expected, atol=1e-5)
+        shaper = generator.pulse_shaper(sps, 0.35, 6)
+        parts = [shaper.process(block) for block in np.array_split(symbols, 11)]
+        parts.append(shaper.flush())
+        np.testing.assert_allclose(np.concatenate(parts), expected, atol=1e-5)
+
+    # 分块生成：长度与 generate_modulated 一致，峰值不超过 0.7
+    params = {"symbol_rate": 250e3, "sample_rate": 2e6, "duration": 0.0123}
+    chunks = list(generator.iter_modulated(params, "64qam", chunk_symbols=300))
+    waveform = np.concatenate(chunks)
+    assert max(chunk.size for chunk in chunks) <= 300 * 8 + 64
+    assert waveform.size == generator.generate_modulated(params, "64qam").size
+    assert waveform.dtype == np.complex64
+    assert 0 < np.abs(waveform).max() <= 0.7 + 1e-6
@@ -0,0 +1,71 @@
+import sys
+import pathlib
+
+# ensure repo root on path
+repo_root = str(pathlib.Path(__file__).resolve().parents[1])
+if repo_root not in sys.path:
+    sys.path.insert(0, repo_root)
+
+import numpy as np
+import pytest
+from core.prbs import PRBS_POLYNOMIALS, PRBSGenerator, prbs_bits, prbs_period
+
+
+def _reference_lfsr(order, length, seed=None):
+    n, m = PRBS_POLYNOMIALS[order]
+    mask = (1 << n) - 1
+    state = mask if seed is None else seed
+    out = np.empty(length, dtype=np.uint8)
+    for i in range(length):
+        new = ((state >> (n - 1)) ^ (state >> (m - 1))) & 1
+        state = ((state << 1) | new) & mask
+        out[i] = new
+    return out
+
+
+@pytest.mark.parametrize("order", list(PRBS_POLYNOMIALS))
+def test_prbs_matches_bitwise_lfsr(order):
+    expected = _reference_lfsr(order, 4000, seed=0x5A)
+    np.testing.assert_array_equal(prbs_bits(order, 4000, seed=0x5A), expected)
+    # 相位偏移直接跳转
+    np.testing.assert_array_equal(prbs_bits(f"prbs{order}", 1500, seed=0x5A, offset=2500), expected[2500:])
+
+    # 分块输出连续
+    generator = PRBSGenerator(order, seed=0x5A)
+    parts = [generator.next(count) for count in (1, 6, 0, 993, 3000)]
+    np.testing.assert_array_equal(np.concatenate(parts), expected)
+
+
+@pytest.mark.parametrize("order", [7, 9, 15])
+def test_prbs_period_and_balance(order):
+    period = prbs_period(order)
+    bits = prbs_bits(order, 2 * period + 10)
+    np.testing.assert_array_equal(bits[:period + 10], bits[period:])
+    assert bits[:period].sum() == (period + 1) // 2
+    # 偏移按周期取模
+    np.testing.assert_array_equal(prbs_bits(order, 50, offset=period + 3), bits[3:53])
+
+    with pytest.raises(ValueError):
+        PRBSGenerator(order, seed=0)
+    with pytest.raises(ValueError):
+        PRBSGenerator(11)
+
+
+def test_generator_prbs_payload_is_reproducible():
+    from core.modulation import map_bits
+    from core.signal_processor import SignalProcessor
+    from modules.generator import SignalGenerator
+
+    generator = SignalGenerator(SignalProcessor())
+    np.testing.assert_array_equal(generator.generate_prbs(1000, order=23), prbs_bits(23, 1000))
+
+    params = {"symbol_rate": 250e3, "sample_rate": 2e6, "num_symbols": 400, "prbs": 9, "prbs_offset": 17}
+    first = generator.generate_modulated(params, "16qam")
+    np.testing.assert_array_equal(first, generator.generate_modulated(params, "16qam"))
+    chunked = np.concatenate(list(generator.iter_modulated(params, "16qam", chunk_symbols=64)))
+    assert chunked.size == first.size
+
+    # 符号由 PRBS 比特直接映射
+    symbols = map_bits(prbs_bits(9, 400 * 4, offset=17), "16qam")
+    shaped = generator._pulse_shape(symbols, 8, 0.35, 6)
+    np.testing.assert_allclose(first, generator.processor.normalize_signal(shaped), atol=1e-6)
@@ -0,0 +1,73 @@
+import sys
+import pathlib
+
+# ensure repo root on path
+repo_root = str(pathlib.Path(__file__).resolve().parents[1])
+if repo_root not in sys.path:
+    sys.path.insert(0, repo_root)
+
+import numpy as np
+import pytest
+pytest.importorskip("h5py")
+from core.file_manager import FileManager
+from core.signal_processor import SignalProcessor
+from modules.recorder import SignalRecorder
+from tests.mock_usrp_controller import MockUSRPController
+
+
+def test_power_detection_recording_writes_once(tmp_path):
+    fm = FileManager()
+    fm.base_dir = tmp_path
+    recorder = SignalRecorder(MockUSRPController(), fm, SignalProcessor())
+
+    completions = []
+    ok = recorder.record_with_power_detection(
+        {"freq": 10e6, "rate": 1e6, "gain": 10, "duration": 0.01, "filename": "capture.h5"},
+        stream_callbacks={"on_complete": lambda success, payload: completions.append((success, payload))},
+    )
+
+    assert ok is True
+    success, payload = completions[0]
+    assert success is True
+    assert payload["validation_passed"] is True
+    assert payload["samples_count"] == 10000
+    assert payload["stats"]["count"] == 10000
+
+    samples, meta = fm.load_signal(str(tmp_path / "capture.h5"))
+    assert samples.size == 10000
+    assert meta.samples_count == 10000
+    assert meta.additional_metadata["recording_mode"] == "power_detection"
+    assert meta.additional_metadata["average_power"] == pytest.approx(payload["stats"]["average_power"])
+    assert "dc_offset" in meta.additional_metadata
+    assert list(tmp_path.glob("*.tmp")) == []
+
+
+def test_high_speed_recording_resamples_inline(tmp_path):
+    fm = FileManager()
+    fm.base_dir = tmp_path
+    recorder = SignalRecorder(MockUSRPController(), fm, SignalProcessor())
+
+    completions = []
+    ok = recorder.record_high_speed(
+        {
+            "freq": 10e6,
+            "rate": 1e6,
+            "gain": 10,
+            "duration": 0.05,
+            "filename": "channel.h5",
+            "output_rate": 200e3,
+            "frequency_shift": -100e3,
+        },
+        stream_callbacks={"on_complete": lambda success, payload: completions.append((success, payload))},
+    )
+
+    assert ok is True
+    success, payload = completions[0]
+    assert success is True and payload["validation_passed"] is True
+    assert payload["samples_count"] == 10000
+
+    samples, meta = fm.load_signal(str(tmp_path / "channel.h5"))
+    assert samples.size == 10000
+    assert meta.sample_rate == 200e3
+    assert meta.center_freq == pytest.approx(10.1e6)
+    assert meta.additional_metadata["source_sample_rate"] == 1e6
@@ -0,0 +1,105 @@
+import sys
+import pathlib
+
+# ensure repo root on path
+repo_root = str(pathlib.Path(__file__).resolve().parents[1])
+if repo_root not in sys.path:
+    sys.path.insert(0, repo_root)
+
+import numpy as np
+import pytest
+import scipy.signal as ss
+from core.resampler import StreamingResampler, rate_ratio, resampler_taps
+
+
+@pytest.mark.parametrize("up,down", [(1, 50), (1, 2), (4, 1), (3, 7), (5, 2), (160, 147)])
+def test_chunked_resampling_matches_resample_poly(up, down):
+    rng = np.random.default_rng(up * 1000 + down)
+    fs = 1e6
+    n = 50_003
+    x = (rng.standard_normal(n) + 1j * rng.standard_normal(n)).astype(np.complex64)
+
+    resampler = StreamingResampler(up, down, input_rate=fs, shift_hz=12_345.0)
+    # 块边界任意（含长度 1 与空块），状态跨块延续
+    bounds = np.sort(rng.integers(0, n, size=40))
+    parts = [resampler.process(block) for block in np.split(x, bounds)]
+    parts.append(resampler.flush())
+    y = np.concatenate(parts)
+
+    mixed = x * np.exp(2j * np.pi * 12_345.0 * np.arange(n) / fs)
+    expected = ss.resample_poly(mixed, up, down, window=resampler_taps(up, down) / up)
+    assert y.dtype == np.complex64
+    assert y.size == expected.size == resampler.output_length(n)
+    np.testing.assert_allclose(y, expected, atol=1e-5)
+    assert resampler_taps(up, down) is resampler_taps(up, down)
+
+
+def test_nco_shift_selects_channel():
+    from core.signal_processor import SignalProcessor
+
+    fs = 2e6
+    n = 400_000
+    t = np.arange(n) / fs
+    # 目标信道在 +300 kHz，干扰在 -600 kHz（抽取后应被滤除）
+    x = (np.exp(2j * np.pi * 300e3 * t) + np.exp(-2j * np.pi * 600e3 * t)).astype(np.complex64)
+
+    assert rate_ratio(fs, 100e3) == (1, 20)
+    resampler = StreamingResampler.from_rates(fs, 100e3, shift_hz=-300e3)
+    assert resampler.output_rate == 100e3
+    y = np.concatenate(list(resampler.process_chunks(np.array_split(x, 7))))
+    steady = y[200:-200]
+    np.testing.assert_allclose(np.abs(steady), 1.0, atol=1e-2)
+    # 频移后为直流：相邻样本相位不变
+    assert np.max(np.abs(np.angle(steady[1:] * np.conj(steady[:-1])))) < 1e-2
+
+    whole = SignalProcessor().resample(x, fs, 100e3, shift_hz=-300e3)
+    np.testing.assert_allclose(whole, y, atol=1e-5)
+
+    with pytest.raises(ValueError):
+        StreamingResampler(1, 2, shift_hz=1e3)
+
+
+def test_converter_resamples_to_output_rate(tmp_path):
+    from core.file_manager import FileManager, SignalMetadata
+    from modules.converter import FormatConverter
+
+    fs = 1e6
+    n = 100_000
+    x = np.exp(2j * np.pi * 50e3 * np.arange(n) / fs).astype(np.complex64)
+    fm = FileManager()
+    src = tmp_path / "wide.npy"
+    meta = SignalMetadata(
+        sample_rate=fs, center_freq=10e6, timestamp="2024-01-01T00:00:00", duration=n / fs, samples_count=n
+    )
+    assert fm.save_signal(x, meta, str(src))
+
+    converter = FormatConverter(fm, chunk_samples=8192)
+    converter.output_rate = 200e3
+    converter.frequency_shift = -50e3
+    out = tmp_path / "narrow.npy"
+    assert converter.convert_format(str(src), "npy", str(out))
+
+    samples, out_meta = fm.load_signal(str(out))
+    assert out_meta.sample_rate == 200e3
+    assert out_meta.center_freq == pytest.approx(10e6 + 50e3)
+    assert samples.size == 20_000
+    np.testing.assert_allclose(np.abs(samples[100:-100]), 1.0, atol=1e-2)
+
+    # 没有可用采样率的文件：与其他失败一样返回 False 而不是抛出
+    unknown = tmp_path / "unknown.npy"
+    assert fm.save_signal(x[:1000], SignalMetadata(0.0, 0.0, "now", 0.0, 1000), str(unknown))
+    assert converter.convert_format(str(unknown), "npy", str(tmp_path / "unknown_out.npy")) is False
+
+
+@pytest.mark.parametrize("up,down,taps", [(4, 7, [1.0]), (2, 3, [1.0]), (3, 11, [1.0, 2.0, 1.0]), (7, 2, [1.0])])
+def test_chunked_resampling_with_short_custom_taps(up, down, taps):
+    rng = np.random.default_rng(up * 100 + down)
+    x = rng.standard_normal(500).astype(np.complex64)
+    expected = ss.resample_poly(x, up, down, window=np.asarray(taps) / up)
+    for chunk in (1, 37, 499):
+        resampler = StreamingResampler(up, down, taps=taps)
+        parts = [resampler.process(block) for block in np.split(x, range(chunk, x.size, chunk))]
+        parts.append(resampler.flush())
+        y = np.concatenate(parts)
+        assert y.size == expected.size == resampler.output_length(x.size)
+        np.testing.assert_allclose(y, expected, atol=1e-5)
@@ -0,0 +1,72 @@
+import sys
+import pathlib
+
+# ensure repo root on path
+repo_root = str(pathlib.Path(__file__).resolve().parents[1])
+if repo_root not in sys.path:
+    sys.path.insert(0, repo_root)
+
+import numpy as np
+import pytest
+from core.running_stats import RunningStats, merge_stats
+
+
+def _reference(samples):
+    power = np.abs(samples.astype(np.complex128)) ** 2
+    return {
+        "average_power": power.mean(),
+        "peak_power": power.max(),
+        "i_std": samples.real.astype(np.float64).std(),
+        "q_std": samples.imag.astype(np.float64).std(),
+        "dc_offset": abs(samples.astype(np.complex128).mean()),
+    }
+
+
+def test_chunked_and_merged_stats_match_numpy():
+    rng = np.random.default_rng(5)
+    n = 300_000
+    samples = (0.2 - 0.1j + 0.5 * rng.standard_normal(n) + 0.25j * rng.standard_normal(n)).astype(np.complex64)
+    expected = _reference(samples)
+
+    chunked = RunningStats.from_samples(samples, chunk=7_777)
+    merged = merge_stats(RunningStats.from_samples(part) for part in np.array_split(samples, 5))
+    for stats in (chunked, merged):
+        values = stats.as_dict()
+        assert values["count"] == n
+        for key, value in expected.items():
+            assert values[key] == pytest.approx(value, rel=1e-5), key
+
+    # 对数分桶草图：相对误差不超过约 1.6%
+    power = np.abs(samples.astype(np.complex128)) ** 2
+    for q in (50, 90, 99):
+        assert chunked.power_percentile(q) == pytest.approx(np.percentile(power, q), rel=0.03)
+
+    empty = RunningStats().as_dict()
+    assert empty["count"] == 0 and np.isnan(empty["average_power"])
+
+
+def test_stats_persisted_in_file_header(tmp_path):
+    pytest.importorskip("h5py")
+    from core.file_manager import FileManager, SignalMetadata
+    from core.signal_processor import SignalProcessor
+
+    samples = (0.1 + 0.05j + np.exp(1j * np.linspace(0, 50, 20_000)) * 0.5).astype(np.complex64)
+    meta = SignalMetadata(
+        sample_rate=1e6,
+        center_freq=1e6,
+        timestamp="2024-01-01T00:00:00",
+        duration=len(samples) / 1e6,
+        samples_count=len(samples),
+    )
+    fm = FileManager()
+    expected = _reference(samples)
+    for name in ("cached.h5", "cached.bin"):
+        assert fm.save_signal(samples, meta, str(tmp_path / name)) is True
+        power_stats = fm.get_file_info(str(tmp_path / name))["power_stats"]
+        assert power_stats["dc_offset"] == pytest.approx(expected["dc_offset"], rel=1e-4)
+        assert power_stats["i_std"] == pytest.approx(expected["i_std"], rel=1e-4)
+        assert "power_p99" in power_stats
+
+    stats = fm.compute_stats(str(tmp_path / "cached.bin"))
+    power = SignalProcessor().detect_signal_power(samples, stats=stats)
+    assert power["average_power"] == pytest.approx(expected["average_power"], rel=1e-5)
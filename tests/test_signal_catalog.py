@@ -0,0 +1,87 @@
+def test_catalog_incremental_rescan_and_query(tmp_path):
+    import os
+    import sys
+    import pathlib
+    import numpy as np
+
+    repo_root = str(pathlib.Path(__file__).resolve().parents[1])
+    if repo_root not in sys.path:
+        sys.path.insert(0, repo_root)
+
+    from core.file_manager import FileManager, SignalMetadata
+    from utils.signal_catalog import SignalCatalog
+
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    fm = FileManager()
+    samples = np.ones(64, dtype=np.complex64)
+
+    def save(name, freq, timestamp):
+        meta = SignalMetadata(
+            sample_rate=1e6,
+            center_freq=freq,
+            timestamp=timestamp,
+            duration=len(samples) / 1e6,
+            samples_count=len(samples),
+            signal_type="QPSK",
+        )
+        assert fm.save_signal(samples, meta, str(data_dir / name)) is True
+
+    save("a.bin", 100e6, "2024-01-01T00:00:00")
+    save("b.bin", 433e6, "2024-06-01T00:00:00")
+    (data_dir / "nested").mkdir()
+    save("nested/c.bin", 915e6, "2024-09-01T00:00:00")
+
+    catalog = SignalCatalog(str(tmp_path / "catalog.db"), fm)
+    counts = catalog.rescan(data_dir, [".bin"])
+    assert counts["added"] == 3
+
+    counts = catalog.rescan(data_dir, [".bin"])
+    assert counts["added"] == 0 and counts["removed"] == 0
+    assert counts["unchanged"] == 3
+
+    # 原地改写文件（目录 mtime 不变）也会被重新索引
+    dir_mtime = os.stat(data_dir).st_mtime_ns
+    with open(data_dir / "a.bin", "ab") as handle:
+        handle.write(np.ones(16, dtype=np.complex64).tobytes())
+    assert os.stat(data_dir).st_mtime_ns == dir_mtime
+    counts = catalog.rescan(data_dir, [".bin"])
+    assert counts["updated"] == 1 and counts["unchanged"] == 2
+    assert catalog.query(min_freq=90e6, max_freq=110e6)["items"][0]["samples_count"] == 80
+
+    result = catalog.query(min_freq=400e6, max_freq=1e9)
+    assert result["total"] == 2
+    assert [item["name"] for item in result["items"]] == ["c.bin", "b.bin"]
+
+    result = catalog.query(end_time="2024-03-01T00:00:00", limit=1)
+    assert result["total"] == 1 and result["items"][0]["name"] == "a.bin"
+
+    os.remove(data_dir / "b.bin")
+    os.remove(data_dir / "b.txt")
+    counts = catalog.rescan(data_dir, [".bin"])
+    assert counts["removed"] == 1
+    assert catalog.query()["total"] == 2
+    assert [info["filename"] for info in catalog.list_file_infos(data_dir)] == [str(data_dir / "a.bin")]
+    catalog.close()
+
+    # 旧版索引的 directories 表带 mtime_ns NOT NULL 列：重新打开时迁移，目录树保留
+    import sqlite3
+
+    conn = sqlite3.connect(str(tmp_path / "catalog.db"))
+    conn.executescript(
+        """
+        DROP TABLE directories;
+        CREATE TABLE directories (path TEXT PRIMARY KEY, parent TEXT, mtime_ns INTEGER NOT NULL);
+        """
+    )
+    conn.execute("INSERT INTO directories VALUES (?, ?, 0)", (str(data_dir / "nested"), str(data_dir)))
+    conn.commit()
+    conn.close()
+    catalog = SignalCatalog(str(tmp_path / "catalog.db"), fm)
+    os.remove(data_dir / "nested" / "c.bin")
+    os.remove(data_dir / "nested" / "c.txt")
+    os.rmdir(data_dir / "nested")
+    counts = catalog.rescan(data_dir, [".bin"])
+    assert counts["removed"] == 1
+    assert catalog.query()["total"] == 1
+    catalog.close()
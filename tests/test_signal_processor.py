@@ -43,3 +43,191 @@ def test_bandpass_sample_rate():
     # center freq 10 MHz, signal BW 20 kHz
     fs = sp.calculate_bandpass_sample_rate(10e6, 20e3)
     assert fs > 0
+
+
+def test_sample_dtype_policy():
+    from core.dtypes import as_samples, get_sample_dtype, set_sample_dtype
+
+    sp = SignalProcessor()
+    sig = np.exp(1j * np.linspace(0, 20, 4096))  # complex128 input
+
+    assert get_sample_dtype() == np.complex64
+    assert sp.normalize_signal(sig).dtype == np.complex64
+    freq_axis, power = sp.calculate_spectrum(sig.astype(np.complex64), 8000.0)
+    assert power.dtype == np.float64
+
+    try:
+        set_sample_dtype("complex128")
+        assert as_samples(sig.astype(np.complex64)).dtype == np.complex128
+    finally:
+        set_sample_dtype("complex64")
+
+
+def test_welch_psd_matches_scipy_and_averaging_modes():
+    import pytest
+    import scipy.signal as ss
+    from core.signal_processor import ProcessingConfig
+
+    rng = np.random.default_rng(1)
+    fs = 1e6
+    n = 200_000
+    tone = np.exp(2j * np.pi * 125e3 * np.arange(n) / fs)
+    sig = (tone + 0.5 * (rng.standard_normal(n) + 1j * rng.standard_normal(n))).astype(np.complex64)
+
+    sp = SignalProcessor(ProcessingConfig(fft_size=1024, psd_max_segments=0))
+    freq_axis, psd = sp.calculate_psd(sig, fs)
+    ref_f, ref_psd = ss.welch(sig, fs=fs, nperseg=1024, return_onesided=False, detrend=False)
+    np.testing.assert_allclose(freq_axis, np.fft.fftshift(ref_f))
+    np.testing.assert_allclose(psd, np.fft.fftshift(ref_psd), rtol=1e-4)
+    assert abs(freq_axis[np.argmax(psd)] - 125e3) < fs / 1024
+
+    # 平均后方差显著低于单帧周期图
+    noise_bins = np.abs(freq_axis) < 100e3
+    _, single = sp.calculate_spectrum(sig, fs)
+    assert np.std(10 * np.log10(psd[noise_bins])) < 0.25 * np.std(10 * np.log10(single[noise_bins]))
+
+    _, median = sp.calculate_psd(sig, fs, average="median")
+    _, peak_hold = sp.calculate_psd(sig, fs, average="max")
+    assert np.median(median[noise_bins]) == pytest.approx(np.median(psd[noise_bins]), rel=0.1)
+    assert np.all(peak_hold >= psd)
+
+    # 分段数上限：均匀抽取分段，频率分辨率不变
+    capped = SignalProcessor(ProcessingConfig(fft_size=1024, psd_max_segments=16))
+    freq_axis, psd = capped.calculate_psd(sig, fs, overlap=0.75, window="blackman")
+    assert len(psd) == 1024 and abs(freq_axis[np.argmax(psd)] - 125e3) < fs / 1024
+
+    with pytest.raises(ValueError):
+        sp.calculate_psd(sig, fs, average="mode")
+
+
+def test_spectral_cache_reuses_windows_and_axes():
+    import pytest
+    from core import spectral_cache
+
+    spectral_cache.clear_cache()
+    sp = SignalProcessor()
+    sig = np.exp(1j * np.linspace(0, 200, 4096)).astype(np.complex64)
+
+    for _ in range(5):
+        freq_axis, _ = sp.calculate_spectrum(sig, 8000.0)
+    info = spectral_cache.cache_info()
+    assert info["misses"] == 1 and info["hits"] == 4
+
+    params = spectral_cache.spectral_params(4096, "hann", 8000.0)
+    assert params.freq_axis is freq_axis
+    np.testing.assert_allclose(params.window, np.hanning(4096), atol=1e-6)
+    assert params.window.dtype == np.float32
+    with pytest.raises(ValueError):
+        params.window[0] = 1.0
+
+    # FFTWindow 枚举与字符串共用同一条目；容量按 LRU 淘汰
+    from utils.config_manager import FFTWindow
+
+    assert spectral_cache.get_window(64, FFTWindow.RECTANGULAR) is spectral_cache.get_window(64, "rectangular")
+    spectral_cache.set_cache_size(2)
+    for n in (8, 16, 32):
+        spectral_cache.get_window(n)
+    assert spectral_cache.cache_info()["size"] == 2
+    spectral_cache.set_cache_size(spectral_cache.DEFAULT_CACHE_SIZE)
+    spectral_cache.clear_cache()
+
+
+def test_fft_workers_and_batched_segments():
+    import os
+    import pytest
+    from core import fft_engine
+    from core.signal_processor import ProcessingConfig
+
+    previous = fft_engine.get_fft_workers()
+    try:
+        fft_engine.set_fft_workers(0)
+        assert fft_engine.get_fft_workers() == (os.cpu_count() or 1)
+        fft_engine.set_fft_workers(2)
+        assert fft_engine.resolve_workers() == 2 and fft_engine.resolve_workers(3) == 3
+
+        rng = np.random.default_rng(2)
+        frames = (rng.standard_normal((16, 256)) + 1j * rng.standard_normal((16, 256))).astype(np.complex64)
+        window = np.hanning(256).astype(np.float32)
+        spectra = fft_engine.fft_segments(frames, window, shift=True)
+        expected = np.fft.fftshift(np.fft.fft(frames * window, axis=-1), axes=-1)
+        np.testing.assert_allclose(spectra, expected, rtol=1e-4, atol=1e-4)
+        with pytest.raises(ValueError):
+            fft_engine.fft_segments(frames[0])
+
+        # 显式线程数与全局设置结果一致
+        sig = frames.ravel()
+        _, psd_global = SignalProcessor(ProcessingConfig(fft_size=256)).calculate_psd(sig, 1e6)
+        _, psd_single = SignalProcessor(ProcessingConfig(fft_size=256, fft_workers=1)).calculate_psd(sig, 1e6)
+        np.testing.assert_allclose(psd_global, psd_single)
+    finally:
+        fft_engine.set_fft_workers(previous)
+
+
+def test_calculate_spectra_batch_matches_single_frames():
+    from core.signal_processor import ProcessingConfig
+
+    rng = np.random.default_rng(3)
+    fs = 1e6
+    batch = (rng.standard_normal((8, 512)) + 1j * rng.standard_normal((8, 512))).astype(np.complex64)
+    sp = SignalProcessor(ProcessingConfig(fft_size=4096))
+
+    freq_axis, spectra = sp.calculate_spectra(batch, fs, fft_size=256)
+    assert spectra.shape == (8, 256) and len(freq_axis) == 256
+    assert sp.config.fft_size == 4096  # 不修改共享配置
+
+    single = SignalProcessor(ProcessingConfig(fft_size=256))
+    for row, spectrum in zip(batch, spectra):
+        ref_axis, ref_power = single.calculate_spectrum(row, fs)
+        np.testing.assert_allclose(freq_axis, ref_axis)
+        np.testing.assert_allclose(spectrum, 10 * np.log10(np.maximum(ref_power, 1e-12)), atol=1e-3)
+
+    # 行长度不足 fft_size 时补零；一维输入视为单行
+    freq_axis, padded = sp.calculate_spectra(batch[:, :100], fs, fft_size=256)
+    assert padded.shape == (8, 256)
+    _, one = sp.calculate_spectra(batch[0], fs, fft_size=256)
+    assert one.shape == (1, 256)
+
+
+def test_single_precision_mode_keeps_float32():
+    import pytest
+    from core.signal_processor import ProcessingConfig
+
+    rng = np.random.default_rng(4)
+    fs = 1e6
+    sig = np.exp(2j * np.pi * 100e3 * np.arange(8192) / fs) + 0.1 * (
+        rng.standard_normal(8192) + 1j * rng.standard_normal(8192)
+    )  # complex128 输入
+
+    double = SignalProcessor(ProcessingConfig(fft_size=1024))
+    single = SignalProcessor(ProcessingConfig(fft_size=1024, precision="single"))
+
+    _, ref = double.calculate_spectrum(sig, fs)
+    freq_axis, power = single.calculate_spectrum(sig, fs)
+    assert ref.dtype == np.float64 and power.dtype == np.float32
+    np.testing.assert_allclose(power, ref, rtol=1e-3, atol=1e-9)
+
+    _, psd = single.calculate_psd(sig, fs)
+    _, spectra = single.calculate_spectra(sig.reshape(8, 1024), fs)
+    assert psd.dtype == np.float32 and spectra.dtype == np.float32
+    assert abs(freq_axis[np.argmax(psd)] - 100e3) < fs / 1024
+
+    with pytest.raises(ValueError):
+        SignalProcessor(ProcessingConfig(precision="half")).calculate_spectrum(sig, fs)
+
+
+def test_visualization_precision_config(tmp_path):
+    from utils.config_manager import AdvancedConfigManager, VisualizationConfig
+    from utils.visualizer import StreamingSignalVisualizer
+
+    manager = AdvancedConfigManager(str(tmp_path))
+    assert manager.validate_config("visualization", {"precision": "half"})
+    assert not manager.validate_config("visualization", {"precision": "single"})
+
+    viz = StreamingSignalVisualizer()
+    sig = np.exp(1j * np.linspace(0, 400, 4096))
+    single = viz.create_streaming_data(sig, 1e6, 0.0, fft_size=1024, config=VisualizationConfig(precision="single"))
+    double = viz.create_streaming_data(sig, 1e6, 0.0, fft_size=1024, config=VisualizationConfig())
+    np.testing.assert_allclose(
+        single["frequency_domain"]["power"], double["frequency_domain"]["power"], atol=1e-2
+    )
+    assert viz.processor.config.precision == "double"
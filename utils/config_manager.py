@@ -50,6 +50,10 @@ class PerformanceConfig:
     thread_pool_size: int = 10
     memory_limit_mb: int = 1024
     enable_caching: bool = True
+    # IQ 样本精度策略：complex64（默认）或 complex128，见 core.dtypes
+    sample_dtype: str = "complex64"
+    # FFT 线程数（scipy.fft workers），0 表示使用全部 CPU 核心，见 core.fft_engine
+    fft_workers: int = 0
 
 
 @dataclass
@@ -85,17 +89,23 @@ class VisualizationConfig:
     eye_diagram_window_symbols: float = 2.0
     eye_diagram_max_traces: int = 60
     eye_diagram_component: str = "iq"
+    # 频谱显示计算精度：double 或 single（float32/complex64，内存带宽减半），见 core.dtypes
+    precision: str = "double"
 
 
 @dataclass
 class FileManagerConfig:
     data_directory: str = "./data"
     allowed_extensions: List[str] = field(
-        default_factory=lambda: ['.h5', '.bin', '.dat', '.complex', '.raw', '.wav', '.csv', '.npy']
+        default_factory=lambda: ['.h5', '.bin', '.dat', '.complex', '.raw', '.sc16', '.sigmf-data', '.wav', '.csv', '.npy', '.npz']
     )
     max_file_size: int = 1024 * 1024 * 1024
     auto_cleanup: bool = True
     cleanup_age_days: int = 30
+    # HDF5 存储配置：none / lzf / gzip-N / blosc-lz4（需 hdf5plugin）
+    hdf5_storage_profile: str = "gzip-4"
+    # .h5 样本格式：fc32（complex64）或 sc16（int16 I/Q，体积减半）
+    hdf5_sample_format: str = "fc32"
 
 
 @dataclass
@@ -166,8 +176,12 @@ class AdvancedConfigManager:
                 'default_fft_size': {'min': 64, 'max': 65536, 'type': int},
                 'overlap_ratio': {'min': 0.0, 'max': 0.9, 'type': float},
             },
+            'visualization': {
+                'precision': {'choices': ('double', 'single'), 'type': str},
+            },
             'performance': {
                 'max_workers': {'min': 1, 'max': 32, 'type': int},
+                'fft_workers': {'min': 0, 'max': 256, 'type': int},
                 'memory_limit_mb': {'min': 128, 'max': 32768, 'type': int}
             }
         }
@@ -222,7 +236,9 @@ class AdvancedConfigManager:
 
                     config_data[key] = value
 
-                    if 'min' in rules and value < rules['min']:
+                    if 'choices' in rules and value not in rules['choices']:
+                        errors.append(f"{key} must be one of {', '.join(rules['choices'])}")
+                    elif 'min' in rules and value < rules['min']:
                         errors.append(f"{key} must be >= {rules['min']}")
                     elif 'max' in rules and value > rules['max']:
                         errors.append(f"{key} must be <= {rules['max']}")
@@ -242,6 +258,8 @@ class AdvancedConfigManager:
                     user_data = json.load(f)
                     self._load_section_configs(user_data)
 
+            self.apply_sample_dtype()
+            self.apply_fft_workers()
             logger.info("All configurations loaded successfully")
 
         except Exception as e:
@@ -267,6 +285,24 @@ class AdvancedConfigManager:
                 except Exception as e:
                     logger.warning(f"Failed to load {section} config: {e}")
 
+    def apply_sample_dtype(self):
+        """将 performance.sample_dtype 应用为全局样本类型策略"""
+        from core.dtypes import set_sample_dtype
+
+        try:
+            set_sample_dtype(self.performance.sample_dtype)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Invalid sample_dtype {self.performance.sample_dtype!r}, keeping default: {e}")
+
+    def apply_fft_workers(self):
+        """将 performance.fft_workers 应用为全局 FFT 线程数"""
+        from core.fft_engine import set_fft_workers
+
+        try:
+            set_fft_workers(self.performance.fft_workers)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Invalid fft_workers {self.performance.fft_workers!r}, keeping current: {e}")
+
     def save_all_configs(self):
         try:
             # 保存系统配置
@@ -306,6 +342,9 @@ class AdvancedConfigManager:
 
                 config_class = type(config_obj)
                 setattr(self, section, config_class(**current_dict))
+                if section == 'performance':
+                    self.apply_sample_dtype()
+                    self.apply_fft_workers()
 
                 if self.system.auto_save_config:
                     self.save_all_configs()
@@ -354,6 +393,8 @@ class AdvancedConfigManager:
             self.ui = UISettings()
         if section == 'performance' or section is None:
             self.performance = PerformanceConfig()
+            self.apply_sample_dtype()
+            self.apply_fft_workers()
         if section == 'database' or section is None:
             self.database = DatabaseConfig()
         if section == 'security' or section is None:
@@ -1,4 +1,5 @@
 import logging
+import sqlite3
 import time
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
@@ -7,6 +8,7 @@ import numpy as np
 
 from core.file_manager import FileManager as CoreFileManager, SignalMetadata
 from utils.config_manager import get_config_manager
+from utils.signal_catalog import SignalCatalog
 
 logger = logging.getLogger(__name__)
 
@@ -21,10 +23,25 @@ class FileManager:
         self._core_manager = CoreFileManager()
         self._base_path = Path(self.config.data_directory)
         self._core_manager.base_dir = self._base_path
+        self._core_manager.storage_profile = self.config.hdf5_storage_profile
+        self._core_manager.sample_format = self.config.hdf5_sample_format
 
         self._base_path.mkdir(parents=True, exist_ok=True)
+
+        self.catalog: Optional[SignalCatalog] = None
+        database = self.config_manager.database
+        if database.enabled:
+            try:
+                self.catalog = SignalCatalog.from_config(database, self._core_manager)
+                self._core_manager.catalog = self.catalog
+            except (ValueError, OSError, sqlite3.Error) as exc:
+                logger.error("Failed to open signal catalog, falling back to directory scans: %s", exc)
         logger.info("File manager initialized with data directory: %s", self._base_path)
 
+    @property
+    def core_manager(self) -> CoreFileManager:
+        return self._core_manager
+
     def get_allowed_extensions(self) -> List[str]:
         return list(self.config.allowed_extensions)
 
@@ -45,6 +62,9 @@ class FileManager:
         return self._core_manager.load_signal(str(file_path))
 
     def list_files(self) -> List[Dict[str, object]]:
+        if self.catalog is not None:
+            return self.search_files(directory=self._base_path, page_size=None)['files']
+
         files: List[Dict[str, object]] = []
         allowed = {ext.lower() for ext in self.config.allowed_extensions}
 
@@ -64,6 +84,44 @@ class FileManager:
                     logger.warning("Failed to stat file %s: %s", entry, exc)
         return files
 
+    def search_files(
+        self,
+        min_freq: Optional[float] = None,
+        max_freq: Optional[float] = None,
+        start_time: Optional[object] = None,
+        end_time: Optional[object] = None,
+        signal_type: Optional[str] = None,
+        directory: Optional[Path] = None,
+        page: int = 1,
+        page_size: Optional[int] = 50,
+        rescan: bool = True,
+    ) -> Dict[str, object]:
+        """通过索引按频率/时间/类型分页检索数据目录中的信号文件"""
+        if self.catalog is None:
+            raise RuntimeError("Signal catalog is disabled (database.enabled = false)")
+
+        if rescan:
+            self.catalog.rescan(self._base_path, self.config.allowed_extensions, recursive=True)
+
+        page = max(1, int(page))
+        offset = (page - 1) * page_size if page_size else 0
+        result = self.catalog.query(
+            min_freq=min_freq,
+            max_freq=max_freq,
+            start_time=start_time,
+            end_time=end_time,
+            signal_type=signal_type,
+            directory=directory,
+            limit=page_size,
+            offset=offset,
+        )
+        return {
+            'files': result['items'],
+            'total': result['total'],
+            'page': page,
+            'page_size': page_size,
+        }
+
     def cleanup_old_files(self) -> None:
         if not self.config.auto_cleanup:
             return
@@ -1,7 +1,90 @@
 import numpy as np
 import scipy.signal as signal
+from functools import lru_cache
 from typing import Optional
 
+# 成形滤波器类型：根升余弦 / 升余弦 / 高斯
+PULSE_SHAPES = ("rrc", "rc", "gaussian")
+
+# 判定 t = 0 与奇异点的容差（单位：符号周期）
+_SINGULAR_TOL = 1e-8
+
+
+@lru_cache(maxsize=128)
+def _cached_pulse_taps(shape: str, num_taps: int, alpha: float, sps: float) -> np.ndarray:
+    # 时间轴关于中心对称（偶数抽头时中心落在两点之间），单位：符号周期
+    t = (np.arange(num_taps) - (num_taps - 1) / 2) / sps
+    if shape == "rrc":
+        taps = _rrc_response(t, alpha)
+    elif shape == "rc":
+        taps = _rc_response(t, alpha)
+    else:
+        taps = _gaussian_response(t, alpha)
+
+    if shape == "gaussian":
+        # 高斯脉冲归一化直流增益（GMSK 频率脉冲平滑）
+        total = np.sum(taps)
+        if total > 0:
+            taps = taps / total
+    else:
+        # 归一化能量
+        energy = np.sqrt(np.sum(taps**2))
+        if energy > 0:
+            taps = taps / energy
+    taps.flags.writeable = False
+    return taps
+
+
+def _rrc_response(t: np.ndarray, alpha: float) -> np.ndarray:
+    taps = np.empty_like(t)
+    center = np.abs(t) < _SINGULAR_TOL
+    singular = ~center & (np.abs(np.abs(4 * alpha * t) - 1) < _SINGULAR_TOL) if alpha > 0 else np.zeros_like(center)
+    regular = ~(center | singular)
+
+    taps[center] = 1.0 - alpha + 4 * alpha / np.pi
+    if singular.any():
+        term1 = (1 + 2 / np.pi) * np.sin(np.pi / (4 * alpha))
+        term2 = (1 - 2 / np.pi) * np.cos(np.pi / (4 * alpha))
+        taps[singular] = (alpha / np.sqrt(2)) * (term1 + term2)
+    # 标准根升余弦公式
+    tr = t[regular]
+    pi_t = np.pi * tr
+    numerator = np.sin(pi_t * (1 - alpha)) + 4 * alpha * tr * np.cos(pi_t * (1 + alpha))
+    denominator = pi_t * (1 - (4 * alpha * tr) ** 2)
+    taps[regular] = numerator / denominator
+    return taps
+
+
+def _rc_response(t: np.ndarray, alpha: float) -> np.ndarray:
+    taps = np.empty_like(t)
+    singular = np.abs(np.abs(2 * alpha * t) - 1) < _SINGULAR_TOL if alpha > 0 else np.zeros(t.shape, dtype=bool)
+    taps[singular] = (np.pi / 4) * np.sinc(1 / (2 * alpha)) if alpha > 0 else 0.0
+    tr = t[~singular]
+    taps[~singular] = np.sinc(tr) * np.cos(np.pi * alpha * tr) / (1 - (2 * alpha * tr) ** 2)
+    return taps
+
+
+def _gaussian_response(t: np.ndarray, bt: float) -> np.ndarray:
+    return np.exp(-2 * (np.pi * bt * t) ** 2 / np.log(2))
+
+
+def pulse_taps(shape: str, num_taps: int, alpha: float, sps: float) -> np.ndarray:
+    """成形滤波器抽头（只读，按 (shape, num_taps, alpha, sps) 缓存）
+
+    shape: "rrc" / "rc"（能量归一化，alpha 为滚降因子）或 "gaussian"（直流增益归一化，
+    alpha 为 BT 积）。调制器与匹配滤波器取同一组参数时共享缓存中的同一个数组；
+    需要修改时请先 copy()。
+    """
+    shape = str(shape).lower()
+    if shape not in PULSE_SHAPES:
+        raise ValueError(f"Unsupported pulse shape: {shape} (expected {', '.join(PULSE_SHAPES)})")
+    num_taps, alpha, sps = int(num_taps), float(alpha), float(sps)
+    if num_taps <= 0 or sps <= 0:
+        raise ValueError(f"num_taps and sps must be positive, got {num_taps}, {sps}")
+    if shape == "gaussian" and alpha <= 0:
+        raise ValueError(f"Gaussian BT must be positive, got {alpha}")
+    return _cached_pulse_taps(shape, num_taps, alpha, sps)
+
 
 class FilterDesigner:
     """滤波器设计器"""
@@ -9,7 +92,7 @@ class FilterDesigner:
     @staticmethod
     def rrc_taps(num_taps: int, alpha: float, sps: int) -> np.ndarray:
         """
-        生成根升余弦 (RRC) 滤波器系数
+        生成根升余弦 (RRC) 滤波器系数（只读，按参数缓存）
         num_taps: 总抽头数（奇数）
         alpha: 滚降因子 (0~1)
         sps: 每符号采样点数
@@ -17,70 +100,21 @@ class FilterDesigner:
         # 确保抽头数为奇数
         if num_taps % 2 == 0:
             num_taps += 1
-
-        half_len = num_taps // 2
-        t = np.arange(-half_len, half_len + 1) / sps  # 时间向量（单位：符号周期）
-        taps = np.zeros_like(t)
-
-        for i, ti in enumerate(t):
-            if abs(ti) < 1e-8:  # t = 0
-                taps[i] = 1.0 - alpha + 4 * alpha / np.pi
-            elif abs(abs(ti) - 1 / (4 * alpha)) < 1e-8:  # 奇异点
-                term1 = (1 + 2 / np.pi) * np.sin(np.pi / (4 * alpha))
-                term2 = (1 - 2 / np.pi) * np.cos(np.pi / (4 * alpha))
-                taps[i] = (alpha / np.sqrt(2)) * (term1 + term2)
-            else:
-                # 标准根升余弦公式
-                pi_t = np.pi * ti
-                pi_alpha_t = np.pi * alpha * ti
-                numerator = np.sin(pi_t * (1 - alpha)) + 4 * alpha * ti * np.cos(
-                    pi_t * (1 + alpha)
-                )
-                denominator = pi_t * (1 - (4 * alpha * ti) ** 2)
-                taps[i] = numerator / denominator
-
-        # 归一化能量
-        energy = np.sqrt(np.sum(taps**2))
-        if energy > 0:
-            taps = taps / energy
-
-        return taps
+        return pulse_taps("rrc", num_taps, alpha, sps)
 
     @staticmethod
     def corrected_rrc_taps(num_taps: int, alpha: float, sps: int) -> np.ndarray:
         """
-        修正的根升余弦滤波器设计
+        修正的根升余弦滤波器设计（时间轴对称，允许偶数抽头；只读，按参数缓存）
         """
-        # 确保时间轴对称
-        t = np.arange(num_taps) - (num_taps - 1) / 2
-        t = t / sps  # 归一化到符号周期
-
-        taps = np.zeros_like(t, dtype=float)
-
-        for i in range(len(t)):
-            ti = t[i]
-            if abs(ti) < 1e-10:  # t = 0
-                taps[i] = 1.0 - alpha + (4 * alpha / np.pi)
-            elif (
-                abs(4 * alpha * ti - 1) < 1e-10 or abs(4 * alpha * ti + 1) < 1e-10
-            ):  # 奇异点
-                value = (alpha / np.sqrt(2)) * (
-                    (1 + 2 / np.pi) * np.sin(np.pi / (4 * alpha))
-                    + (1 - 2 / np.pi) * np.cos(np.pi / (4 * alpha))
-                )
-                taps[i] = value
-            else:
-                pi_t = np.pi * ti
-                pi_alpha_t = np.pi * alpha * ti
-                numerator = np.sin(pi_t * (1 - alpha)) + 4 * alpha * ti * np.cos(
-                    pi_t * (1 + alpha)
-                )
-                denominator = pi_t * (1 - (4 * alpha * ti) ** 2)
-                taps[i] = numerator / denominator
-
-        # 能量归一化 - 确保滤波器不改变信号功率
-        energy = np.sum(taps**2)
-        if energy > 0:
-            taps = taps / np.sqrt(energy)
+        return pulse_taps("rrc", num_taps, alpha, sps)
 
-        return taps
+    @staticmethod
+    def rc_taps(num_taps: int, alpha: float, sps: int) -> np.ndarray:
+        """升余弦 (RC) 滤波器系数（即一对 RRC 级联的总响应；只读，按参数缓存）"""
+        return pulse_taps("rc", num_taps, alpha, sps)
+
+    @staticmethod
+    def gaussian_taps(num_taps: int, bt: float, sps: int) -> np.ndarray:
+        """高斯滤波器系数（bt: 3 dB 带宽 x 符号周期，GMSK 常用 0.3；只读，按参数缓存）"""
+        return pulse_taps("gaussian", num_taps, bt, sps)
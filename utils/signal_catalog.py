@@ -0,0 +1,373 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+from core.file_manager import FileManager as CoreFileManager
+from utils.config_manager import DatabaseConfig
+
+logger = logging.getLogger(__name__)
+
+TimeValue = Union[None, float, int, str, datetime]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS signals (
+    path TEXT PRIMARY KEY,
+    directory TEXT NOT NULL,
+    name TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    sample_rate REAL,
+    center_freq REAL,
+    duration REAL,
+    samples_count INTEGER,
+    signal_type TEXT,
+    recorded_at REAL,
+    average_power REAL,
+    peak_power REAL,
+    error TEXT,
+    indexed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_signals_directory ON signals(directory);
+CREATE INDEX IF NOT EXISTS idx_signals_center_freq ON signals(center_freq);
+CREATE INDEX IF NOT EXISTS idx_signals_recorded_at ON signals(recorded_at);
+CREATE INDEX IF NOT EXISTS idx_signals_signal_type ON signals(signal_type);
+
+CREATE TABLE IF NOT EXISTS directories (
+    path TEXT PRIMARY KEY,
+    parent TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_directories_parent ON directories(parent);
+"""
+
+_ORDER_COLUMNS = {"recorded_at", "mtime_ns", "name", "size", "center_freq", "duration"}
+
+
+class SignalCatalog:
+    """基于 SQLite 的持久化信号文件索引
+
+    rescan() 以文件 mtime 驱动增量更新：每次枚举目录并 stat 各文件，只有新增或
+    (mtime_ns, 大小) 变化的文件才会重新读取文件头（原地改写 / 追加同样能被发现，
+    目录 mtime 并不反映这类变化）；full=True 时重新读取所有文件头。
+    """
+
+    def __init__(self, db_path: str, file_manager: Optional[CoreFileManager] = None) -> None:
+        self.db_path = str(db_path)
+        self.files = file_manager or CoreFileManager()
+        self._lock = threading.Lock()
+
+        if self.db_path != ":memory:":
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock:
+            self._migrate_directories()
+            self._conn.executescript(_SCHEMA)
+            self._conn.commit()
+
+    def _migrate_directories(self) -> None:
+        """旧版索引的 directories 表带有未使用的 mtime_ns 列（NOT NULL），迁移时去掉该列并保留目录树"""
+        columns = {r["name"] for r in self._conn.execute("PRAGMA table_info(directories)")}
+        if "mtime_ns" not in columns:
+            return
+        self._conn.executescript(
+            """
+            DROP INDEX IF EXISTS idx_directories_parent;
+            ALTER TABLE directories RENAME TO directories_old;
+            CREATE TABLE directories (path TEXT PRIMARY KEY, parent TEXT);
+            INSERT INTO directories (path, parent) SELECT path, parent FROM directories_old;
+            DROP TABLE directories_old;
+            """
+        )
+
+    @classmethod
+    def from_config(
+        cls, config: DatabaseConfig, file_manager: Optional[CoreFileManager] = None
+    ) -> "SignalCatalog":
+        return cls(cls.resolve_db_path(config.connection_string), file_manager)
+
+    @staticmethod
+    def resolve_db_path(connection_string: str) -> str:
+        """将 sqlite:///relative.db 或 sqlite:////abs/path.db 转换为文件路径"""
+        prefix = "sqlite:///"
+        if connection_string.startswith(prefix):
+            return connection_string[len(prefix):] or ":memory:"
+        if connection_string in ("sqlite://", ":memory:"):
+            return ":memory:"
+        raise ValueError(f"Unsupported catalog connection string: {connection_string}")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def rescan(
+        self,
+        directory: Union[str, Path],
+        extensions: Iterable[str],
+        recursive: bool = True,
+        full: bool = False,
+    ) -> Dict[str, int]:
+        """增量同步目录内容到索引，返回 added/updated/removed/unchanged 计数"""
+        root = Path(directory).resolve()
+        allowed = {ext.lower() for ext in extensions}
+        counts = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0}
+
+        pending = [root]
+        while pending:
+            current = pending.pop()
+            if not current.is_dir():
+                continue
+
+            with self._lock:
+                known_subdirs = [
+                    Path(r["path"])
+                    for r in self._conn.execute(
+                        "SELECT path FROM directories WHERE parent = ?", (str(current),)
+                    )
+                ]
+
+            subdirs = self._sync_directory(current, allowed, counts, full)
+            with self._lock:
+                for stale in set(known_subdirs) - set(subdirs):
+                    self._forget_directory(stale, counts)
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO directories (path, parent) VALUES (?, ?)",
+                    (str(current), str(current.parent)),
+                )
+                if recursive:
+                    for sub in subdirs:
+                        self._conn.execute(
+                            "INSERT OR IGNORE INTO directories (path, parent) VALUES (?, ?)",
+                            (str(sub), str(current)),
+                        )
+                self._conn.commit()
+
+            if recursive:
+                pending.extend(subdirs)
+
+        logger.debug("Catalog rescan of %s: %s", root, counts)
+        return counts
+
+    def _sync_directory(self, directory: Path, allowed: set, counts: Dict[str, int], full: bool = False) -> List[Path]:
+        subdirs: List[Path] = []
+        present: Dict[str, os.stat_result] = {}
+
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(Path(entry.path))
+                    elif entry.is_file() and Path(entry.name).suffix.lower() in allowed:
+                        present[entry.path] = entry.stat()
+                except OSError as exc:
+                    logger.warning("Failed to stat catalog entry %s: %s", entry.path, exc)
+
+        with self._lock:
+            known = {
+                r["path"]: (r["mtime_ns"], r["size"])
+                for r in self._conn.execute(
+                    "SELECT path, mtime_ns, size FROM signals WHERE directory = ?", (str(directory),)
+                )
+            }
+
+        rows = []
+        for path, stat in present.items():
+            previous = known.get(path)
+            if previous == (stat.st_mtime_ns, stat.st_size) and not full:
+                counts["unchanged"] += 1
+                continue
+            counts["updated" if previous else "added"] += 1
+            rows.append(self._build_row(Path(path), stat))
+
+        removed = [path for path in known if path not in present]
+        counts["removed"] += len(removed)
+
+        with self._lock:
+            self._conn.executemany(
+                """
+                INSERT OR REPLACE INTO signals (
+                    path, directory, name, size, mtime_ns, sample_rate, center_freq,
+                    duration, samples_count, signal_type, recorded_at, average_power,
+                    peak_power, error, indexed_at
+                ) VALUES (
+                    :path, :directory, :name, :size, :mtime_ns, :sample_rate, :center_freq,
+                    :duration, :samples_count, :signal_type, :recorded_at, :average_power,
+                    :peak_power, :error, :indexed_at
+                )
+                """,
+                rows,
+            )
+            self._conn.executemany("DELETE FROM signals WHERE path = ?", [(p,) for p in removed])
+            self._conn.commit()
+
+        return subdirs
+
+    def _forget_directory(self, directory: Path, counts: Dict[str, int]) -> None:
+        """删除已不存在的子目录及其下所有索引记录（调用方持有锁）"""
+        prefix = str(directory)
+        like = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + os.sep + "%"
+        cursor = self._conn.execute(
+            "DELETE FROM signals WHERE directory = ? OR directory LIKE ? ESCAPE '\\'",
+            (prefix, like),
+        )
+        counts["removed"] += max(cursor.rowcount, 0)
+        self._conn.execute(
+            "DELETE FROM directories WHERE path = ? OR path LIKE ? ESCAPE '\\'",
+            (prefix, like),
+        )
+
+    def _build_row(self, path: Path, stat: os.stat_result) -> Dict[str, object]:
+        row: Dict[str, object] = {
+            "path": str(path),
+            "directory": str(path.parent),
+            "name": path.name,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sample_rate": None,
+            "center_freq": None,
+            "duration": None,
+            "samples_count": None,
+            "signal_type": None,
+            "recorded_at": stat.st_mtime,
+            "average_power": None,
+            "peak_power": None,
+            "error": None,
+            "indexed_at": time.time(),
+        }
+
+        # 只有 FileManager 能解析的格式才读取文件头，其余仅记录文件属性
+        if path.suffix.lower() not in self.files.supported_formats:
+            return row
+
+        info = self.files.get_file_info(str(path))
+        if "error" in info:
+            row["error"] = str(info["error"])
+            return row
+
+        power_stats = info.get("power_stats") or {}
+        row.update(
+            {
+                "sample_rate": _to_float(info.get("sample_rate")),
+                "center_freq": _to_float(info.get("center_freq")),
+                "duration": _to_float(info.get("duration")),
+                "samples_count": int(info.get("samples_count") or 0),
+                "signal_type": str(info.get("signal_type") or "unknown"),
+                "average_power": _to_float(power_stats.get("average_power")),
+                "peak_power": _to_float(power_stats.get("peak_power")),
+            }
+        )
+        recorded_at = _to_epoch(info.get("timestamp"))
+        if recorded_at is not None:
+            row["recorded_at"] = recorded_at
+        return row
+
+    def query(
+        self,
+        min_freq: Optional[float] = None,
+        max_freq: Optional[float] = None,
+        start_time: TimeValue = None,
+        end_time: TimeValue = None,
+        signal_type: Optional[str] = None,
+        directory: Optional[Union[str, Path]] = None,
+        limit: Optional[int] = 50,
+        offset: int = 0,
+        order_by: str = "recorded_at",
+        descending: bool = True,
+    ) -> Dict[str, object]:
+        """按频率范围、时间范围、信号类型查询，返回 {'total', 'items'}"""
+        clauses = []
+        params: List[object] = []
+        if min_freq is not None:
+            clauses.append("center_freq >= ?")
+            params.append(float(min_freq))
+        if max_freq is not None:
+            clauses.append("center_freq <= ?")
+            params.append(float(max_freq))
+        if start_time is not None:
+            clauses.append("recorded_at >= ?")
+            params.append(_to_epoch(start_time))
+        if end_time is not None:
+            clauses.append("recorded_at <= ?")
+            params.append(_to_epoch(end_time))
+        if signal_type:
+            clauses.append("signal_type = ?")
+            params.append(signal_type)
+        if directory is not None:
+            clauses.append("directory = ?")
+            params.append(str(Path(directory).resolve()))
+
+        if order_by not in _ORDER_COLUMNS:
+            raise ValueError(f"Unsupported order_by column: {order_by}")
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        order = f"ORDER BY {order_by} {'DESC' if descending else 'ASC'}, path"
+        page = ""
+        page_params: List[object] = []
+        if limit is not None:
+            page = "LIMIT ? OFFSET ?"
+            page_params = [max(0, int(limit)), max(0, int(offset))]
+
+        with self._lock:
+            total = self._conn.execute(f"SELECT COUNT(*) FROM signals {where}", params).fetchone()[0]
+            rows = self._conn.execute(
+                f"SELECT * FROM signals {where} {order} {page}", params + page_params
+            ).fetchall()
+
+        return {"total": int(total), "items": [self._row_to_item(r) for r in rows]}
+
+    def list_file_infos(self, directory: Union[str, Path]) -> List[Dict]:
+        """以 FileManager.get_file_info 的格式返回目录下已索引的信号文件"""
+        infos = []
+        for item in self.query(directory=directory, limit=None, order_by="name", descending=False)["items"]:
+            if item["error"]:
+                infos.append({"error": item["error"], "filename": item["path"]})
+                continue
+            if item["sample_rate"] is None:
+                continue
+            infos.append(
+                {
+                    "filename": item["path"],
+                    "file_size": item["size"],
+                    "file_size_mb": item["size"] / 1024 / 1024,
+                    "samples_count": item["samples_count"],
+                    "duration": item["duration"],
+                    "sample_rate": item["sample_rate"],
+                    "center_freq": item["center_freq"],
+                    "signal_type": item["signal_type"],
+                    "power_stats": {
+                        "average_power": item["average_power"],
+                        "peak_power": item["peak_power"],
+                    },
+                }
+            )
+        return infos
+
+    @staticmethod
+    def _row_to_item(row: sqlite3.Row) -> Dict[str, object]:
+        item = dict(row)
+        item["modified"] = item["mtime_ns"] / 1e9
+        return item
+
+
+def _to_float(value) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_epoch(value: TimeValue) -> Optional[float]:
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return datetime.fromisoformat(str(value)).timestamp()
+    except ValueError:
+        return None
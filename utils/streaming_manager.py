@@ -4,8 +4,6 @@ import time
 import uuid
 from typing import Dict, Optional
 
-import numpy as np
-
 from core.file_manager import FileManager
 from utils.config_manager import StreamingConfig, get_config_manager
 from utils.visualizer import StreamingSignalVisualizer
@@ -141,12 +139,7 @@ class StreamingSignalAnalyzer:
     def _process_file_worker(self, session: StreamingSession) -> None:
         """流式处理工作线程"""
         try:
-            samples, metadata = self.file_manager.load_signal(session.filename)
-            if samples is None:
-                raise RuntimeError("Failed to load samples for streaming")
-
-            signal_data = np.asarray(samples)
-            total_samples = signal_data.size
+            total_samples = self.file_manager.get_sample_count(session.filename)
 
             if total_samples == 0:
                 raise RuntimeError("Signal file is empty")
@@ -165,8 +158,10 @@ class StreamingSignalAnalyzer:
 
             while position < total_samples and session.cancel_event and not session.cancel_event.is_set():
                 end_pos = min(position + session.chunk_size, total_samples)
-                chunk = signal_data[position:end_pos]
+                chunk = self.file_manager.read_range(session.filename, position, end_pos - position)
 
+                if chunk is None:
+                    raise RuntimeError("Failed to read samples for streaming")
                 if chunk.size == 0:
                     break
 
@@ -3,7 +3,7 @@ matplotlib.use("Agg")
 import matplotlib.pyplot as plt
 from matplotlib.ticker import AutoMinorLocator, MultipleLocator, MaxNLocator
 import numpy as np
-from scipy.fft import fft, fftshift
+from scipy.fft import fftshift
 from scipy.signal import spectrogram
 from typing import Dict, Optional
 import scipy.signal as signal
@@ -16,8 +16,12 @@ import threading
 import time
 import logging
 from typing import Generator, Tuple, List
-from dataclasses import asdict, is_dataclass
+from dataclasses import asdict, is_dataclass, replace
 
+from core.dtypes import as_samples, get_sample_dtype, real_dtype
+from core.fft_engine import fft_segments, fft_workers
+from core.signal_processor import ProcessingConfig, SignalProcessor
+from core.spectral_cache import spectral_params
 from utils.config_manager import FFTWindow, VisualizationConfig, get_config_manager
 
 logger = logging.getLogger(__name__)
@@ -49,6 +53,35 @@ class EnhancedSignalVisualizer:
             # Fallback to defaults if configuration loading fails
             self.config_manager = None
             self.visualization_config = VisualizationConfig()
+        # PNG 频谱图使用 Welch 平均功率谱，覆盖整段信号；
+        # processor.config.fft_workers 为 None 时使用 PerformanceConfig.fft_workers
+        self.processor = SignalProcessor(
+            ProcessingConfig(precision=getattr(self.visualization_config, "precision", "double"))
+        )
+        self._precision_processors: Dict[str, SignalProcessor] = {}
+
+    def _processor_for(self, config) -> SignalProcessor:
+        """与可视化配置精度一致的处理器（按精度缓存，不修改 self.processor）"""
+        precision = getattr(config, "precision", None) or self.processor.config.precision
+        if precision == self.processor.config.precision:
+            return self.processor
+        processor = self._precision_processors.get(precision)
+        if processor is None:
+            processor = SignalProcessor(replace(self.processor.config, precision=precision))
+            self._precision_processors[precision] = processor
+        return processor
+
+    @staticmethod
+    def _plot_fft_size(samples) -> int:
+        fft_size = min(8192, len(samples))
+        if fft_size < 256:
+            fft_size = 256
+        return 2 ** int(np.log2(fft_size))
+
+    def _plot_psd_db(self, samples, sample_rate):
+        """Welch PSD（dB），频率轴单位 MHz"""
+        freq, psd = self.processor.calculate_psd(samples, sample_rate, fft_size=self._plot_fft_size(samples))
+        return freq / 1e6, 10 * np.log10(psd + psd.dtype.type(1e-12))
 
     def _plot_time_domain(self, ax, samples, sample_rate):
         max_display = min(100, len(samples))
@@ -76,18 +109,7 @@ class EnhancedSignalVisualizer:
             pass
 
     def _plot_power_spectrum(self, ax, samples, sample_rate):
-        fft_size = min(8192, len(samples))
-        if fft_size < 256:
-            fft_size = 256
-        fft_size = 2 ** int(np.log2(fft_size))
-        seg = samples[:fft_size]
-        window = np.hanning(len(seg))
-        wc = np.mean(window**2)
-        spec = fft(seg * window)
-        spec_s = fftshift(spec)
-        freq = fftshift(np.fft.fftfreq(len(seg), 1.0 / sample_rate)) / 1e6
-        psd = (np.abs(spec_s) ** 2) / (sample_rate * len(seg) * wc)
-        psd_db = 10 * np.log10(psd + 1e-12)
+        freq, psd_db = self._plot_psd_db(samples, sample_rate)
         ax.plot(freq, psd_db, "purple", linewidth=1)
         ax.set_title("Power Spectrum")
         ax.set_xlabel("Frequency Offset (MHz)")
@@ -129,8 +151,13 @@ class EnhancedSignalVisualizer:
             return "spectrogram"
         nperseg = min(512, max(128, len(samples) // 8))
         noverlap = nperseg // 2
-        f, t, Sxx = spectrogram(samples, fs=sample_rate, nperseg=nperseg, noverlap=noverlap, window='hann', return_onesided=False, scaling='density', mode='complex')
-        Sxx_db = 10 * np.log10(np.abs(Sxx) + 1e-12)
+        # single 精度下样本与窗均为单精度，scipy 全程以 complex64 计算
+        cdtype, _, odtype = self.processor.spectral_dtypes()
+        samples = as_samples(samples, dtype=cdtype)
+        window = spectral_params(nperseg, 'hann', symmetric=False, dtype=odtype).window
+        with fft_workers(self.processor.config.fft_workers):
+            f, t, Sxx = spectrogram(samples, fs=sample_rate, nperseg=nperseg, noverlap=noverlap, window=window, return_onesided=False, scaling='density', mode='complex')
+        Sxx_db = 10 * np.log10(np.abs(Sxx).astype(odtype, copy=False) + odtype.type(1e-12))
         Sxx_db = fftshift(Sxx_db, axes=0)
         f_shift = fftshift(f) / 1e6
         im = ax.pcolormesh(t * 1000.0, f_shift, Sxx_db, shading='gouraud', cmap='viridis')
@@ -152,18 +179,7 @@ class EnhancedSignalVisualizer:
         return 'constellation'
 
     def _plot_squared_spectrum(self, ax, samples, sample_rate):
-        fft_size = min(8192, len(samples))
-        if fft_size < 256:
-            fft_size = 256
-        fft_size = 2 ** int(np.log2(fft_size))
-        seg = samples[:fft_size]
-        sq = seg ** 2
-        window = np.hanning(len(seg))
-        spec = fft(sq * window)
-        spec_s = fftshift(spec)
-        freq = fftshift(np.fft.fftfreq(len(seg), 1.0 / sample_rate)) / 1e6
-        power = np.abs(spec_s) ** 2 / (len(seg) * sample_rate)
-        db = 10 * np.log10(power + 1e-12)
+        freq, db = self._plot_psd_db(as_samples(samples) ** 2, sample_rate)
         ax.plot(freq, db, 'g')
         ax.set_title('Quadratic Spectrum (x^2)')
         ax.set_xlabel('Frequency (MHz)')
@@ -173,18 +189,7 @@ class EnhancedSignalVisualizer:
         return 'quadratic_spectrum'
 
     def _plot_quartic_spectrum(self, ax, samples, sample_rate):
-        fft_size = min(8192, len(samples))
-        if fft_size < 256:
-            fft_size = 256
-        fft_size = 2 ** int(np.log2(fft_size))
-        seg = samples[:fft_size]
-        q = seg ** 4
-        window = np.hanning(len(seg))
-        spec = fft(q * window)
-        spec_s = fftshift(spec)
-        freq = fftshift(np.fft.fftfreq(len(seg), 1.0 / sample_rate)) / 1e6
-        power = np.abs(spec_s) ** 2 / (len(seg) * sample_rate)
-        db = 10 * np.log10(power + 1e-12)
+        freq, db = self._plot_psd_db(as_samples(samples) ** 4, sample_rate)
         ax.plot(freq, db, 'r')
         ax.set_title('Quartic Spectrum (x^4)')
         ax.set_xlabel('Frequency (MHz)')
@@ -835,24 +840,27 @@ class StreamingSignalVisualizer(EnhancedSignalVisualizer):
                                                 arr = _np.asarray(block)
                                                 if arr.size == 0:
                                                     continue
-                                                yield arr.astype(_np.complex128).tolist()
+                                                yield as_samples(arr).tolist()
                                         elif mode_local == '2col':
+                                            # sc16 数据集带 scale 属性，其余两列数据按原值解释
+                                            col_scale = float(dset.attrs.get('scale', 1.0))
                                             for start in range(0, total_local, samples_per_read):
                                                 end = min(start + samples_per_read, total_local)
                                                 block = dset[start:end]
                                                 arr = _np.asarray(block)
                                                 if arr.size == 0:
                                                     continue
-                                                i = arr[:, 0].astype(_np.float64)
-                                                q = arr[:, 1].astype(_np.float64)
-                                                yield (_np.array(i) + 1j * _np.array(q)).tolist()
+                                                pair = _np.empty(arr.shape[0], dtype=get_sample_dtype())
+                                                pair.real = arr[:, 0] * col_scale
+                                                pair.imag = arr[:, 1] * col_scale
+                                                yield pair.tolist()
                                         elif mode_local == 'interleaved':
                                             total_floats_local = int(dset.shape[0])
                                             for start in range(0, total_local, samples_per_read):
                                                 fstart = start * 2
                                                 fend = min((start + samples_per_read) * 2, total_floats_local)
                                                 block = dset[fstart:fend]
-                                                flat = _np.asarray(block).ravel().astype(_np.float64)
+                                                flat = _np.asarray(block).ravel().astype(real_dtype(), copy=False)
                                                 if flat.size % 2 != 0:
                                                     flat = flat[:-1]
                                                 if flat.size == 0:
@@ -1430,7 +1438,7 @@ class StreamingSignalVisualizer(EnhancedSignalVisualizer):
             'mode': 'realtime',
             'status': 'starting',
             'update_interval': float(update_interval),
-            'recent_samples': np.array([], dtype=np.complex128),
+            'recent_samples': np.array([], dtype=get_sample_dtype()),
             'final_metadata': {},
             'include_extras': False,
         }
@@ -1468,7 +1476,7 @@ class StreamingSignalVisualizer(EnhancedSignalVisualizer):
         arr = np.asarray(samples)
         if arr.size == 0:
             return
-        arr = arr.astype(np.complex128, copy=False).ravel()
+        arr = as_samples(arr).ravel()
         now = time.time()
 
         with self.session_lock:
@@ -1482,7 +1490,7 @@ class StreamingSignalVisualizer(EnhancedSignalVisualizer):
 
             recent = session.get('recent_samples')
             if not isinstance(recent, np.ndarray):
-                recent = np.array([], dtype=np.complex128)
+                recent = np.array([], dtype=get_sample_dtype())
 
             combined = np.concatenate((recent, arr))
             window_limit = int(session.get('window_limit') or max(arr.size * 4, 8192))
@@ -1648,8 +1656,7 @@ class StreamingSignalVisualizer(EnhancedSignalVisualizer):
             config_obj = VisualizationConfig()
 
         try:
-            arr = np.asarray(samples)
-            arr = arr.astype(np.complex128, copy=False)
+            arr = as_samples(samples)
 
             if arr.size == 0:
                 empty = {
@@ -1772,14 +1779,10 @@ class StreamingSignalVisualizer(EnhancedSignalVisualizer):
         if n_fft <= 0:
             return ({'frequency': [], 'power': []}, 0)
 
-        seg = signal_data[-n_fft:]
-        window = self._get_window_function(n_fft, getattr(config, 'fft_window', FFTWindow.HANN))
-        spec = fft(seg * window)
-        spec_shifted = fftshift(spec)
-        freq = fftshift(np.fft.fftfreq(n_fft, 1.0 / sr)) / 1e6
-        denom = sr * n_fft * (np.mean(window ** 2) + 1e-12)
-        power = (np.abs(spec_shifted) ** 2) / denom
-        power_db = 10 * np.log10(power + 1e-12)
+        window = self._window_key(getattr(config, 'fft_window', FFTWindow.HANN))
+        freq, spectra = self._processor_for(config).calculate_spectra(signal_data[None, -n_fft:], sr, n_fft, window)
+        freq = freq / 1e6
+        power_db = spectra[0]
 
         max_points = max(1, getattr(config, 'max_freq_points', 1024) or 1024)
         if len(freq) > max_points:
@@ -1789,10 +1792,8 @@ class StreamingSignalVisualizer(EnhancedSignalVisualizer):
 
         return ({'frequency': freq.tolist(), 'power': power_db.tolist()}, n_fft)
 
-    def _get_window_function(self, n_fft: int, window_type: Optional[FFTWindow]) -> np.ndarray:
-        if n_fft <= 0:
-            return np.ones(1)
-
+    @staticmethod
+    def _window_key(window_type: Optional[FFTWindow]) -> str:
         try:
             if isinstance(window_type, FFTWindow):
                 key = window_type.value
@@ -1802,16 +1803,13 @@ class StreamingSignalVisualizer(EnhancedSignalVisualizer):
                 key = str(window_type).lower()
         except Exception:
             key = 'hann'
+        return key if key in ('hamming', 'blackman', 'rectangular') else 'hann'
 
-        if key in ('hann', 'hanning'):
-            return np.hanning(n_fft)
-        if key == 'hamming':
-            return np.hamming(n_fft)
-        if key == 'blackman':
-            return np.blackman(n_fft)
-        if key == 'rectangular':
-            return np.ones(n_fft)
-        return np.hanning(n_fft)
+    def _get_window_function(self, n_fft: int, window_type: Optional[FFTWindow]) -> np.ndarray:
+        if n_fft <= 0:
+            return np.ones(1)
+        # 共享缓存的只读窗，与样本同精度，避免 complex64 样本加窗时被提升为 complex128
+        return spectral_params(n_fft, self._window_key(window_type)).window
 
     def _create_constellation_data(self, signal_data: np.ndarray, max_points: int) -> Dict[str, list]:
         if max_points <= 0:
@@ -1842,16 +1840,18 @@ class StreamingSignalVisualizer(EnhancedSignalVisualizer):
             return {'frequency': [], 'quadratic_power': [], 'quartic_power': []}
 
         sr = sample_rate if sample_rate and sample_rate > 0 else 1.0
-        seg = signal_data[-fft_size:]
-        window = self._get_window_function(fft_size, getattr(config, 'fft_window', FFTWindow.HANN))
-
-        quad_spec = fftshift(fft((seg ** 2) * window))
-        quad_db = 10 * np.log10(np.abs(quad_spec) ** 2 + 1e-12)
+        processor = self._processor_for(config)
+        cdtype, wdtype, odtype = processor.spectral_dtypes()
+        seg = as_samples(signal_data[-fft_size:], dtype=cdtype)
+        window_key = self._window_key(getattr(config, 'fft_window', FFTWindow.HANN))
+        params = spectral_params(len(seg), window_key, sr, dtype=wdtype)
+        window = params.window
 
-        quart_spec = fftshift(fft((seg ** 4) * window))
-        quart_db = 10 * np.log10(np.abs(quart_spec) ** 2 + 1e-12)
+        # x^2 与 x^4 两段一次批量变换
+        spectra = fft_segments(np.stack([seg ** 2, seg ** 4]), window, workers=processor.config.fft_workers, shift=True)
+        quad_db, quart_db = 10 * np.log10(np.abs(spectra).astype(odtype, copy=False) ** 2 + odtype.type(1e-12))
 
-        freq = fftshift(np.fft.fftfreq(fft_size, 1.0 / sr)) / 1e6
+        freq = params.freq_axis / 1e6
 
         max_points = max(1, getattr(config, 'max_freq_points', 1024) or 1024)
         if len(freq) > max_points:
@@ -1956,7 +1956,7 @@ class StreamingSignalVisualizer(EnhancedSignalVisualizer):
         sample_rate: float,
     ) -> Dict[str, list]:
         try:
-            arr = np.asarray(samples).astype(np.complex128, copy=False)
+            arr = as_samples(samples)
         except Exception:
             arr = np.asarray(samples)
         return self._create_eye_diagram_data(arr, sample_rate, getattr(self, 'visualization_config', VisualizationConfig()))
@@ -5,14 +5,19 @@ Endpoints implemented:
  - POST /api/analyze -> starts a dummy background task and returns task_id
  - GET  /api/analysis/{task_id} -> returns status and fake results
  - GET  /api/tasks -> returns tasks list
+ - GET  /api/files -> paginated signal file listing (catalog-backed when enabled)
+ - POST /api/convert -> submits a (batch) format conversion, returns task_id
+ - GET  /api/convert/{task_id} -> per-file progress and results of a conversion
  - POST /api/ws_stream/start -> returns a session_id
  - WebSocket /ws/stream/{session_id} -> emits a message then listens for 'cancel'
 
 This keeps CI lightweight while satisfying the test expectations.
 """
-from fastapi import FastAPI, BackgroundTasks, WebSocket
+from fastapi import FastAPI, BackgroundTasks, Request, WebSocket
 from fastapi.responses import JSONResponse
-from typing import Dict
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import parse_qsl
 import uuid
 import threading
 import time
@@ -58,6 +63,234 @@ async def tasks_list():
     return {"tasks": [{"id": k, **v} for k, v in _tasks.items()]}
 
 
+_file_manager = None
+
+
+def _get_file_manager():
+    global _file_manager
+    if _file_manager is None:
+        from utils.file_management import FileManager
+
+        _file_manager = FileManager()
+    return _file_manager
+
+
+# 普通 def：目录扫描与 SQLite 查询是阻塞操作，由 FastAPI 放到线程池执行
+@app.get("/api/files")
+def files_list(
+    min_freq: Optional[float] = None,
+    max_freq: Optional[float] = None,
+    start_time: Optional[str] = None,
+    end_time: Optional[str] = None,
+    signal_type: Optional[str] = None,
+    page: int = 1,
+    page_size: int = 50,
+):
+    manager = _get_file_manager()
+    page = max(1, page)
+    page_size = max(1, min(page_size, 500))
+    if manager.catalog is not None:
+        return manager.search_files(
+            min_freq=min_freq,
+            max_freq=max_freq,
+            start_time=start_time,
+            end_time=end_time,
+            signal_type=signal_type,
+            page=page,
+            page_size=page_size,
+        )
+
+    # 未启用索引时退化为目录枚举，仅支持分页
+    files = sorted(manager.list_files(), key=lambda item: item["modified"], reverse=True)
+    start = (page - 1) * page_size
+    return {"files": files[start:start + page_size], "total": len(files), "page": page, "page_size": page_size}
+
+
+def _confined_path(manager, name: str) -> Optional[Path]:
+    """解析为数据目录下的绝对路径；位于数据目录之外（绝对路径、..）时返回 None"""
+    base = Path(manager.get_data_directory()).resolve()
+    path = manager.resolve_path(name).resolve()
+    if path != base and base not in path.parents:
+        return None
+    return path
+
+
+def _run_conversion(
+    task_id: str,
+    inputs,
+    output_format: str,
+    output_dir,
+    workers,
+    overwrite: bool,
+    converter_options=None,
+    output_file=None,
+):
+    from modules.converter import FormatConverter
+
+    task = _tasks[task_id]
+
+    def on_progress(done, total, result):
+        task["done"] = done
+        task["total"] = total
+        task["results"].append(result)
+
+    try:
+        manager = _get_file_manager()
+        converter = FormatConverter(manager.core_manager)
+        for key, value in (converter_options or {}).items():
+            setattr(converter, key, value)
+        if output_file:
+            # 单文件且指定输出文件名（Web 表单的 output 字段），跳过规则与 convert_batch 相同
+            if not overwrite and not converter._resampling and converter._is_up_to_date(
+                Path(inputs[0]), Path(output_file)
+            ):
+                result = {"input": inputs[0], "output": output_file, "status": "skipped", "error": None}
+                on_progress(1, 1, result)
+                task.update({"converted": 0, "skipped": 1, "failed": 0})
+                task["status"] = "completed"
+                return
+            ok = converter.convert_format(inputs[0], output_format, output_file)
+            result = {"input": inputs[0], "output": output_file, "status": "converted" if ok else "failed"}
+            result["error"] = None if ok else "conversion failed"
+            on_progress(1, 1, result)
+            task.update({"converted": int(ok), "skipped": 0, "failed": int(not ok)})
+            task["status"] = "completed"
+            return
+        summary = converter.convert_batch(
+            inputs,
+            output_format,
+            workers=workers,
+            output_dir=output_dir,
+            overwrite=overwrite,
+            progress_callback=on_progress,
+        )
+        task.update({k: summary[k] for k in ("converted", "skipped", "failed")})
+        task["status"] = "completed"
+    except Exception as exc:
+        task["status"] = "failed"
+        task["error"] = str(exc)
+
+
+def _parse_flag(value) -> bool:
+    """布尔参数：JSON 布尔值或表单字符串（"1" / "true" / "yes" / "on"）"""
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in {"1", "true", "yes", "on"}
+
+
+async def _request_payload(request: Request) -> Dict:
+    """JSON 请求体或 Web 表单（application/x-www-form-urlencoded）"""
+    if "application/json" in request.headers.get("content-type", ""):
+        payload = await request.json()
+        return payload if isinstance(payload, dict) else {}
+    body = (await request.body()).decode("utf-8", errors="replace")
+    return dict(parse_qsl(body))
+
+
+@app.post("/api/convert")
+async def convert(request: Request):
+    """JSON: {"files": [...] | "filename": str, "output_format": "h5", "output_dir"?, "workers"?, "overwrite"?,
+    "csv_columns"?: "iq" | "all", "csv_decimation"?: int, "output_rate"?: float, "frequency_shift"?: float}
+
+    也接受 Web 表单字段 filename / format / output（output 为单文件的输出文件名）。
+    所有路径都必须位于数据目录内。"""
+    try:
+        payload = await _request_payload(request)
+    except ValueError:
+        return JSONResponse({"success": False, "error": "invalid request body"}, status_code=400)
+    files = payload.get("files") or ([payload["filename"]] if payload.get("filename") else [])
+    if isinstance(files, str):
+        files = [files]
+    output_format = str(payload.get("output_format") or payload.get("format") or "").lower()
+    if not files or not output_format:
+        return JSONResponse({"success": False, "error": "files and output_format are required"}, status_code=400)
+    from modules.converter import OUTPUT_SUFFIXES
+
+    if output_format not in OUTPUT_SUFFIXES:
+        return JSONResponse({"success": False, "error": f"unsupported output format: {output_format}"}, status_code=400)
+
+    manager = _get_file_manager()
+    resolved = [_confined_path(manager, str(name)) for name in files]
+    if any(path is None for path in resolved):
+        return JSONResponse({"success": False, "error": "files must be inside the data directory"}, status_code=400)
+    inputs = [str(path) for path in resolved]
+    output_dir = payload.get("output_dir")
+    if output_dir:
+        output_dir = _confined_path(manager, str(output_dir))
+        if output_dir is None:
+            return JSONResponse(
+                {"success": False, "error": "output_dir must be inside the data directory"}, status_code=400
+            )
+        output_dir = str(output_dir)
+    output_file = None
+    output_name = str(payload.get("output") or "").strip()
+    if output_name:
+        if len(inputs) != 1:
+            return JSONResponse({"success": False, "error": "output requires a single input file"}, status_code=400)
+        if not Path(output_name).suffix:
+            output_name += OUTPUT_SUFFIXES[output_format]
+        output_path = _confined_path(manager, output_name)
+        if output_path is None:
+            return JSONResponse({"success": False, "error": "output must be inside the data directory"}, status_code=400)
+        output_file = str(output_path)
+    workers = None
+    if payload.get("workers") not in (None, ""):
+        try:
+            workers = int(payload["workers"])
+        except (TypeError, ValueError):
+            workers = 0
+        if workers < 1:
+            return JSONResponse({"success": False, "error": "workers must be a positive integer"}, status_code=400)
+    converter_options = {}
+    if payload.get("csv_columns"):
+        converter_options["csv_columns"] = str(payload["csv_columns"])
+    if payload.get("csv_decimation"):
+        try:
+            converter_options["csv_decimation"] = int(payload["csv_decimation"])
+        except (TypeError, ValueError):
+            return JSONResponse({"success": False, "error": "csv_decimation must be an integer"}, status_code=400)
+    for key in ("output_rate", "frequency_shift"):
+        if payload.get(key):
+            try:
+                converter_options[key] = float(payload[key])
+            except (TypeError, ValueError):
+                return JSONResponse({"success": False, "error": f"{key} must be a number"}, status_code=400)
+
+    task_id = str(uuid.uuid4())
+    _tasks[task_id] = {
+        "status": "running",
+        "type": "convert",
+        "output_format": output_format,
+        "done": 0,
+        "total": len(inputs),
+        "results": [],
+    }
+    t = threading.Thread(
+        target=_run_conversion,
+        args=(
+            task_id,
+            inputs,
+            output_format,
+            output_dir,
+            workers,
+            _parse_flag(payload.get("overwrite")),
+            converter_options,
+            output_file,
+        ),
+        daemon=True,
+    )
+    t.start()
+    return JSONResponse({"success": True, "task_id": task_id, "total": len(inputs)})
+
+
+@app.get("/api/convert/{task_id}")
+async def convert_status(task_id: str):
+    task = _tasks.get(task_id)
+    if not task or task.get("type") != "convert":
+        return JSONResponse({"status": "not_found"}, status_code=404)
+    return task
+
+
 @app.post("/api/ws_stream/start")
 async def ws_stream_start(payload: Dict):
     session_id = str(uuid.uuid4())
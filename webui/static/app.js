@@ -1804,7 +1804,7 @@ class RPTWebUI {
 
     getDataTypeDisplayName(type) {
         const displayMap = {
-            'h5': 'HDF5', 'bin': 'Binary', 'dat': 'Data', 'complex': 'Complex', 'raw': 'Raw', 'wav': 'WAV', 'csv': 'CSV', 'npy': 'NumPy', 'unknown': 'Unknown'
+            'h5': 'HDF5', 'bin': 'Binary', 'dat': 'Data', 'complex': 'Complex', 'raw': 'Raw', 'wav': 'WAV', 'csv': 'CSV', 'npy': 'NumPy', 'npz': 'NumPy', 'sc16': 'SC16', 'sigmf-data': 'SigMF', 'unknown': 'Unknown'
         };
         return displayMap[type] || 'Unknown';
     }
@@ -22,6 +22,11 @@ class StreamingSession:
     center_freq: float
     chunk_size: int = 4096
     update_interval: float = 0.1
+    # 可选的流式重采样：输出采样率（None 为原采样率）与 NCO 频移 (Hz)
+    output_rate: Optional[float] = None
+    shift_hz: float = 0.0
+    # 可选的流式 FIR 抽头（按文件采样率设计，在重采样之前执行）
+    filter_taps: Optional[list] = None
     cancel_event: threading.Event = field(default_factory=threading.Event)
     message_queue: object = None
     loop: asyncio.AbstractEventLoop = None
@@ -104,6 +109,9 @@ class StreamingSignalAnalyzer:
         center_freq: float,
         chunk_size: int = 4096,
         update_interval: float = 0.1,
+        output_rate: Optional[float] = None,
+        shift_hz: float = 0.0,
+        filter_taps: Optional[list] = None,
     ) -> StreamingSession:
         session_id = str(uuid.uuid4())
         loop = asyncio.get_running_loop()
@@ -117,6 +125,9 @@ class StreamingSignalAnalyzer:
             center_freq=center_freq,
             chunk_size=chunk_size,
             update_interval=update_interval,
+            output_rate=output_rate,
+            shift_hz=shift_hz,
+            filter_taps=filter_taps,
             message_queue=message_queue,
             loop=loop,
         )
@@ -170,17 +181,29 @@ class StreamingSignalAnalyzer:
             file_manager = FileManager()
             signal_processor = SignalProcessor()
 
-            samples, metadata = file_manager.load_signal(session.filename)
-            if samples is None:
-                raise RuntimeError("Failed to load samples for streaming")
-
-            total_samples = len(samples)
+            total_samples = file_manager.get_sample_count(session.filename)
             processed_samples = 0
             sequence_num = 0
 
-            while not session.cancel_event.is_set() and processed_samples < total_samples:
-                chunk_end = min(processed_samples + session.chunk_size, total_samples)
-                chunk_data = samples[processed_samples:chunk_end]
+            read_size = session.chunk_size
+            resampler = None
+            if session.output_rate or session.shift_hz:
+                # 重采样后按输出采样率分析；按比例放大读取块，使每帧输出约 chunk_size 个样本
+                resampler = file_manager.resampler_for(session.filename, session.output_rate, session.shift_hz)
+                read_size = -(-session.chunk_size * resampler.down // resampler.up)
+            if session.filter_taps is not None and len(session.filter_taps):
+                chunks = file_manager.iter_filtered(session.filename, session.filter_taps, read_size)
+            else:
+                chunks = file_manager.iter_chunks(session.filename, read_size)
+            if resampler is not None:
+                chunks = resampler.process_chunks(chunks)
+                total_samples = resampler.output_length(total_samples)
+                session.sample_rate = resampler.output_rate
+                session.center_freq -= resampler.shift_hz
+
+            for chunk_data in chunks:
+                if session.cancel_event.is_set():
+                    break
 
                 if len(chunk_data) == 0:
                     break